@@ -0,0 +1 @@
+# Puts the repository root on sys.path, so the tests import the pipeline as from src.x import Y like main.py does
@@ -1,150 +1,390 @@
-from collections import Counter
+from __future__ import annotations
 from datetime import datetime 
-from pandas import DataFrame
-from pandas import Series
-from src.data_processing import S3DataProcessing
-from src.data_processing import DataFrameManipulation
-from src.database_operations import DatabaseOperations
-from src.indeed_scraper import IndeedScraper
-from src.reed_scraper import ReedScraper
-from src.cv_library_scraper import CVLibraryScraper
-from src.totaljobs_scraper import TotalJobsScraper
-from sqlalchemy.engine import Engine
-import threading 
-
+from functools import lru_cache
+from time import perf_counter
+from typing import TYPE_CHECKING
+import argparse
+import importlib
+import json
+import os
+import subprocess
+import sys
+import yaml
+
+# The scrapers, pandas, boto3, geopy and sqlalchemy are imported by the stage which needs them,
+# so a command only pays for the libraries it uses
+if TYPE_CHECKING:
+    from sqlalchemy.engine import Engine
+    from src.task_queue import TaskQueue
+
+
+DRIVER_CONFIG_FILE = 'config/options_config.yaml'
+
+# Where the output files are uploaded to and loaded from, a local directory or memory:// runs the pipeline offline
+STORAGE_URL = 's3://job-scraper-data-bucket'
+
+# Every site the pipeline scrapes. The scraper class is imported the first time the site is scraped
+SITES = {
+    'indeed': {
+        'scraper_module': 'src.indeed_scraper',
+        'scraper_class': 'IndeedScraper',
+        'base_url': 'https://uk.indeed.com/',
+        'scraper_config_file': 'config/indeed_config.json',
+        'run_method': 'run'
+    },
+    'reed': {
+        'scraper_module': 'src.reed_scraper',
+        'scraper_class': 'ReedScraper',
+        'base_url': 'https://www.reed.co.uk/',
+        'scraper_config_file': 'config/reed_config.json',
+        'run_method': 'run'
+    },
+    'totaljobs': {
+        'scraper_module': 'src.totaljobs_scraper',
+        'scraper_class': 'TotalJobsScraper',
+        'base_url': 'https://www.totaljobs.com/',
+        'scraper_config_file': 'config/totaljobs_config.json',
+        'run_method': 'run'
+    },
+    'cv_library': {
+        'scraper_module': 'src.cv_library_scraper',
+        'scraper_class': 'CVLibraryScraper',
+        'base_url': 'https://www.cv-library.co.uk/',
+        'scraper_config_file': 'config/cv-library-config.json',
+        'run_method': 'run'
+    }
+}
 
 current_date = datetime.now() 
-indeed_instance = IndeedScraper("https://uk.indeed.com/", 'config/indeed_config.json', 'config/options_config.yaml', website_options=True)
-reed_instance = ReedScraper("https://www.reed.co.uk/", "config/reed_config.json", 'config/options_config.yaml', website_options=True)
-cv_instance = CVLibraryScraper("https://www.cv-library.co.uk/", "config/cv-library-config.json", "config/options_config.yaml", website_options=True)
-totaljobs_instance = TotalJobsScraper("https://www.totaljobs.com/", "config/totaljobs_config.json", "config/options_config.yaml", website_options=True)
-data_processor = S3DataProcessing('job-scraper-data-bucket')
-dataframe_manipulation = DataFrameManipulation() 
-operator = DatabaseOperations()
-indeed_scraper_config = indeed_instance.scraper_config
-reed_scraper_config = reed_instance.scraper_config
-cv_library_config = cv_instance.scraper_config 
-totaljobs_config = totaljobs_instance.scraper_config
-target_db_config = operator.load_db_credentials('config/db_creds.yaml')
-database_schema = operator.load_db_credentials('config/database_schema.yaml')
-database_name = target_db_config['DATABASE']
-print(database_name)
-
-def scrape_indeed(job_titles : list, number_of_pages: int = None):
-    """
-    Function to extract job information from indeed. 
+
+
+def parse_arguments(argv : list = None):
+    """
+    Function to parse the command line arguments of the pipeline
 
     Parameters
     ----------
-        job_titles (list): 
-            A list of job titles. 
-            Job titles are read in from the indeed_config file 
-
-        number_of_pages (int, optional): 
-            The number of pages to scrape per each job title. 
-            If the number of pages is None, then the entire website section will be scraped 
-            Defaults to None.
+        argv : list, optional
+            The arguments to parse. Defaults to None, which reads sys.argv
 
     Returns
     -------
-        indeed_df : DataFrame
-            A dataframe representing data extracted from the website
+        arguments : Namespace
+            The parsed arguments. arguments.command is the stage to run, 'all' if no command was given
+    """
+    parser = argparse.ArgumentParser(description='Scrape job listings and load them into the job database')
+    parser.set_defaults(resume=False, backfill=False, storage=STORAGE_URL)
+    subparsers = parser.add_subparsers(dest='command', metavar='command')
+
+    all_parser = subparsers.add_parser('all', help='Scrape every site, upload the output files to S3 and load them into the database')
+    all_parser.add_argument('--resume', action='store_true', help='Pick up from the checkpoints left by an interrupted run')
+    all_parser.add_argument('--backfill', action='store_true', help='Load every output file in S3, not only those added since the last load')
+    all_parser.add_argument('--storage', default=STORAGE_URL, help="Where the output files are stored, an s3:// bucket, a local directory or memory://, which only lasts for this run")
+
+    scrape_parser = subparsers.add_parser('scrape', help='Scrape sites, each in its own worker process')
+    scrape_parser.add_argument('--site', action='append', choices=list(SITES), help='A site to scrape, repeat for several. Defaults to every site')
+    scrape_parser.add_argument('--resume', action='store_true', help='Pick up from the checkpoints left by an interrupted run')
+
+    publish_parser = subparsers.add_parser('publish-tasks', help='Publish a task for every results page of every site to the task queue')
+    publish_parser.add_argument('--site', action='append', choices=list(SITES), help='A site to publish tasks for, repeat for several. Defaults to every site')
+    publish_parser.add_argument('--task-queue', default='task_queue.db', help="The task queue to use, 'postgres' for the job database or the path to a SQLite file")
+
+    work_parser = subparsers.add_parser('work-tasks', help='Pull tasks from the task queue until it is empty, then export the records')
+    work_parser.add_argument('--task-queue', default='task_queue.db', help="The task queue to use, 'postgres' for the job database or the path to a SQLite file")
+    work_parser.add_argument('--resume', action='store_true', help='Skip the job urls whose records were written before an interruption')
+
+    upload_parser = subparsers.add_parser('upload', help="Upload each site's output file to S3")
+    upload_parser.add_argument('--site', action='append', choices=list(SITES), help='A site to upload, repeat for several. Defaults to every site')
+    upload_parser.add_argument('--storage', default=STORAGE_URL, help="Where the output files are stored, an s3:// bucket or a local directory")
+
+    load_parser = subparsers.add_parser('load', help='Load the output files added to S3 since the last load into the job database')
+    load_parser.add_argument('--backfill', action='store_true', help='Load every output file in S3 again and rebuild the ingestion manifest')
+    load_parser.add_argument('--storage', default=STORAGE_URL, help="Where the output files are stored, an s3:// bucket or a local directory")
+
+    bench_parser = subparsers.add_parser('bench', help='Time how long each stage takes to start in a fresh interpreter')
+    bench_parser.add_argument('--driver', action='store_true', help='Also time the cold start of one browser')
+
+    arguments = parser.parse_args(argv)
+    # Running main.py without a command keeps its original behaviour, the whole pipeline
+    if arguments.command is None:
+        arguments.command = 'all'
+    # memory:// is emptied when the process exits, so a load in its own process would never see an upload's files
+    if arguments.command != 'all' and arguments.storage.startswith('memory://'):
+        parser.error(f"--storage memory:// only works with the all command, {arguments.command} runs in its own process")
+    return arguments
+
+@lru_cache(maxsize=None)
+def get_site_config(site_name : str):
     """
-    for job_title in job_titles:
-        indeed_instance.run(
-            job_title, 
-            number_of_pages=number_of_pages
-            )
+    Function to read the configuration file of a site without building its scraper
 
-    indeed_df = indeed_instance.output_to_dataframe() 
+    Parameters
+    ----------
+        site_name : str
+            A key of SITES i.e. 'indeed'
 
-    indeed_df.to_csv(indeed_scraper_config['base_config']['output_file_name'], index=False)
-    print('Extraction from Indeed complete')
-    return indeed_df
+    Returns
+    -------
+        scraper_config : dict
+            The site's configuration file
+    """
+    with open(SITES[site_name]['scraper_config_file'], 'r') as file:
+        return json.load(file)
 
-def scrape_reed(job_titles : list):
+def get_scraper_class(site_name : str):
+    """
+    Function to import the scraper class of a site, SiteScraper unless the site names its own
     """
-    Function to extract job information from reed. 
+    site = SITES[site_name]
+    return getattr(importlib.import_module(site.get('scraper_module', 'src.site_scraper')), site.get('scraper_class', 'SiteScraper'))
+
+@lru_cache(maxsize=None)
+def get_driver_pool():
+    from src.driver_pool import DriverPool
+    # Drivers are started lazily by the pool the first time a scraper checks one out
+    return DriverPool.from_config(DRIVER_CONFIG_FILE, website_options=True)
+
+@lru_cache(maxsize=None)
+def get_rate_limiter():
+    from src.rate_limiter import RateLimiter
+    # One politeness scheduler for every site, each site's budget is read from its rate_limit config
+    return RateLimiter()
+
+@lru_cache(maxsize=None)
+def get_seen_url_index():
+    from src.seen_url_index import SeenUrlIndex
+    # Job urls scraped on previous runs, consulted before any detail page is fetched
+    return SeenUrlIndex('seen_urls.db')
+
+@lru_cache(maxsize=None)
+def get_checkpoint_store(resume : bool = False):
+    from src.checkpoint_store import CheckpointStore
+    # Progress of each job title, written atomically so an interrupted run can be resumed with --resume
+    return CheckpointStore('checkpoint.json', resume=resume)
+
+@lru_cache(maxsize=None)
+def get_scraper(site_name : str, resume : bool = False):
+    """
+    Function to build the scraper of a site in this process, the first time it is needed
 
     Parameters
     ----------
-        job_titles (list): 
-            A list of job titles. 
-            Job titles are read in from the reed_config file 
+        site_name : str
+            A key of SITES i.e. 'indeed'
 
+        resume : bool, optional
+            Whether the scraper picks up from the checkpoint. Defaults to False
 
     Returns
     -------
-        indeed_df : DataFrame
-            A dataframe representing data extracted from the website
+        scraper : GeneralScraper
+            The site's scraper, sharing the driver pool, rate limiter, seen url index and checkpoint with the other sites
     """
-    for job_title in job_titles:
-        reed_instance.run_process(
-            job_title 
+    site = SITES[site_name]
+    return get_scraper_class(site_name)(
+        site['base_url'],
+        site['scraper_config_file'],
+        DRIVER_CONFIG_FILE,
+        website_options=True,
+        driver_pool=get_driver_pool(),
+        rate_limiter=get_rate_limiter(),
+        seen_url_index=get_seen_url_index(),
+        checkpoint_store=get_checkpoint_store(resume)
+    )
+
+@lru_cache(maxsize=None)
+def get_data_processor(storage_url : str = STORAGE_URL):
+    from src.storage_backend import StorageBackend
+    return StorageBackend.from_url(storage_url)
+
+@lru_cache(maxsize=None)
+def get_dataframe_manipulation():
+    from src.data_processing import DataFrameManipulation
+    return DataFrameManipulation()
 
-            )
+@lru_cache(maxsize=None)
+def get_operator():
+    from src.database_operations import DatabaseOperations
+    return DatabaseOperations()
+
+@lru_cache(maxsize=None)
+def get_target_db_config():
+    return get_operator().load_db_credentials('config/db_creds.yaml')
+
+@lru_cache(maxsize=None)
+def get_database_schema():
+    return get_operator().load_db_credentials('config/database_schema.yaml')
+
+def get_database_name():
+    return get_target_db_config()['DATABASE']
+
+def connect_job_database():
+    """
+    Function to connect to the job database
+
+    Returns
+    -------
+        target_database_engine : Engine
+            A sqlalchemy Engine object connected to the job database
+    """
+    return get_operator().connect(get_target_db_config(), connect_to_database=True, new_db_name=get_database_name())
+
+def seed_seen_url_index():
+    """
+    Function to add the job urls already stored in dim_job_url to the seen url index
+
+    Skipped if the database or the dim_job_url table is not available yet.
+
+    Returns
+    -------
+        None
+    """
+    try:
+        target_database_engine = connect_job_database()
+        if 'dim_job_url' in get_operator().list_db_tables(target_database_engine):
+            get_seen_url_index().seed_from_database(target_database_engine)
+    except Exception as e:
+        print(f"Could not seed the seen url index from the database: {e}")
+
+def build_site_specs(site_names : list = None):
+    """
+    Function to describe each site for the SiteOrchestrator
 
-    reed_df = reed_instance.reed_output_to_dataframe() 
+    Each site is scraped in its own worker process, which builds its own scraper from this description.
 
-    reed_df.to_csv(reed_scraper_config['base_config']['output_file_name'], index=False)
-    print('Extraction from Reed complete')
-    return reed_df  
+    Parameters
+    ----------
+        site_names : list, optional
+            The sites to describe. Defaults to None, every site in SITES
 
-def scrape_totaljobs(job_titles : list):
+    Returns
+    -------
+        site_specs : list
+            A list of dictionaries, one per site
+    """
+    site_specs = []
+    for site_name in site_names or SITES:
+        site = SITES[site_name]
+        site_spec = {
+            'site_name': site_name,
+            'scraper_class': get_scraper_class(site_name),
+            'base_url': site['base_url'],
+            'scraper_config_file': site['scraper_config_file'],
+            'run_method': site.get('run_method', 'run'),
+            'driver_config_file': DRIVER_CONFIG_FILE
+        }
+        site_specs.append(site_spec)
+    return site_specs
+
+def connect_task_queue(task_queue_name : str):
     """
-    Function to extract job information from totaljobs. 
+    Function to connect to the task queue shared by the crawl workers
 
     Parameters
     ----------
-        job_titles (list): 
-            A list of job titles. 
-            Job titles are read in from the totaljobs_config file 
+        task_queue_name : str
+            'postgres' to keep the queue in the job database, so workers on any node can share it,
+            otherwise the path to a local SQLite file. The scrape_tasks table sits beside the model
+            tables and is ignored by database_table_name_check, so it does not force a first load
 
     Returns
     -------
-        indeed_df : DataFrame
-            A dataframe representing data extracted from the website
+        task_queue : TaskQueue
+            A PostgresTaskQueue or SQLiteTaskQueue
     """
-    for job_title in job_titles:
-        totaljobs_instance.run_totaljobs_process(
-            job_title 
-         
-            )
+    from src.task_queue import TaskQueue
+    if task_queue_name == 'postgres':
+        return TaskQueue.from_engine(connect_job_database())
+    return TaskQueue.from_url(f'sqlite:///{task_queue_name}')
 
-    totaljobs_df = totaljobs_instance.totaljobs_output_to_dataframe() 
+def get_site_scrapers(site_names : list = None, resume : bool = False):
+    """
+    Function to map each site name to its scraper instance
 
-    totaljobs_df.to_csv(totaljobs_config['base_config']['output_file_name'], index=False)
-    print('Extraction from totaljobs complete')
-    return totaljobs_df 
+    Parameters
+    ----------
+        site_names : list, optional
+            The sites to build scrapers for. Defaults to None, every site in SITES
+
+        resume : bool, optional
+            Whether the scrapers pick up from the checkpoint. Defaults to False
+
+    Returns
+    -------
+        scrapers : dict
+            A dictionary where the keys are the site names used by the task queue
+    """
+    return {site_name: get_scraper(site_name, resume) for site_name in site_names or SITES}
 
-def scrape_cv_library(job_titles : list):
+def publish_crawl_tasks(task_queue : TaskQueue, site_names : list = None):
     """
-    Function to extract job information from cv_library. 
+    Function to publish a search page task for the first results page of every job title
+
+    Each search page task publishes the task of the next results page once its page has job cards,
+    up to the page limit, see TaskWorker.run_task, so no task is queued for a page past the last results.
+    Sites without a search_url template are skipped, their results pages can only be reached by clicking through them.
 
     Parameters
     ----------
-        job_titles (list): 
-            A list of job titles. 
-            Job titles are read in from the cv_library_config file 
+        task_queue : TaskQueue
+            The queue the tasks are published to
 
+        site_names : list, optional
+            The sites to publish tasks for. Defaults to None, every site in SITES
 
     Returns
     -------
-        indeed_df : DataFrame
-            A dataframe representing data extracted from the website
+        number_of_tasks : int
+            The number of new tasks published
     """
-    for job_title in job_titles:
-        cv_instance.run_main_process(
-            job_title
-            )
+    from src.task_queue import TaskQueue
+    number_of_tasks = 0
+    for site_name, scraper in get_site_scrapers(site_names).items():
+        if not scraper.get_search_url_config():
+            print(f"Skipping {site_name}, it has no search_url template")
+            continue
+        number_of_tasks += task_queue.publish([
+            TaskQueue.search_page_task(site_name, job_title, 0)
+            for job_title in scraper.scraper_config['base_config']['job_titles']
+        ])
+    print(f"Published {number_of_tasks} tasks, queue now holds {task_queue.counts()}")
+    return number_of_tasks
+
+def work_crawl_tasks(task_queue : TaskQueue, resume : bool = False):
+    """
+    Function to run crawl tasks from the queue on this node, then export each site's records
+
+    Start it on as many nodes as needed, each task is only ever worked by one of them.
+    Each node exports to files named after its worker id, which run_upload picks up,
+    so the nodes never overwrite each other's output in S3.
 
-    cv_library_df = cv_instance.cv_library_output_to_dataframe() 
+    Parameters
+    ----------
+        task_queue : TaskQueue
+            The queue the tasks are leased from
 
-    cv_library_df.to_csv(cv_library_config['base_config']['output_file_name'], index=False)
-    print('Extraction from cv-library complete')
-    return cv_library_df 
+        resume : bool, optional
+            Whether to skip the job urls whose records were written before an interruption. Defaults to False
 
-def upload_to_s3(s3_file_name : str, website_configuration_dict : dict):
+    Returns
+    -------
+        tasks_done : int
+            The number of tasks this node completed
+    """
+    from src.record_sink import RecordSink
+    from src.task_queue import TaskWorker
+    scrapers = get_site_scrapers(resume=resume)
+    task_worker = TaskWorker(task_queue, scrapers)
+    tasks_done = task_worker.run()
+    for site_name, scraper in scrapers.items():
+        if len(scraper.record_sink):
+            scraper.record_sink.export(RecordSink.get_worker_output_file_name(scraper.site_spec.output_file_name, task_worker.worker_id))
+            # The records are saved, so their urls can be skipped on the next run
+            scraper.commit_seen_urls()
+        scraper.print_resource_summary()
+    return tasks_done
+
+def upload_to_s3(s3_file_name : str, website_configuration_dict : dict, storage_url : str = STORAGE_URL):
     """
     Function to upload data to AWS S3 given a file name 
 
@@ -158,20 +398,72 @@ def upload_to_s3(s3_file_name : str, website_configuration_dict : dict):
         website_configuration_dict : dict 
             A dictionary containing key-value pairs for the website's url
 
+        storage_url : str, optional
+            Where the file is uploaded to, see StorageBackend.from_url. Defaults to STORAGE_URL, the S3 bucket
+
     Returns 
     -------
-        None 
+        uploaded : bool
+            Whether the file was uploaded
     """
-    job_website_url = website_configuration_dict['base_config']['url']
+    # Create the file directory, zero padded so the keys sort by date for the ingestion manifest's watermark
+    file_directory = f'{get_s3_site_prefix(website_configuration_dict)}{current_date.year}/{current_date.month:02d}/{current_date.day:02d}/'
 
-    job_website_name = dataframe_manipulation.extract_from_url(job_website_url)
+    s3_object_name = f"{file_directory}{s3_file_name}"
 
-    # Create the file directory 
-    file_directory = f'{job_website_name}/{current_date.year}/{current_date.month}/{current_date.day}/'
+    return get_data_processor(storage_url).upload_file_to_s3(s3_file_name, s3_object_name, file_directory)
 
-    s3_object_name = f"{file_directory}{s3_file_name}"
+def get_s3_site_prefix(website_configuration_dict : dict):
+    """
+    Function to get the prefix a site's output files are uploaded under
 
-    data_processor.upload_file_to_s3(s3_file_name, s3_object_name, file_directory)
+    Parameters
+    ----------
+        website_configuration_dict : dict 
+            A dictionary containing key-value pairs for the website's url
+
+    Returns
+    -------
+        prefix : str
+            The site's name followed by a slash i.e. 'indeed/'
+    """
+    return f"{get_dataframe_manipulation().extract_from_url(website_configuration_dict['base_config']['url'])}/"
+
+def get_website_urls():
+    """
+    Function to map the website_name of each site's records to its url
+
+    Returns
+    -------
+        website_urls : dict
+            The name of the site in its S3 prefix i.e. 'reed', and the host name a site without a
+            website_name in its configuration file stores i.e. 'www.reed.co.uk', each mapped to its url
+    """
+    from urllib.parse import urlparse
+    website_urls = {}
+    for site in SITES.values():
+        website_urls[get_dataframe_manipulation().extract_from_url(site['base_url'])] = site['base_url']
+        website_urls[urlparse(site['base_url']).netloc] = site['base_url']
+    return website_urls
+
+def build_website_table(df):
+    """
+    Function to build the website dimension table of the records being loaded
+
+    Parameters
+    ----------
+        df : DataFrame
+            The records being loaded, which only hold the sites that uploaded new files
+
+    Returns
+    -------
+        website_name_df : DataFrame
+            The website_name_id, website_name and website_url of each site in the records
+    """
+    website_name_df = get_dataframe_manipulation().build_dimension_table(df, 'website_name', ['website_name_id', 'website_name'])
+    # Adding website url to the table, looked up by name rather than by position in SITES
+    website_name_df['website_url'] = website_name_df['website_name'].map(get_website_urls())
+    return website_name_df
 
 def create_job_database():
     """
@@ -181,14 +473,16 @@ def create_job_database():
         target_database_engine : Engine
             A sqlalchemy Engine object representing the target database
     """
-    target_engine = operator.connect(target_db_config, new_db_name=database_name)
+    operator = get_operator()
+    database_name = get_database_name()
+    target_engine = operator.connect(get_target_db_config(), new_db_name=database_name)
     # Create the database
     database = operator.create_database(target_engine, database_name)
     # Once created create another engine to connect to the database itself. 
-    target_database_engine = operator.connect(target_db_config, connect_to_database=True, new_db_name=database_name)
+    target_database_engine = connect_job_database()
     return target_database_engine 
     
-def process_dataframes(list_of_s3_filepaths : list):
+def process_dataframes(list_of_s3_filepaths : list, list_of_keys : list = None, storage_url : str = STORAGE_URL):
     """
     Function to process dataframes from an S3 bucket
 
@@ -197,6 +491,13 @@ def process_dataframes(list_of_s3_filepaths : list):
         list_s3_file_paths : str 
             A list representing a file paths inside the S3 bucket 
 
+        list_of_keys : list, optional
+            The keys of the objects to read i.e. the new objects found by the ingestion manifest.
+            Defaults to None, every .csv and .parquet file under list_of_s3_filepaths
+
+        storage_url : str, optional
+            Where the files are read from, see StorageBackend.from_url. Defaults to STORAGE_URL, the S3 bucket
+
     Returns:
         dataframe_dict: 
             A dictionary containing dataframes where the keys represent table names and the
@@ -204,22 +505,18 @@ def process_dataframes(list_of_s3_filepaths : list):
     """
 
 
-    list_of_responses = []
-    for filepath in list_of_s3_filepaths:
-        s3_file_path = data_processor.list_objects(filepath)
-        list_of_responses.append(s3_file_path)
-    print(list_of_responses)
-
-    list_of_objects = []
-    for response in list_of_responses:
-        object_response = data_processor.read_objects_from_s3(response, 'csv')
-        list_of_objects.append(object_response)
+    from pandas import Series
+    data_processor = get_data_processor(storage_url)
+    dataframe_manipulation = get_dataframe_manipulation()
 
-    print(list_of_objects)
+    # List every partition page by page and download every .csv and .parquet file through one bounded pool, so no file is dropped
+    if list_of_keys is None:
+        list_of_keys = [key for filepath in list_of_s3_filepaths for key in data_processor.iter_keys(filepath, ('csv', 'parquet'))]
+    print(f"Reading {len(list_of_keys)} objects from {len(list_of_s3_filepaths)} S3 file paths")
 
 
-    # Reading in a .csv from the s3 bucket
-    df = dataframe_manipulation.raw_to_dataframe(list_of_objects)
+    # Parsing each .csv and .parquet file in chunks as it is downloaded, rather than holding every download first
+    df = dataframe_manipulation.raw_to_dataframe(data_processor.iter_objects(list_of_keys))
     # Creating the company_dimension table 
     company_df = dataframe_manipulation.build_dimension_table(df, 'company_name', ["company_name_id", "company_name"])
 
@@ -255,14 +552,7 @@ def process_dataframes(list_of_s3_filepaths : list):
         ]
         )
     # Creating website_table 
-    website_name_df = dataframe_manipulation.build_dimension_table(df, 'website_name', ['website_name_id', 'website_name'])
-    # Adding website url to the table
-    website_name_df['website_url'] = [
-                                        indeed_scraper_config['base_config']['url'],
-                                        reed_scraper_config['base_config']['url'],
-                                        totaljobs_config['base_config']['url'],
-                                        cv_library_config['base_config']['url']
-                                    ]
+    website_name_df = build_website_table(df)
 
     
 
@@ -306,16 +596,17 @@ def database_table_name_check(dataframe_dict : dict, target_db_engine : Engine):
 
     Returns:
         bool: 
-            True if the the number of tables inside the database are the same as inside the dataframe_dict
+            True if every table of the dataframe_dict is inside the database. Other tables i.e. the 
+            ingestion_manifest or a Postgres task queue's scrape_tasks are ignored 
 
             False otherwise 
     """
 
     # Check if the table names are present already 
-    current_database_table_names = operator.list_db_tables(target_db_engine)
-    database_table_names_to_be_uploaded = list(dataframe_dict.keys())
-    # Comparing both lists. If they are the same, then call the process to append data to the dataframes
-    if Counter(current_database_table_names) == Counter(database_table_names_to_be_uploaded):
+    current_database_table_names = set(get_operator().list_db_tables(target_db_engine))
+    database_table_names_to_be_uploaded = set(dataframe_dict.keys())
+    # If every table is there, then call the process to append data to the dataframes
+    if database_table_names_to_be_uploaded <= current_database_table_names:
         print("Tables are already present inside database. Upserting data.")
         return True 
     else: 
@@ -344,6 +635,7 @@ def filter_dataframes(dataframe_dict : dict, target_engine : Engine):
             values are the corresponding dataframes.
     """
     # Where dataframe_dict represents a dictionary of dataframes to upload
+    operator = get_operator()
 
     current_location_df = operator.read_rds_table(target_engine, "dim_location")
     new_location_df = operator.upsert_table(current_location_df, dataframe_dict['dim_location'], 'location_id', 'location')
@@ -385,6 +677,7 @@ def update_and_filter_dimension_tables(target_engine : Engine):
 
     '''
 
+    operator = get_operator()
     # for dim_job_title table 
     operator.update_ids(target_engine, "job_title_id", "job_title", "dim_job_title")
     operator.reset_ids(target_engine, "job_title_id", "dim_job_title")
@@ -432,7 +725,7 @@ def retrieve_dimension_tables(dataframe_dict : dict, target_engine : Engine):
         if "fact" in key:
             continue
         else:
-            rds_table = operator.read_rds_table(target_engine, key)
+            rds_table = get_operator().read_rds_table(target_engine, key)
             dataframe_dict[key] = rds_table
     
     return dataframe_dict
@@ -465,6 +758,8 @@ def upload_dataframes(dataframe_dict : dict, target_engine : Engine, upload_cond
     
     '''
 
+    operator = get_operator()
+    database_schema = get_database_schema()
     if first_load:
         for key, value in dataframe_dict.items():
             print(key)
@@ -489,51 +784,99 @@ def upload_dataframes(dataframe_dict : dict, target_engine : Engine, upload_cond
 
 
 
-if __name__ == "__main__":
+def warm_driver_cache():
+    """
+    Function to resolve and patch chromedriver once, so every worker starts its drivers from the cache
+    """
+    from src.driver_binary_cache import DriverBinaryCache
+    with open(DRIVER_CONFIG_FILE, 'r') as file:
+        driver_config = yaml.safe_load(file)
+    driver_binary_cache = DriverBinaryCache.from_config(driver_config)
+    if driver_binary_cache is not None:
+        driver_binary_cache.warm(driver_config['driver_type'])
+
+def run_scrape(site_names : list = None, resume : bool = False):
+    """
+    Function to scrape sites, each in its own worker process
 
-    scrape_totaljobs(totaljobs_config['base_config']['job_titles'])
+    Parameters
+    ----------
+        site_names : list, optional
+            The sites to scrape. Defaults to None, every site in SITES
 
-    extract_indeed = threading.Thread(target=scrape_indeed, args=(indeed_scraper_config['base_config']['job_titles']
-        ,indeed_scraper_config['base_config']['number_of_pages']))
-    
-    extract_reed = threading.Thread(target=scrape_reed, args=(reed_scraper_config['base_config']['job_titles'],))
+        resume : bool, optional
+            Whether each worker picks up from its site's checkpoint. Defaults to False
 
-    # extract_totaljobs = threading.Thread(target=scrape_totaljobs, args=(totaljobs_config['base_config']['job_titles'], ))
+    Returns
+    -------
+        site_results : dict
+            The outcome of each site, see SiteOrchestrator.run
+    """
+    from src.site_runner import SiteOrchestrator
+    seed_seen_url_index()
+    warm_driver_cache()
+
+    # Every site runs in its own process, a hung driver is killed instead of blocking the others
+    orchestrator = SiteOrchestrator.from_config(DRIVER_CONFIG_FILE)
+    site_results = orchestrator.run(build_site_specs(site_names), resume=resume)
+    unfinished_sites = [site for site, result in site_results.items() if result['status'] != 'done' or result.get('skipped_job_titles')]
+    if unfinished_sites:
+        print(f"Scraping did not finish for {unfinished_sites}, run again with --resume to pick up where they stopped")
+    print('Extraction Complete!')
+    return site_results
 
-    extract_cv_library = threading.Thread(target=scrape_cv_library, args=(cv_library_config['base_config']['job_titles'], ))
+def run_upload(site_names : list = None, storage_url : str = STORAGE_URL):
+    """
+    Function to upload the output files of each site to S3, its output_file_name and the files of any task workers on this node
 
-    extract_indeed.start() 
-    extract_reed.start()
-    # extract_totaljobs.start()
-    extract_cv_library.start()  
+    A task worker's file is removed once it is uploaded. Each worker writes to a new file, so a file
+    left behind would be uploaded again by every later run under that day's key and loaded twice.
 
-    extract_indeed.join()
-    extract_reed.join()
-    # extract_totaljobs.join() 
-    extract_cv_library.join() 
+    Parameters
+    ----------
+        site_names : list, optional
+            The sites to upload. Defaults to None, every site in SITES
 
-    print('Extraction Complete!')
+        storage_url : str, optional
+            Where the files are uploaded to, see StorageBackend.from_url. Defaults to STORAGE_URL, the S3 bucket
+    """
+    from src.record_sink import RecordSink
+    for site_name in site_names or SITES:
+        site_config = get_site_config(site_name)
+        site_output_file_name = RecordSink.get_output_file_name(site_config['base_config'])
+        output_file_names = RecordSink.find_output_files(site_output_file_name)
+        if not output_file_names:
+            print(f"No output files to upload for {site_name}")
+        for output_file_name in output_file_names:
+            if upload_to_s3(output_file_name, site_config, storage_url) and output_file_name != site_output_file_name:
+                os.remove(output_file_name)
+
+def run_load(backfill : bool = False, storage_url : str = STORAGE_URL):
+    """
+    Function to load the output files in S3 into the job database, creating its tables on the first load
 
-    upload_to_s3(indeed_scraper_config['base_config']['output_file_name'], 
-                 indeed_scraper_config)
-    
-    upload_to_s3(reed_scraper_config['base_config']['output_file_name'], 
-                 reed_scraper_config)
-    
-    upload_to_s3(totaljobs_config['base_config']['output_file_name'],
-                 totaljobs_config)
-    
-    upload_to_s3(cv_library_config['base_config']['output_file_name'],
-                 cv_library_config)
+    Only the objects the ingestion manifest has not seen are read, listing each site's prefix from
+    the date of its last loaded object. The manifest is updated once the load has succeeded.
+
+    Parameters
+    ----------
+        backfill : bool, optional
+            Whether to read every object under the site prefixes again and rewrite the manifest,
+            i.e. after a failed run or for the keys uploaded before the dates were zero padded. Defaults to False
+
+        storage_url : str, optional
+            Where the files are read from, see StorageBackend.from_url. Defaults to STORAGE_URL, the S3 bucket
+    """
+    from src.ingestion_manifest import IngestionManifest
     # #NOTE: Using a new database for 1st and 2nd loads jobhubdb_new 
     target_db_engine = create_job_database() 
-    dataframe_dictionary = process_dataframes(
-                                            [indeed_scraper_config['base_config']['s3_file_path']
-                                             ,reed_scraper_config['base_config']['s3_file_path']
-                                             ,totaljobs_config['base_config']['s3_file_path']
-                                            ,cv_library_config['base_config']['s3_file_path']
-                                            ]
-                                            )
+    ingestion_manifest = IngestionManifest(target_db_engine)
+    list_of_s3_filepaths = [get_s3_site_prefix(get_site_config(site_name)) for site_name in SITES]
+    new_objects = ingestion_manifest.find_new_objects(get_data_processor(storage_url), list_of_s3_filepaths, ('csv', 'parquet'), backfill=backfill)
+    if not new_objects:
+        print('No new output files in S3 since the last load')
+        return
+    dataframe_dictionary = process_dataframes(list_of_s3_filepaths, [s3_object['Key'] for s3_object in new_objects], storage_url)
     land_job_data_table = dataframe_dictionary['land_job_data']
 
     if database_table_name_check(dataframe_dictionary, target_db_engine) == True:
@@ -546,7 +889,7 @@ if __name__ == "__main__":
         # Retrieve the current dimension tables, adding them to the dataframe_dictionary 
         new_dataframe_dict = retrieve_dimension_tables(dataframe_dictionary, target_db_engine)
         # Rebuild the fact table with the new dataframes 
-        new_fact_table = dataframe_manipulation.build_fact_table(
+        new_fact_table = get_dataframe_manipulation().build_fact_table(
             land_job_data_table, 
             new_dataframe_dict['dim_job_title'],
             new_dataframe_dict['dim_company'],
@@ -557,8 +900,86 @@ if __name__ == "__main__":
             new_dataframe_dict['dim_website']
         )
         fact_table_df = new_fact_table
-        operator.send_data_to_database(fact_table_df, target_db_engine, "fact_job_data", 'append', database_schema)
+        get_operator().send_data_to_database(fact_table_df, target_db_engine, "fact_job_data", 'append', get_database_schema())
     else:
         upload_dataframes(dataframe_dictionary, target_db_engine, 'replace', first_load=True)
-        operator.execute_sql('apply_primary_foreign_keys.sql', target_db_engine)
-        operator.execute_sql('create_views.sql', target_db_engine)
\ No newline at end of file
+        get_operator().execute_sql('apply_primary_foreign_keys.sql', target_db_engine)
+        get_operator().execute_sql('create_views.sql', target_db_engine)
+    print(f"Recorded {ingestion_manifest.record_loaded(new_objects)} objects in the ingestion manifest")
+
+# Each stage's components, built in a fresh interpreter by run_bench
+BENCH_STAGES = {
+    'cli': lambda: None,
+    'scrape': lambda: [get_scraper_class(site_name) for site_name in SITES],
+    'upload': lambda: (get_data_processor(), get_dataframe_manipulation()),
+    'load': lambda: (get_operator(), get_data_processor(), get_dataframe_manipulation()),
+    'driver': lambda: get_driver_pool().checkin(get_driver_pool().checkout())
+}
+
+def run_bench(include_driver : bool = False):
+    """
+    Function to time how long each stage takes to start
+
+    Each stage is timed in a fresh interpreter, so no stage benefits from the modules imported by another.
+
+    Parameters
+    ----------
+        include_driver : bool, optional
+            Whether to also time the cold start of one browser. Defaults to False
+
+    Returns
+    -------
+        timings : dict
+            The seconds each stage took to import main.py and build its components
+    """
+    stages = [stage for stage in BENCH_STAGES if stage != 'driver' or include_driver]
+    timings = {}
+    for stage in stages:
+        script = (
+            'from time import perf_counter; start_time = perf_counter(); '
+            f'import main; main.BENCH_STAGES[{stage!r}](); print(perf_counter() - start_time)'
+        )
+        start_time = perf_counter()
+        result = subprocess.run([sys.executable, '-c', script], capture_output=True, text=True)
+        if result.returncode != 0:
+            print(f"{stage}: failed\n{result.stderr.strip()}")
+            continue
+        in_process_seconds = float(result.stdout.strip().splitlines()[-1])
+        timings[stage] = in_process_seconds
+        print(f"{stage}: {in_process_seconds:.2f}s to start, {perf_counter() - start_time:.2f}s including the interpreter")
+    return timings
+
+def main(argv : list = None):
+    """
+    Function to run the stage named on the command line
+
+    python main.py                          scrape, upload and load, the same as python main.py all
+    python main.py scrape --site reed       scrape only reed
+    python main.py upload                   upload the output files to S3
+    python main.py load                     load the files in S3 into the database
+    python main.py bench --driver           time how long each stage takes to start
+    """
+    arguments = parse_arguments(argv)
+
+    if arguments.command == 'scrape':
+        run_scrape(arguments.site, resume=arguments.resume)
+    elif arguments.command == 'publish-tasks':
+        publish_crawl_tasks(connect_task_queue(arguments.task_queue), arguments.site)
+    elif arguments.command == 'work-tasks':
+        seed_seen_url_index()
+        warm_driver_cache()
+        work_crawl_tasks(connect_task_queue(arguments.task_queue), resume=arguments.resume)
+    elif arguments.command == 'upload':
+        run_upload(arguments.site, arguments.storage)
+    elif arguments.command == 'load':
+        run_load(arguments.backfill, arguments.storage)
+    elif arguments.command == 'bench':
+        run_bench(arguments.driver)
+    else:
+        run_scrape(resume=arguments.resume)
+        run_upload(storage_url=arguments.storage)
+        run_load(arguments.backfill, arguments.storage)
+
+
+if __name__ == "__main__":
+    main()
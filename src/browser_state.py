@@ -0,0 +1,173 @@
+from selenium.common.exceptions import WebDriverException
+from time import time
+from urllib.parse import urlparse
+import json
+import os
+import tempfile
+
+
+# The cookie fields accepted by the DevTools Network.setCookies command
+COOKIE_FIELDS = ('name', 'value', 'domain', 'path', 'secure', 'httpOnly', 'sameSite', 'expires')
+
+
+class BrowserState:
+    '''
+    A per-site cookie jar carried between drivers and runs
+
+    The site's cookies are saved to a JSON file once its cookie banner has
+    been accepted. They are loaded into every new driver through the DevTools
+    protocol before the first page is opened, so the site already sees the
+    consent and the banner step can be skipped. Pooled drivers are shared
+    between sites, so a cookie jar is used rather than a Chrome user-data-dir.
+
+    '''
+    def __init__(self, state_path : str, site_url : str, max_age_hours : float = 168, consent_cookies : list = None):
+        """
+        Parameters
+        ----------
+        state_path : str
+            The file path to the cookie jar i.e. browser_state/uk.indeed.com.json
+
+        site_url : str
+            The base url of the site, whose cookies are saved
+
+        max_age_hours : float, optional
+            The number of hours a saved cookie jar is trusted for. Defaults to 168, one week
+
+        consent_cookies : list, optional
+            The names of the cookies which record the consent i.e. ['OptanonAlertBoxClosed'].
+            The stored state is only valid if one of them is present and unexpired.
+            Defaults to None, which trusts any unexpired cookie jar.
+        """
+        self.state_path = state_path
+        self.site_url = site_url
+        self.max_age_hours = max_age_hours
+        self.consent_cookies = consent_cookies
+
+    @classmethod
+    def from_scraper_config(cls, scraper_config : dict, base_url : str):
+        '''
+        Creates a BrowserState from the browser_state section of a site's base_config
+
+        Parameters
+        ----------
+        scraper_config : dict
+            A dictionary representing the configuration file for the website
+
+        base_url : str
+            The base url of the site
+
+        Returns
+        -------
+            state : BrowserState
+                A BrowserState for the site, or None if the site has not enabled it
+        '''
+        state_config = scraper_config.get('base_config', {}).get('browser_state', {})
+        if not state_config.get('enabled', False):
+            return None
+
+        domain = urlparse(base_url).netloc
+        return cls(
+            state_config.get('path', os.path.join('browser_state', f'{domain}.json')),
+            base_url,
+            max_age_hours=state_config.get('max_age_hours', 168),
+            consent_cookies=state_config.get('consent_cookies')
+        )
+
+    def read_cookies(self):
+        '''
+        Reads the saved cookies which can still be used
+
+        Returns
+        -------
+            cookies : list
+                The unexpired cookies, or an empty list if the cookie jar is missing,
+                older than max_age_hours or lacks a consent cookie
+        '''
+        if not os.path.exists(self.state_path):
+            return []
+        with open(self.state_path, 'r', encoding='utf-8') as file:
+            state = json.load(file)
+
+        now = time()
+        if now - state['saved_at'] > self.max_age_hours * 3600:
+            return []
+        # Session cookies have an expires of -1
+        cookies = [cookie for cookie in state['cookies'] if cookie.get('expires', -1) <= 0 or cookie['expires'] > now]
+        if self.consent_cookies and not any(cookie['name'] in self.consent_cookies for cookie in cookies):
+            return []
+        return cookies
+
+    def load(self, driver):
+        '''
+        Loads the saved cookies into a driver
+
+        Parameters
+        ----------
+        driver : WebDriver
+            A Chromium based selenium WebDriver object
+
+        Returns
+        -------
+            bool
+                True if valid cookies were loaded and the consent steps can be skipped
+        '''
+        cookies = self.read_cookies()
+        if not cookies:
+            return False
+        try:
+            driver.execute_cdp_cmd('Network.setCookies', {
+                'cookies': [
+                    {field: cookie[field] for field in COOKIE_FIELDS if field in cookie and not (field == 'expires' and cookie[field] <= 0)}
+                    for cookie in cookies
+                ]
+            })
+        except WebDriverException as e:
+            print(f"Could not load the saved cookies for {self.site_url}: {e}")
+            return False
+        print(f"Loaded {len(cookies)} saved cookies for {self.site_url}")
+        return True
+
+    def read_saved_at(self):
+        '''
+        Returns when the consent in the cookie jar was given, None if there is no cookie jar
+        '''
+        if not os.path.exists(self.state_path):
+            return None
+        with open(self.state_path, 'r', encoding='utf-8') as file:
+            return json.load(file).get('saved_at')
+
+    def save(self, driver, new_consent : bool = True):
+        '''
+        Saves the driver's cookies for the site, replacing the old cookie jar atomically
+
+        Parameters
+        ----------
+        driver : WebDriver
+            A Chromium based selenium WebDriver object
+
+        new_consent : bool, optional
+            Whether the cookie banner was just accepted, which restarts the max_age_hours of the jar.
+            False refreshes the cookies but keeps the time the consent was given, so a jar in
+            regular use still expires and its banner is accepted again. Defaults to True
+        '''
+        try:
+            cookies = driver.execute_cdp_cmd('Network.getCookies', {'urls': [self.site_url]})['cookies']
+        except WebDriverException as e:
+            print(f"Could not save the cookies for {self.site_url}: {e}")
+            return
+
+        saved_at = None if new_consent else self.read_saved_at()
+        directory = os.path.dirname(os.path.abspath(self.state_path))
+        os.makedirs(directory, exist_ok=True)
+        file_descriptor, temporary_path = tempfile.mkstemp(dir=directory, suffix='.tmp')
+        with os.fdopen(file_descriptor, 'w', encoding='utf-8') as file:
+            json.dump({'saved_at': saved_at or time(), 'cookies': cookies}, file)
+        os.replace(temporary_path, self.state_path)
+
+    def clear(self):
+        '''
+        Deletes the cookie jar i.e. when the site shows its banner again despite the saved consent
+        '''
+        if os.path.exists(self.state_path):
+            os.remove(self.state_path)
@@ -0,0 +1,189 @@
+from datetime import datetime
+import json
+import os
+import tempfile
+import threading
+
+
+class CheckpointStore:
+    '''
+    A crash-safe record of how far a scrape run has got
+
+    For each site and job title it stores the results pages already harvested,
+    the harvested job urls and whether the title is finished, plus the job urls
+    of each site whose records have been written. The file is rewritten
+    atomically after every change, so it is always either the old or the new state.
+
+    '''
+    def __init__(self, checkpoint_path : str = 'checkpoint.json', resume : bool = False):
+        """
+        Parameters
+        ----------
+        checkpoint_path : str, optional
+            The file path to the checkpoint file. Defaults to 'checkpoint.json'
+
+        resume : bool, optional
+            Whether to load the checkpoint left by the last run. Defaults to False,
+            which starts from an empty checkpoint and overwrites the old file on the first save.
+
+        Attributes
+        ----------
+        self.resumed : bool
+            True if the checkpoint of a previous run was loaded
+        """
+        self.checkpoint_path = checkpoint_path
+        self.state = {'sites': {}}
+        self.resumed = False
+        self._fetched_urls = {}
+        self._lock = threading.RLock()
+
+        if resume and os.path.exists(checkpoint_path):
+            with open(checkpoint_path, 'r', encoding='utf-8') as file:
+                self.state = json.load(file)
+            for site, site_state in self.state['sites'].items():
+                self._fetched_urls[site] = set(site_state['fetched_urls'])
+            self.resumed = True
+            print(f"Resuming from checkpoint saved at {self.state.get('updated_at')}")
+
+    def get_site_state(self, site : str):
+        # Callers must hold self._lock
+        if site not in self.state['sites']:
+            self.state['sites'][site] = {'titles': {}, 'fetched_urls': []}
+            self._fetched_urls[site] = set()
+        return self.state['sites'][site]
+
+    def get_title_state(self, site : str, job_title : str):
+        # Callers must hold self._lock
+        titles = self.get_site_state(site)['titles']
+        if job_title not in titles:
+            titles[job_title] = {'pages': {}, 'harvested_urls': None, 'complete': False}
+        return titles[job_title]
+
+    def is_page_complete(self, site : str, job_title : str, page_index : int):
+        with self._lock:
+            return str(page_index) in self.get_title_state(site, job_title)['pages']
+
+    def get_page_urls(self, site : str, job_title : str, page_index : int):
+        '''
+        Returns the job urls harvested from a completed results page
+        '''
+        with self._lock:
+            return list(self.get_title_state(site, job_title)['pages'][str(page_index)])
+
+    def mark_page_complete(self, site : str, job_title : str, page_index : int, list_of_urls : list):
+        '''
+        Records that a results page has been harvested
+
+        Parameters
+        ----------
+        site : str
+            The domain of the site i.e. uk.indeed.com
+
+        job_title : str
+            The job title being searched
+
+        page_index : int
+            The zero-based index of the results page
+
+        list_of_urls : list
+            The job urls harvested from the page
+        '''
+        with self._lock:
+            self.get_title_state(site, job_title)['pages'][str(page_index)] = list(list_of_urls)
+            self.save()
+
+    def get_harvested_urls(self, site : str, job_title : str):
+        '''
+        Returns the job urls harvested for a job title, None if its harvest did not finish
+        '''
+        with self._lock:
+            harvested_urls = self.get_title_state(site, job_title)['harvested_urls']
+            return list(harvested_urls) if harvested_urls is not None else None
+
+    def mark_harvest_complete(self, site : str, job_title : str, list_of_urls : list):
+        '''
+        Records every job url harvested for a job title, before any detail page is fetched
+        '''
+        with self._lock:
+            self.get_title_state(site, job_title)['harvested_urls'] = list(list_of_urls)
+            self.save()
+
+    def is_title_complete(self, site : str, job_title : str):
+        with self._lock:
+            return self.get_title_state(site, job_title)['complete']
+
+    def mark_title_complete(self, site : str, job_title : str):
+        '''
+        Records that every harvested job url of a job title has been fetched
+        '''
+        with self._lock:
+            self.get_title_state(site, job_title)['complete'] = True
+            self.save()
+
+    def get_fetched_urls(self, site : str):
+        '''
+        Returns the job urls of a site whose records have been written
+        '''
+        with self._lock:
+            return list(self.get_site_state(site)['fetched_urls'])
+
+    def filter_unfetched(self, site : str, list_of_urls : list):
+        '''
+        Removes the job urls whose records have already been written
+
+        Returns
+        -------
+            unfetched_urls : list
+                The urls which still need their detail page fetched, in their original order
+        '''
+        with self._lock:
+            self.get_site_state(site)
+            return [url for url in list_of_urls if url not in self._fetched_urls[site]]
+
+    def mark_fetched(self, site : str, list_of_urls : list):
+        '''
+        Records job urls whose records have been written to the record sink
+
+        Parameters
+        ----------
+        site : str
+            The domain of the site i.e. uk.indeed.com
+
+        list_of_urls : list
+            The job urls whose records have been flushed to disk
+        '''
+        with self._lock:
+            site_state = self.get_site_state(site)
+            for url in list_of_urls:
+                if url not in self._fetched_urls[site]:
+                    self._fetched_urls[site].add(url)
+                    site_state['fetched_urls'].append(url)
+            self.save()
+
+    def save(self):
+        '''
+        Writes the checkpoint to a temporary file and renames it over the old one
+        '''
+        with self._lock:
+            self.state['updated_at'] = datetime.now().isoformat()
+            directory = os.path.dirname(os.path.abspath(self.checkpoint_path))
+            file_descriptor, temporary_path = tempfile.mkstemp(dir=directory, suffix='.tmp')
+            try:
+                with os.fdopen(file_descriptor, 'w', encoding='utf-8') as file:
+                    json.dump(self.state, file)
+                    file.flush()
+                    os.fsync(file.fileno())
+                os.replace(temporary_path, self.checkpoint_path)
+            except BaseException:
+                os.remove(temporary_path)
+                raise
+
+    def clear(self):
+        '''
+        Deletes the checkpoint once a run has finished, so the next run starts from the beginning
+        '''
+        with self._lock:
+            self.state = {'sites': {}}
+            self._fetched_urls = {}
+            if os.path.exists(self.checkpoint_path):
+                os.remove(self.checkpoint_path)
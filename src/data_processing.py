@@ -1,79 +1,69 @@
+from botocore.config import Config
 from botocore.exceptions import ClientError
 from datetime import datetime
-from geopy.geocoders import Nominatim
-from io import StringIO
+from io import BytesIO
 from uuid import uuid4
 import boto3
 import pandas as pd
+from src.parquet_format import ParquetFormat
+from src.storage_backend import StorageBackend
 import re
 
 
-class S3DataProcessing: 
-
-    def __init__(self, bucket_name : str):
-        self.bucket_name = bucket_name
-        self.s3_client = boto3.client('s3')
-        self.list_of_objects = []
-        pass 
-
-    def list_objects(self, file_directory : str):
+class S3DataProcessing(StorageBackend): 
+    '''
+    The StorageBackend of the S3 bucket the output files are uploaded to and loaded from
+    '''
+    def __init__(self, bucket_name : str, max_workers : int = 16):
         """
-        
         Parameters 
         ----------
-        file_directory (str): 
-            The file path to the file directory on the AWS S3 bucket
-
-        Returns
-        -------
-        s3_response  (dict): 
-            A dictionary containing the response from the boto3 api request
+        bucket_name (str): 
+            The name of the S3 bucket 
+        max_workers (int, optional): 
+            The number of objects downloaded at once. Defaults to 16 
         """
+        super().__init__(bucket_name, max_workers)
+        # boto3 clients are thread safe, one client is shared by every download thread. 
+        # Its connection pool is sized to the thread pool so the threads never queue for a connection 
+        self.s3_client = boto3.client('s3', config=Config(max_pool_connections=max_workers))
 
-        s3_response = self.s3_client.list_objects_v2(
-            Bucket=self.bucket_name,
-            Prefix=file_directory
-        )
-        print(s3_response)
-
-        return s3_response
-    
+    def iter_object_summaries(self, file_directory : str, file_type : str = None, start_after : str = None):
+        """
+        Yields the listing entry of every object under a prefix, following the continuation token 
+        past the 1000 keys of a single listing, see StorageBackend.iter_object_summaries 
+        """
+        extensions = self.get_extensions(file_type)
+        paginate_kwargs = {'Bucket': self.bucket_name, 'Prefix': file_directory}
+        if start_after:
+            paginate_kwargs['StartAfter'] = start_after
+        paginator = self.s3_client.get_paginator('list_objects_v2')
+        for page in paginator.paginate(**paginate_kwargs):
+            for s3_object in page.get('Contents', []):
+                if extensions is None or s3_object['Key'].endswith(extensions):
+                    yield s3_object
+
+    def open_object(self, key : str):
+        """
+        Opens a single object without reading it, for files too large to hold in memory 
 
-    def read_objects_from_s3(self, s3_response : dict, file_type : str):
-        '''
-        Method to read in objects from an S3 bucket based on a specified file type.
-        
-        Parameters
+        Parameters 
         ----------
-        s3_response : dict
-            A dictionary containing information
-        about objects stored within the S3 bucket
-        file_type : str
-            The type of file to look for within the S3 bucket. 
-        
+        key (str): 
+            The key of the object 
+
         Returns
         -------
-        s3_objects : any 
-            the last object retrieved from the S3 bucket that matches
-            the specified file type.
-        
-        '''
+        s3_object (dict): 
+            The get_object response with its Key. Its Body is the botocore StreamingBody, 
+            read straight from the connection, see DataFrameManipulation.iter_dataframe_chunks 
+        """
+        s3_object = self.s3_client.get_object(Bucket=self.bucket_name, Key=key)
+        s3_object['Key'] = key
+        return s3_object
 
-        for object in s3_response['Contents']:
-            key = object['Key']
-            if key.endswith(f".{file_type}"):
-                print(key)
-                s3_objects = self.s3_client.get_object(
-                    Bucket=self.bucket_name,
-                    Key=key
-                )
-                print(s3_objects)
-                data = s3_objects['Body']
-                self.list_of_objects.append(data)
-        
-        print(self.list_of_objects)
-        return s3_objects
-      
+    def upload_file(self, file_name : str, object_name : str):
+        self.s3_client.upload_file(file_name, self.bucket_name, object_name)
 
     def create_s3_directory(self, website_name : str):
         '''
@@ -100,7 +90,8 @@ class S3DataProcessing:
         # Get the current datetime 
         current_date = datetime.now() 
         # Create the file_path
-        directory_name = f'{website_name}/{current_date.year}/{current_date.month}/{current_date.day}/'
+        # Zero padded so the keys sort by date, which the ingestion manifest's watermark relies on
+        directory_name = f'{website_name}/{current_date.year}/{current_date.month:02d}/{current_date.day:02d}/'
         placeholder_file = directory_name + "placeholder.txt"
 
         try: 
@@ -119,76 +110,71 @@ class S3DataProcessing:
         except Exception as e:
             print(f"An error occurred: {e}")
             return None
-       
 
-    def upload_file_to_s3(self, file_name : str, object_name : str, folder : str):
+
+class DataFrameManipulation: 
+
+    def iter_dataframe_chunks(self, list_of_objects, chunksize : int = 100000):
         '''
-        Method to upload a file to an S3 bucket with error handling.
+        Method to parse objects from S3 into DataFrames of at most chunksize rows, 
+        so a large daily file can be processed in bounded memory. 
+
+        CSV bodies are parsed as they stream in, a StreamingBody from S3DataProcessing.open_object 
+        is never held in memory whole. Parquet needs random access, so a streaming Parquet body 
+        is downloaded first and then read one record batch at a time. 
         
         Parameters
         ----------
-        file_name : str
-            A string that specifies the full path to the file
-            on your local system.
-        object_name : str
-            A string representing the key or path under which the file will be stored in the S3 bucket.
-        folder : str
-            A string which represents the folder within the S3
-            bucket where you want to upload the file. 
-        
+        list_of_objects : iterable
+            get_object responses with their Key, i.e. from S3DataProcessing.iter_objects 
+        chunksize : int, optional
+            The maximum number of rows in each DataFrame. Defaults to 100000 
+        
+        Yields
+        ------
+        key, df : tuple 
+            The key of the object each chunk came from, and the chunk 
         '''
-        try:
-            self.s3_client.upload_file(file_name, self.bucket_name, object_name)
-            print(f"Uploaded {file_name} to S3 bucket {self.bucket_name} in folder {folder}.")
-        except Exception as e:
-            print(f"Failed to upload {file_name} to S3: {e}")
-       
+        for s3_object in list_of_objects:
+            key = s3_object.get('Key', '')
+            if key.endswith('.parquet'):
+                for df in ParquetFormat().iter_dataframes(self.seekable_body(s3_object), chunksize):
+                    yield key, df
+                continue
+            with pd.read_csv(s3_object['Body'], delimiter=',', encoding='utf-8', chunksize=chunksize) as reader:
+                for df in reader:
+                    yield key, df
 
-class DataFrameManipulation: 
+    @staticmethod
+    def seekable_body(s3_object : dict):
+        '''
+        Returns the Body of an object as a seekable file, downloading a streaming body into memory 
+        '''
+        body = s3_object['Body']
+        if hasattr(body, 'seekable') and body.seekable():
+            return body
+        return BytesIO(body.read())
 
-    def raw_to_dataframe(self, list_of_objects : list):
+    def raw_to_dataframe(self, list_of_objects):
         '''
-        Method to read raw data from a list of objects, 
-        decode it, and convert objects
-        into a pandas DataFrame.
+        Method to read raw data from objects 
+        and convert them into a single pandas DataFrame. 
+        Each object is parsed chunk by chunk as it arrives, see iter_dataframe_chunks, 
+        so only the parsed rows are kept and each Body is released once it is parsed.
         
         Parameters
         ----------
-        list_of_objects : list
-            a list containing objects. 
-            Each object in the list should have a `read()` method that returns raw data in
-            bytes, which can be decoded using UTF-8 encoding.
+        list_of_objects : iterable
+            get_object responses, i.e. the generator returned by S3DataProcessing.iter_objects, 
+            so the downloads stay bounded while the earlier objects are parsed. 
+            Each Body holds a .csv or a .parquet file, told apart by the object's Key.
         
         Returns
         -------
-            A DataFrame object created from the raw data extracted from the list of objects.
             combined_df : DataFrame 
-                Returned if the number of objects is greater than 1 
-            df : DataFrame 
-                Returned if there is only one object in the list of objects 
+                Every row of every object, with a fresh index
         '''
-        # Get the number of elements inside the list_of_objects 
-        number_of_objects = len(list_of_objects)
-        # Conditional to check if the number_of_objects is greater than 1
-        if number_of_objects > 1:
-            for index, element in enumerate(list_of_objects):
-                raw_data = element['Body'].read().decode('utf-8')
-                df = pd.read_csv(StringIO(raw_data), delimiter=',')
-                list_of_objects[index] = df 
-            combined_df = pd.concat(list_of_objects)
-            # Reset the index and drop the extra index column 
-            combined_df.reset_index(inplace=True)
-            combined_df.drop(columns='index', inplace=True)
-            return combined_df 
-        # In other cases, read in the single object. 
-        else:
-            for element in list_of_objects:
-                raw_data = element.read().decode('utf-8')
-
-            df = pd.read_csv(StringIO(raw_data), delimiter=',')
-
-            return df 
-         
+        return pd.concat((df for _, df in self.iter_dataframe_chunks(list_of_objects)), ignore_index=True)
 
     def build_dimension_table(self, df : pd.DataFrame, unique_column_name : str, order_of_columns : list):
         '''
@@ -416,6 +402,8 @@ class DataFrameManipulation:
             longitude.
 
         '''
+        # geopy is only needed by the load stage, so it is not imported with the module
+        from geopy.geocoders import Nominatim
         geolocator = Nominatim(user_agent='location')
         location = geolocator.geocode(location)
         if location:
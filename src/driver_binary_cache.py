@@ -0,0 +1,180 @@
+from webdriver_manager.chrome import ChromeDriverManager
+from webdriver_manager.core.os_manager import OperationSystemManager, ChromeType
+from undetected_chromedriver import Patcher
+import os
+import shutil
+import sys
+import tempfile
+
+
+class DriverBinaryCache:
+    '''
+    A local cache of chromedriver binaries, one per installed Chrome version
+
+    ChromeDriverManager().install() asks the network for the matching release on
+    every call, and uc.Chrome() downloads and patches a fresh binary every time it
+    starts. The cache resolves the stock binary and the patched binary once for each
+    Chrome version and hands out the cached paths afterwards, so drivers start
+    without touching the network once the cache is warm.
+
+    The cache is laid out as <cache_dir>/<chrome version>/chromedriver and
+    <cache_dir>/<chrome version>/undetected_chromedriver. A Chrome update changes
+    the version, so the next start resolves and caches a new pair.
+
+    '''
+    def __init__(self, cache_dir : str = '.driver_cache', chrome_version : str = None):
+        """
+        Parameters
+        ----------
+        cache_dir : str, optional
+            The directory the binaries are cached in. Defaults to '.driver_cache'
+
+        chrome_version : str, optional
+            The installed Chrome version i.e. '124.0.6367.91'. Defaults to None,
+            which asks the installed Chrome or Chromium for its version
+        """
+        self.cache_dir = cache_dir
+        self.chrome_version = chrome_version
+
+    @classmethod
+    def from_config(cls, driver_config : dict):
+        '''
+        Creates a DriverBinaryCache from the driver_cache section of the driver configuration file
+
+        Parameters
+        ----------
+        driver_config : dict
+            A dictionary representing the driver configuration file
+
+        Returns
+        -------
+            cache : DriverBinaryCache
+                A DriverBinaryCache, or None if the cache is disabled
+        '''
+        cache_config = driver_config.get('driver_cache', {})
+        if not cache_config.get('enabled', True):
+            return None
+        return cls(cache_config.get('path', '.driver_cache'), cache_config.get('chrome_version'))
+
+    def get_chrome_version(self):
+        '''
+        Returns the installed Chrome version, or None if it cannot be found
+
+        The version is read from the local browser, so no network is needed.
+        '''
+        if self.chrome_version is None:
+            os_manager = OperationSystemManager()
+            for chrome_type in (ChromeType.GOOGLE, ChromeType.CHROMIUM):
+                self.chrome_version = os_manager.get_browser_version_from_os(chrome_type)
+                if self.chrome_version:
+                    break
+        return self.chrome_version
+
+    def get_version_main(self):
+        '''
+        Returns the major Chrome version i.e. 124, or None if it cannot be found
+        '''
+        chrome_version = self.get_chrome_version()
+        return int(chrome_version.split('.')[0]) if chrome_version else None
+
+    def get_cached_path(self, binary_name : str):
+        executable_name = f'{binary_name}.exe' if sys.platform.startswith('win') else binary_name
+        return os.path.join(self.cache_dir, self.get_chrome_version(), executable_name)
+
+    def store_binary(self, source_path : str, cached_path : str, patch=None):
+        '''
+        Copies a binary into the cache, then renames it into place
+
+        Several site workers may warm the cache at once. Each one writes its own
+        temporary copy, so a half written binary is never picked up.
+
+        Parameters
+        ----------
+        source_path : str
+            The binary to copy
+
+        cached_path : str
+            Where the binary is cached
+
+        patch : callable, optional
+            Called with the path of the temporary copy before it is renamed into place
+        '''
+        directory = os.path.dirname(cached_path)
+        os.makedirs(directory, exist_ok=True)
+        # Keep the .exe extension on Windows, which the Patcher expects
+        file_descriptor, temporary_path = tempfile.mkstemp(dir=directory, suffix='.tmp' + os.path.splitext(cached_path)[1])
+        os.close(file_descriptor)
+        try:
+            shutil.copy2(source_path, temporary_path)
+            if patch is not None:
+                patch(temporary_path)
+            os.replace(temporary_path, cached_path)
+        except BaseException:
+            if os.path.exists(temporary_path):
+                os.remove(temporary_path)
+            raise
+
+    def chromedriver_path(self):
+        '''
+        Returns the path to a stock chromedriver matching the installed Chrome
+
+        Returns
+        -------
+            path : str
+                The cached binary, resolved through ChromeDriverManager on the first call.
+                If the Chrome version is unknown nothing is cached and ChromeDriverManager is used directly.
+        '''
+        if self.get_chrome_version() is None:
+            return ChromeDriverManager().install()
+
+        cached_path = self.get_cached_path('chromedriver')
+        if not os.path.exists(cached_path):
+            print(f"Caching chromedriver for Chrome {self.chrome_version}")
+            self.store_binary(ChromeDriverManager().install(), cached_path)
+        return cached_path
+
+    def patched_chromedriver_path(self):
+        '''
+        Returns the path to a chromedriver patched by undetected-chromedriver
+
+        Returns
+        -------
+            path : str
+                The cached patched binary, or None if the Chrome version is unknown,
+                in which case uc.Chrome() has to download and patch its own
+        '''
+        if self.get_chrome_version() is None:
+            return None
+
+        cached_path = self.get_cached_path('undetected_chromedriver')
+        if not os.path.exists(cached_path):
+            print(f"Caching patched chromedriver for Chrome {self.chrome_version}")
+
+            def patch(path):
+                patcher = Patcher(executable_path=path, version_main=self.get_version_main())
+                patcher.patch_exe()
+                if not patcher.is_binary_patched(path):
+                    raise RuntimeError(f'Could not patch {path}')
+
+            self.store_binary(self.chromedriver_path(), cached_path, patch=patch)
+        return cached_path
+
+    def warm(self, driver_type : str):
+        '''
+        Resolves the binary a driver type needs, so later drivers start from the cache
+
+        Parameters
+        ----------
+        driver_type : str
+            One of stealth_driver, undetected_stealth_driver and setup_driver
+        '''
+        if driver_type == 'undetected_stealth_driver':
+            return self.patched_chromedriver_path()
+        return self.chromedriver_path()
+
+    def clear(self):
+        '''
+        Deletes every cached binary
+        '''
+        if os.path.exists(self.cache_dir):
+            shutil.rmtree(self.cache_dir)
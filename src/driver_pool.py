@@ -0,0 +1,229 @@
+from contextlib import contextmanager
+from queue import LifoQueue, Empty
+import atexit
+import threading
+import yaml
+
+
+class DriverPool:
+    '''
+    A class to share a bounded number of selenium webdriver objects between scrapers
+
+    Drivers are started lazily the first time they are checked out,
+    health checked when they are handed out again and recycled after
+    a set number of page loads. Every driver that is started is quit
+    when the pool is closed or the interpreter exits.
+
+    '''
+    def __init__(self, driver_factory, pool_size : int = 2, max_page_loads : int = 200, checkout_timeout : float = None):
+        """
+        Parameters
+        ----------
+        driver_factory : callable
+            A callable which takes no arguments and returns a new selenium WebDriver object
+
+        pool_size : int, optional
+            The maximum number of drivers which can be alive at the same time.
+            Defaults to 2
+
+        max_page_loads : int, optional
+            The number of page loads after which a driver is quit and replaced.
+            Defaults to 200
+
+        checkout_timeout : float, optional
+            The number of seconds to wait for a free driver before raising a TimeoutError.
+            Defaults to None, which waits indefinitely.
+
+        Attributes
+        ----------
+        self.page_loads : dict
+            A dictionary mapping the id of each live driver to the number of pages it has loaded
+        """
+        if pool_size < 1:
+            raise ValueError('pool_size must be at least 1')
+
+        self.driver_factory = driver_factory
+        self.pool_size = pool_size
+        self.max_page_loads = max_page_loads
+        self.checkout_timeout = checkout_timeout
+        self.page_loads = {}
+        self.closed = False
+
+        self._idle_drivers = LifoQueue()
+        self._live_drivers = {}
+        self._slots = threading.BoundedSemaphore(pool_size)
+        self._lock = threading.Lock()
+
+        # Guarantee that no Chrome processes outlive the interpreter
+        atexit.register(self.close)
+
+    @classmethod
+    def from_config(cls, driver_config_file : str, file_type : str = 'yaml', website_options=False):
+        '''
+        Creates a DriverPool from the driver_pool section of the driver configuration file
+
+        Parameters
+        ----------
+        driver_config_file : str
+            The file path to the driver configuration file i.e. config/options_config.yaml
+
+        file_type : str, optional
+            The file type of the driver configuration file. Defaults to 'yaml'
+
+        website_options : bool, optional
+            Whether the arguments inside the configuration file are applied to each driver.
+            Defaults to False
+
+        Returns
+        -------
+            pool : DriverPool
+                A DriverPool whose drivers are built from the driver configuration file
+        '''
+        # Imported here to avoid a circular import, general_scraper only duck-types the pool
+        from src.general_scraper import GeneralScraper
+
+        with open(driver_config_file, 'r') as file:
+            pool_config = (yaml.safe_load(file) or {}).get('driver_pool', {})
+
+        pool = cls(
+            None,
+            pool_size=pool_config.get('pool_size', 2),
+            max_page_loads=pool_config.get('max_page_loads', 200),
+            checkout_timeout=pool_config.get('checkout_timeout')
+        )
+        # The builder never starts a driver of its own because it is given the pool
+        driver_builder = GeneralScraper(driver_config_file, file_type, website_options=website_options, driver_pool=pool)
+        pool.driver_factory = driver_builder.create_driver
+        return pool
+
+    def checkout(self):
+        '''
+        Checks a driver out of the pool.
+
+        Blocks until a driver is free if all of the drivers are in use.
+
+        Returns
+        -------
+            driver : WebDriver
+                A healthy selenium WebDriver object
+        '''
+        if self.closed:
+            raise RuntimeError('Cannot check out a driver from a closed DriverPool')
+
+        if not self._slots.acquire(timeout=self.checkout_timeout):
+            raise TimeoutError(f'No driver became free within {self.checkout_timeout} seconds')
+
+        try:
+            while True:
+                try:
+                    driver = self._idle_drivers.get_nowait()
+                except Empty:
+                    return self._start_driver()
+
+                if self.is_healthy(driver):
+                    return driver
+                print('Discarding unhealthy driver')
+                self._quit_driver(driver)
+        except Exception:
+            self._slots.release()
+            raise
+
+    def checkin(self, driver):
+        '''
+        Returns a driver to the pool.
+
+        The driver is quit instead of being reused if it has reached the
+        max_page_loads limit, is no longer responsive or the pool has been closed.
+
+        Parameters
+        ----------
+        driver : WebDriver
+            A selenium WebDriver object previously returned by checkout
+        '''
+        try:
+            if self.closed:
+                self._quit_driver(driver)
+            elif self.page_loads.get(id(driver), 0) >= self.max_page_loads:
+                print(f'Recycling driver after {self.page_loads[id(driver)]} page loads')
+                self._quit_driver(driver)
+            elif not self.is_healthy(driver):
+                print('Discarding unhealthy driver')
+                self._quit_driver(driver)
+            else:
+                self._idle_drivers.put(driver)
+        finally:
+            self._slots.release()
+
+    @contextmanager
+    def driver(self):
+        '''
+        Context manager which checks a driver out and always returns it to the pool
+
+        Yields
+        ------
+            driver : WebDriver
+                A selenium WebDriver object
+        '''
+        driver = self.checkout()
+        try:
+            yield driver
+        finally:
+            self.checkin(driver)
+
+    def record_page_load(self, driver):
+        '''
+        Increments the page load counter of a driver
+
+        Parameters
+        ----------
+        driver : WebDriver
+            A selenium WebDriver object checked out of the pool
+        '''
+        with self._lock:
+            self.page_loads[id(driver)] = self.page_loads.get(id(driver), 0) + 1
+
+    @staticmethod
+    def is_healthy(driver):
+        '''
+        Checks whether a driver is still responsive
+
+        Returns
+        -------
+            bool
+                True if the browser answered a lightweight command, False otherwise
+        '''
+        try:
+            driver.current_window_handle
+            return True
+        except Exception:
+            return False
+
+    def close(self):
+        '''
+        Quits every driver started by the pool. Safe to call more than once.
+        '''
+        with self._lock:
+            if self.closed:
+                return
+            self.closed = True
+            live_drivers = list(self._live_drivers.values())
+
+        for driver in live_drivers:
+            self._quit_driver(driver)
+        print(f'DriverPool closed, {len(live_drivers)} driver(s) quit')
+
+    def _start_driver(self):
+        driver = self.driver_factory()
+        with self._lock:
+            self._live_drivers[id(driver)] = driver
+            self.page_loads[id(driver)] = 0
+        return driver
+
+    def _quit_driver(self, driver):
+        with self._lock:
+            self._live_drivers.pop(id(driver), None)
+            self.page_loads.pop(id(driver), None)
+        try:
+            driver.quit()
+        except Exception as e:
+            print(f'Error quitting driver: {e}')
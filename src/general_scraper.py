@@ -9,22 +9,84 @@ from selenium.webdriver.chrome.options import Options
 from selenium.webdriver.common.by import By
 from selenium.webdriver.common.keys import Keys
 from selenium import webdriver
-from random import uniform
 from selenium.webdriver import ChromeService
 from selenium_stealth import stealth
-from time import sleep
+from time import monotonic
+from collections import deque
+from urllib.parse import quote_plus
 import undetected_chromedriver as uc
 from webdriver_manager.chrome import ChromeDriverManager
+from contextlib import contextmanager
+from src.http_fetcher import HttpFetcher
+from src.rate_limiter import RateLimiter
+from src.record_sink import RecordSink
+from src.resource_blocker import ResourceBlocker
+from src.browser_state import BrowserState
+from src.driver_binary_cache import DriverBinaryCache
+from src.page_readiness import PageReadiness
+from src.retry_policy import RetryPolicy, CircuitBreaker, CircuitOpenError
+from src.site_spec import SiteSpec
 import json 
 import yaml 
 
 
+# Evaluates every XPath in one round trip, returning null for fields with no matching node
+BATCH_EXTRACTION_SCRIPT = '''
+var xpaths = arguments[0];
+var attribute = arguments[1];
+var context = arguments[2] || document;
+var results = {};
+for (var key in xpaths) {
+    try {
+        var node = document.evaluate(xpaths[key], context, null, XPathResult.FIRST_ORDERED_NODE_TYPE, null).singleNodeValue;
+        if (node === null) {
+            results[key] = null;
+            continue;
+        }
+        var value;
+        if (node.nodeType === Node.ATTRIBUTE_NODE || node.nodeType === Node.TEXT_NODE) {
+            value = node.nodeValue;
+        } else if (attribute in node) {
+            value = node[attribute];
+        } else {
+            value = node.getAttribute(attribute);
+        }
+        results[key] = (value === null || value === undefined) ? null : String(value).trim();
+    } catch (error) {
+        results[key] = null;
+    }
+}
+return results;
+'''
+
+# Collects the link of every card matching a container XPath in one round trip
+LINK_EXTRACTION_SCRIPT = '''
+var cards = document.evaluate(arguments[0], document, null, XPathResult.ORDERED_NODE_SNAPSHOT_TYPE, null);
+var links = [];
+for (var index = 0; index < cards.snapshotLength; index++) {
+    var link = document.evaluate(arguments[1], cards.snapshotItem(index), null, XPathResult.FIRST_ORDERED_NODE_TYPE, null).singleNodeValue;
+    links.push(link === null ? null : (link.href || link.getAttribute('href')));
+}
+return links;
+'''
+
+# Page titles which mean the site has blocked or throttled the scraper
+BLOCK_PAGE_MARKERS = {
+    'too many requests': 'throttled',
+    'just a moment': 'captcha',
+    'captcha': 'captcha',
+    'are you a robot': 'captcha',
+    'security check': 'captcha',
+    'access denied': 'captcha'
+}
+
+
 class GeneralScraper:
     '''
     A class containing generic methods for webscraping 
 
     '''
-    def __init__(self, driver_config_file : str, file_type : str = 'yaml', website_options=False):
+    def __init__(self, driver_config_file : str, file_type : str = 'yaml', website_options=False, driver_pool=None, rate_limiter=None, seen_url_index=None, checkpoint_store=None):
         """
         initializes a Selenium webdriver object based on the driver configuration file and
         optional website options.
@@ -43,6 +105,25 @@ class GeneralScraper:
             a boolean flag that indicates whether additional options specific to a website should be considered during the initialization
         of the object. 
         If `website_options` is set to `True`, the code will call the `select_options` method. 
+
+        driver_pool : DriverPool, optional
+            A DriverPool to check drivers out of. 
+            When a pool is given no driver is started on initialisation, 
+            instead one is checked out for the duration of each scraping task. 
+
+        rate_limiter : RateLimiter, optional
+            The politeness scheduler which paces every request made by the scraper. 
+            Pass the same RateLimiter to several scrapers to share it. 
+            Defaults to a new RateLimiter for this scraper. 
+
+        seen_url_index : SeenUrlIndex, optional
+            An index of job urls scraped on previous runs. 
+            Harvested urls found in it are not fetched again. 
+            Defaults to None, which fetches every url. 
+
+        checkpoint_store : CheckpointStore, optional 
+            Records the progress of each job title so an interrupted run can be resumed. 
+            Defaults to None, which does not checkpoint. 
         
     
     
@@ -58,15 +139,87 @@ class GeneralScraper:
         self.website_options : dict 
             A dictionary containing credentials for the website options 
 
+        self.driver_pool : DriverPool 
+            The pool drivers are checked out of, None if the scraper owns its driver
+
+        self.http_fetcher : HttpFetcher 
+            The HTTP fast path for detail pages, None until a site enables it with setup_http_fetcher
+
+        self.rate_limiter : RateLimiter 
+            The politeness scheduler pacing requests to each domain
+
+        self.tab_throughput : dict 
+            The pages per second of the last extract_pages_in_tabs call for each number of tabs used
+
+        self.extracted_urls : list 
+            The harvested urls extracted since the last call to commit_seen_urls 
+
+        self.record_sink : RecordSink 
+            The files each record is streamed to, None until a site calls setup_record_sink
+
+        self.resuming : bool 
+            True if the checkpoint_store was loaded from an interrupted run 
+
+        self.heartbeat : callable 
+            Called before every request so a supervising process can tell the scraper is not hung, None by default 
+
+        self.resource_blocker : ResourceBlocker 
+            Blocks images, fonts and trackers in the site's tabs, None until a site enables it with setup_resource_blocker 
+
+        self.browser_state : BrowserState 
+            The site's saved cookies, None until a site enables it with setup_browser_state 
+
+        self.consent_valid : bool 
+            True while the driver holds the site's saved consent cookies, so the cookie banner can be skipped 
+
+        self.driver_binary_cache : DriverBinaryCache 
+            The cached chromedriver binaries drivers are started with, None if driver_cache is disabled 
+
+        self.page_readiness : PageReadiness 
+            The conditions pages are waited on, configured by the page_readiness section of the driver configuration file 
+
+        self.retry_policy : RetryPolicy 
+            How page loads, pagination and detail fetches are retried, site settings are applied by setup_retry_policy 
+
+        self.circuit_breaker : CircuitBreaker 
+            Pauses the site after too many failures in a row, site settings are applied by setup_retry_policy 
+
+        self.skipped_job_titles : list 
+            The job titles skipped because the circuit breaker was open, left in the checkpoint for --resume 
+
         """
         self.driver_config = self.load_config_file(driver_config_file, file_type)
         self.website_options = website_options 
+        self.driver_pool = driver_pool
+        self.http_fetcher = None
+        self.rate_limiter = rate_limiter if rate_limiter is not None else RateLimiter()
+        self.tab_throughput = {}
+        self.seen_url_index = seen_url_index
+        self.extracted_urls = []
+        self.record_sink = None
+        self.checkpoint_store = checkpoint_store
+        self.resuming = checkpoint_store is not None and checkpoint_store.resumed
+        self.current_job_title = None
+        self.unsaved_urls = []
+        self.heartbeat = None
+        self.resource_blocker = None
+        self.browser_state = None
+        self.consent_valid = False
+        self.driver_binary_cache = DriverBinaryCache.from_config(self.driver_config)
+        self.page_readiness = PageReadiness.from_config(self.driver_config)
+        self.retry_policy = RetryPolicy.from_config(self.driver_config, {})
+        self.circuit_breaker = CircuitBreaker.from_config(type(self).__name__, self.driver_config, {})
+        self.skipped_job_titles = []
 
         self.driver_type = self.driver_config['driver_type']
         if self.website_options:
             self.options = self.select_options() 
         
-        self.driver = self.select_driver() 
+        # Pooled scrapers check a driver out per task instead of starting Chrome here
+        if self.driver_pool is None:
+            self.driver = self.select_driver() 
+        else:
+            self.driver = None
 
 
     def load_config_file(self, config_path : str, file_type : str = 'json' or 'yaml' or 'yml'):
@@ -123,21 +276,973 @@ class GeneralScraper:
             self.driver : WebDriver 
                 A selenium WebDriver object
         '''
+        self.driver = self.create_driver()
+        return self.driver
+
+    def create_driver(self):
+        '''
+        Creates a new driver based on what is passed into the driver_config.yaml file 
+        without assigning it to the scraper. 
+
+        Used by the DriverPool to start drivers on demand. 
+
+        Returns
+        ------- 
+            driver : WebDriver 
+                A selenium WebDriver object
+        '''
+        # ChromeOptions cannot be shared between drivers, so build a fresh set for each one
+        if self.website_options:
+            self.options = self.select_options()
+
+        start_time = monotonic()
         if self.driver_type == 'stealth_driver':
-            self.driver = self.setup_stealth_driver()
-            return self.driver 
+            driver = self.setup_stealth_driver()
         
         elif self.driver_type == 'undetected_stealth_driver':
-            self.driver = self.setup_undetected_stealth_driver()
-            return self.driver
+            driver = self.setup_undetected_stealth_driver()
         
         elif self.driver_type == 'setup_driver':
-            self.driver = self.setup_driver()
-            return self.driver
+            driver = self.setup_driver()
 
         else:
             raise ValueError('Invalid driver selection only stealth_driver, undetected_stealth_driver and setup_driver are valid')
 
+        print(f"Started {self.driver_type} in {monotonic() - start_time:.2f}s")
+        return driver
+
+    def get_chromedriver_path(self):
+        '''
+        Returns the chromedriver binary for a stock selenium driver, from the driver cache when it is enabled 
+        '''
+        if self.driver_binary_cache is None:
+            return ChromeDriverManager().install()
+        return self.driver_binary_cache.chromedriver_path()
+
+    def get_undetected_driver_arguments(self):
+        '''
+        Returns the keyword arguments which start uc.Chrome() from the cached patched chromedriver. 
+
+        Without them uc.Chrome() downloads and patches a new binary on every start. 
+
+        Returns
+        -------
+            arguments : dict 
+                driver_executable_path and version_main, or an empty dictionary if there is no cached binary 
+        '''
+        if self.driver_binary_cache is None:
+            return {}
+        driver_executable_path = self.driver_binary_cache.patched_chromedriver_path()
+        if driver_executable_path is None:
+            return {}
+        return {'driver_executable_path': driver_executable_path, 'version_main': self.driver_binary_cache.get_version_main()}
+
+    @contextmanager
+    def checkout_driver(self):
+        '''
+        Context manager which assigns a driver to the scraper for the duration of a task. 
+
+        If the scraper was created with a DriverPool, a driver is checked out 
+        of the pool and returned to it afterwards. Otherwise the scraper's own driver is used. 
+
+        Yields
+        ------
+            self.driver : WebDriver 
+                A selenium WebDriver object
+        '''
+        if self.driver_pool is None:
+            yield self.driver
+            return
+
+        self.driver = self.driver_pool.checkout()
+        try:
+            # Pooled drivers are shared between sites, so apply this site's block list on every checkout
+            if self.resource_blocker is not None:
+                self.resource_blocker.apply(self.driver)
+            # Pooled drivers also carry other sites' cookies, so load this site's saved consent each time
+            if self.browser_state is not None:
+                self.consent_valid = self.browser_state.load(self.driver)
+            yield self.driver
+        finally:
+            if self.browser_state is not None and self.consent_valid:
+                # Refresh the saved cookies with any the site set during the task, keeping when the consent was given
+                self.browser_state.save(self.driver, new_consent=False)
+            self.driver_pool.checkin(self.driver)
+            self.driver = None
+
+    def load_page(self, url : str):
+        '''
+        Navigates the current driver to a url, counting the page load against the driver's pool budget. 
+
+        The request is paced by the rate limiter and the loaded page is checked for block pages. 
+
+        Parameters
+        ----------
+            url : str 
+                The url of the webpage 
+
+        Returns
+        ------- 
+            None 
+        '''
+        self.pace(url)
+        try:
+            self.driver.get(url)
+        except TimeoutException:
+            self.rate_limiter.report(url, 'timeout')
+            raise
+        if self.driver_pool is not None:
+            self.driver_pool.record_page_load(self.driver)
+        self.report_page_health(url)
+        self.record_resource_usage()
+
+    def extract_pages_in_tabs(self, list_of_urls : list, extract_page, number_of_tabs : int = 1, timeout : int = 30, on_record=None):
+        '''
+        Loads a list of pages in several tabs of the same browser and extracts each one when it is ready. 
+
+        Urls are dispatched to the tabs round-robin, so while one tab is being extracted 
+        the others are still loading. No extra Chrome processes are started. 
+
+        Parameters
+        ----------
+            list_of_urls : list 
+                The urls of the job detail pages 
+
+            extract_page : callable 
+                A callable which takes the url of the page loaded in the current tab and returns its record 
+
+            number_of_tabs : int, optional 
+                The number of tabs to load pages in. Defaults to 1, which loads the pages one at a time 
+
+            timeout : int, optional 
+                The number of seconds to wait for a tab to finish loading. Defaults to 30 
+
+            on_record : callable, optional 
+                A callable taking the url and record of each page as soon as it is extracted, 
+                i.e. store_record. Defaults to None, which collects the records into a list 
+
+        Returns
+        ------- 
+            records : list 
+                The record of each page which finished loading, empty when on_record is given 
+        '''
+        if not list_of_urls:
+            return []
+
+        started_at = monotonic()
+        records = []
+        number_of_pages = 0
+
+        def handle_record(url, record):
+            nonlocal number_of_pages
+            number_of_pages += 1
+            if on_record is not None:
+                on_record(url, record)
+            else:
+                records.append(record)
+
+        if number_of_tabs <= 1:
+            for url in list_of_urls:
+                try:
+                    record = self.fetch_page(url, extract_page)
+                except self.retry_policy.retry_on:
+                    print(f"Skipping {url}")
+                    continue
+                handle_record(url, record)
+        else:
+            original_handle = self.driver.current_window_handle
+            handles = [original_handle]
+            for _ in range(min(number_of_tabs, len(list_of_urls)) - 1):
+                self.driver.switch_to.new_window('tab')
+                # The block list is set per tab, so each new tab needs it too
+                if self.resource_blocker is not None:
+                    self.resource_blocker.apply(self.driver)
+                handles.append(self.driver.current_window_handle)
+
+            pending_urls = deque(list_of_urls)
+            in_flight = deque()
+            try:
+                for handle in handles:
+                    url = pending_urls.popleft()
+                    self.dispatch_to_tab(handle, url)
+                    in_flight.append((handle, url))
+
+                while in_flight:
+                    # Stop loading pages once the site has failed too many times in a row
+                    self.circuit_breaker.check()
+                    handle, url = in_flight.popleft()
+                    self.driver.switch_to.window(handle)
+                    if self.wait_for_tab(url, timeout):
+                        try:
+                            record = extract_page(url)
+                        except self.retry_policy.retry_on as e:
+                            print(f"Skipping {url}: {type(e).__name__}")
+                            self.circuit_breaker.record_failure()
+                        else:
+                            self.circuit_breaker.record_success()
+                            handle_record(url, record)
+                    else:
+                        self.circuit_breaker.record_failure()
+                    # Give the tab its next page before extracting from the others
+                    if pending_urls:
+                        next_url = pending_urls.popleft()
+                        self.dispatch_to_tab(handle, next_url)
+                        in_flight.append((handle, next_url))
+            finally:
+                for handle in handles[1:]:
+                    try:
+                        self.driver.switch_to.window(handle)
+                        self.driver.close()
+                    except Exception as e:
+                        print(f"Error closing tab: {e}")
+                self.driver.switch_to.window(original_handle)
+
+        elapsed = monotonic() - started_at
+        pages_per_second = number_of_pages / elapsed if elapsed else 0.0
+        self.tab_throughput[number_of_tabs] = pages_per_second
+        print(f"Extracted {number_of_pages} pages with {number_of_tabs} tab(s) in {elapsed:.1f}s ({pages_per_second:.2f} pages per second)")
+        return records
+
+    def fetch_page(self, url : str, extract_page):
+        '''
+        Loads a page and extracts its record, retrying both with the retry policy. 
+
+        Parameters
+        ----------
+            url : str 
+                The url of the page 
+
+            extract_page : callable 
+                A callable which takes the url of the loaded page and returns its record 
+
+        Returns
+        ------- 
+            record 
+                The record returned by extract_page. The last exception is raised if every attempt failed, 
+                and a CircuitOpenError if the site is paused 
+        '''
+        def load_and_extract():
+            self.load_page(url)
+            return extract_page(url)
+
+        return self.retry_policy.run(load_and_extract, f"fetching {url}", circuit_breaker=self.circuit_breaker)
+
+    def dispatch_to_tab(self, handle : str, url : str):
+        '''
+        Starts loading a url in a tab without waiting for the page to finish loading. 
+
+        The old document is marked so wait_for_tab can tell it apart from the new one. 
+
+        Parameters
+        ----------
+            handle : str 
+                The window handle of the tab 
+
+            url : str 
+                The url to load 
+        '''
+        self.driver.switch_to.window(handle)
+        self.pace(url)
+        self.driver.execute_script("window.jobScraperPending = true; window.location.href = arguments[0];", url)
+        if self.driver_pool is not None:
+            self.driver_pool.record_page_load(self.driver)
+
+    def wait_for_tab(self, url : str, timeout : int = 30):
+        '''
+        Waits for the page dispatched to the current tab to finish loading. 
+
+        Parameters
+        ----------
+            url : str 
+                The url which was dispatched to the tab 
+
+            timeout : int, optional 
+                The number of seconds to wait. Defaults to 30 
+
+        Returns
+        ------- 
+            bool 
+                True if the page loaded, False if it timed out 
+        '''
+        try:
+            WebDriverWait(self.driver, timeout).until(
+                lambda driver: driver.execute_script("return !window.jobScraperPending && document.readyState === 'complete';")
+            )
+        except TimeoutException:
+            print(f"Timed out loading {url} in tab, skipping it.")
+            self.rate_limiter.report(url, 'timeout')
+            return False
+        self.report_page_health(url)
+        self.record_resource_usage()
+        return True
+
+    def setup_rate_limiter(self, base_url : str, scraper_config : dict):
+        '''
+        Applies the request budget from the site configuration to the site's domain. 
+
+        Parameters
+        ----------
+            base_url : str 
+                The url of the website 
+
+            scraper_config : dict 
+                A dictionary representing the configuration file for the website. 
+                The budget is configured by base_config.rate_limit 
+        '''
+        self.rate_limiter.configure_domain(base_url, scraper_config.get('base_config', {}).get('rate_limit'))
+
+    def pace(self, url : str = None):
+        '''
+        Waits until the next request to a domain is within its budget. 
+
+        Called before every navigation, including clicks which load a new page. 
+
+        Parameters
+        ----------
+            url : str, optional 
+                The url about to be requested. Defaults to the driver's current url 
+
+        Returns
+        ------- 
+            delay : float 
+                The number of seconds spent waiting 
+        '''
+        if self.heartbeat is not None:
+            self.heartbeat()
+        return self.rate_limiter.wait(url or self.driver.current_url)
+
+    def report_page_health(self, url : str = None):
+        '''
+        Reports whether the current page is a block page so the rate limiter can adapt. 
+
+        Parameters
+        ----------
+            url : str, optional 
+                The url which was requested. Defaults to the driver's current url 
+
+        Returns
+        ------- 
+            signal : str 
+                'ok' for a normal page, 'throttled' or 'captcha' for a block page 
+        '''
+        url = url or self.driver.current_url
+        title = (self.driver.title or '').lower()
+        signal = 'ok'
+        for marker, marker_signal in BLOCK_PAGE_MARKERS.items():
+            if marker in title:
+                signal = marker_signal
+                break
+        self.rate_limiter.report(url, signal)
+        return signal
+
+    def setup_resource_blocker(self, scraper_config : dict):
+        '''
+        Blocks the resources the site's XPaths do not need if resource blocking is enabled. 
+
+        Parameters
+        ----------
+            scraper_config : dict 
+                A dictionary representing the configuration file for the website. 
+                Blocking is configured by base_config.resource_blocking, 
+                on top of the resource_blocking defaults in the driver configuration file 
+
+        Returns
+        ------- 
+            self.resource_blocker : ResourceBlocker 
+                The ResourceBlocker for the site or None if it is not enabled 
+        '''
+        self.resource_blocker = ResourceBlocker.from_config(self.driver_config, scraper_config)
+        if self.resource_blocker is not None and self.has_own_driver():
+            self.resource_blocker.apply(self.driver)
+        return self.resource_blocker
+
+    def has_own_driver(self):
+        '''
+        Whether the scraper was created with its own driver, which the site settings are applied to once. 
+        A scraper with a pool has no driver until checkout_driver, which applies them on every checkout. 
+        '''
+        return self.driver is not None
+
+    def record_resource_usage(self):
+        '''
+        Counts the requests blocked and the bytes downloaded by the page which just loaded. 
+        '''
+        if self.resource_blocker is not None:
+            self.resource_blocker.record_performance_log(self.driver)
+
+    def print_resource_summary(self):
+        '''
+        Prints the requests blocked and the bandwidth saved for the site during the run. 
+
+        Called once the site is done, it also prints the HTTP fast path summary and closes its pooled connections. 
+        '''
+        if self.resource_blocker is not None:
+            self.resource_blocker.print_summary(self.get_checkpoint_site())
+        if self.http_fetcher is not None:
+            self.http_fetcher.close()
+
+    def setup_browser_state(self, scraper_config : dict):
+        '''
+        Loads the site's saved cookies so its cookie banner can be skipped, if persistent browser state is enabled. 
+
+        Parameters
+        ----------
+            scraper_config : dict 
+                A dictionary representing the configuration file for the website. 
+                The cookie jar is configured by base_config.browser_state 
+
+        Returns
+        ------- 
+            self.browser_state : BrowserState 
+                The BrowserState for the site or None if it is not enabled 
+        '''
+        self.browser_state = BrowserState.from_scraper_config(scraper_config, self.base_url)
+        if self.browser_state is not None and self.has_own_driver():
+            self.consent_valid = self.browser_state.load(self.driver)
+        return self.browser_state
+
+    def setup_retry_policy(self, scraper_config : dict):
+        '''
+        Applies the site's retry and circuit_breaker settings on top of the defaults in the driver configuration file. 
+
+        Parameters
+        ----------
+            scraper_config : dict 
+                A dictionary representing the configuration file for the website 
+
+        Returns
+        ------- 
+            self.retry_policy : RetryPolicy 
+        '''
+        self.retry_policy = RetryPolicy.from_config(self.driver_config, scraper_config)
+        self.circuit_breaker = CircuitBreaker.from_config(self.get_checkpoint_site(), self.driver_config, scraper_config)
+        return self.retry_policy
+
+    def handle_consent(self, dismiss_banner):
+        '''
+        Accepts the site's cookie banner unless the driver already holds the saved consent. 
+
+        Once the banner has been accepted the site's cookies are saved, so later drivers and runs skip it. 
+
+        Parameters
+        ----------
+            dismiss_banner : callable 
+                Takes no arguments, dismisses the banner and returns True if it was dismissed 
+                i.e. lambda: self.dismiss_element(cookies_path, 'Cookies Content')
+
+        Returns
+        ------- 
+            bool 
+                True if the consent is in place 
+        '''
+        if self.consent_valid:
+            print(f"Saved consent for {self.get_checkpoint_site()} is still valid, skipping the cookie banner")
+            return True
+
+        if not dismiss_banner():
+            return False
+        if self.browser_state is not None:
+            self.consent_valid = True
+            self.browser_state.save(self.driver)
+        return True
+
+    def setup_http_fetcher(self, scraper_config : dict):
+        '''
+        Enables the HTTP fast path for detail pages if the site configuration asks for it. 
+
+        Parameters
+        ----------
+            scraper_config : dict 
+                A dictionary representing the configuration file for the website. 
+                The fast path is configured by base_config.http_fetcher 
+
+        Returns
+        ------- 
+            self.http_fetcher : HttpFetcher 
+                The HttpFetcher for the site or None if it is not enabled 
+        '''
+        self.http_fetcher = HttpFetcher.from_scraper_config(scraper_config)
+        return self.http_fetcher
+
+    def setup_record_sink(self, scraper_config : dict, append : bool = None):
+        '''
+        Creates the sink the site's records are streamed to as they are extracted. 
+
+        Parameters
+        ----------
+            scraper_config : dict 
+                A dictionary representing the configuration file for the website. 
+                The sink is configured by base_config.record_sink 
+
+            append : bool, optional 
+                Whether to keep the records of a previous run. 
+                Defaults to None, which keeps them only when resuming 
+
+        Returns
+        ------- 
+            self.record_sink : RecordSink 
+                The RecordSink for the site 
+        '''
+        if append is None:
+            append = self.resuming
+        self.record_sink = RecordSink.from_scraper_config(scraper_config, append=append)
+        return self.record_sink
+
+    def store_record(self, url : str, record : dict):
+        '''
+        Writes an extracted record to the record sink and checkpoints its url. 
+
+        Parameters
+        ----------
+            url : str 
+                The url of the job detail page 
+
+            record : dict 
+                A dictionary representing the elements on the job detail page 
+        '''
+        self.record_sink.write(record)
+        self.extracted_urls.append(url)
+        if self.checkpoint_store is not None:
+            self.unsaved_urls.append(url)
+            if len(self.unsaved_urls) >= self.record_sink.flush_every:
+                self.save_checkpoint()
+
+    def save_checkpoint(self):
+        '''
+        Flushes the record sink, then marks the urls stored since the last checkpoint as fetched. 
+
+        At most record_sink.flush_every records are fetched twice after a crash. 
+        '''
+        if self.checkpoint_store is None or not self.unsaved_urls:
+            return
+        self.record_sink.flush()
+        self.checkpoint_store.mark_fetched(self.get_checkpoint_site(), self.unsaved_urls)
+        self.unsaved_urls = []
+
+    def get_website_name(self):
+        '''
+        Returns the website_name stored in records whose configuration file leaves it empty, the domain of its base_url 
+        '''
+        return self.get_checkpoint_site()
+
+    def get_checkpoint_site(self):
+        '''
+        Returns the key the site's progress is checkpointed under, the domain of its base_url 
+        '''
+        return RateLimiter.get_domain(self.base_url)
+
+    def run_job_title(self, job_title : str, harvest_job_urls, fetch_job_urls):
+        '''
+        Harvests and fetches the job urls of a job title, skipping the work a previous run checkpointed. 
+
+        A finished job title is skipped, a job title whose harvest finished goes straight 
+        to the detail pages which have not been fetched, and anything else is harvested again. 
+        If the site's circuit breaker opens, the job title is left unfinished in the checkpoint 
+        and added to skipped_job_titles, so one failing site does not stop the run. 
+
+        Parameters
+        ----------
+            job_title : str 
+                The job title being searched 
+
+            harvest_job_urls : callable 
+                A callable with no arguments returning the job urls for the job title 
+
+            fetch_job_urls : callable 
+                A callable taking the list of job urls to fetch and store 
+        '''
+        self.current_job_title = job_title
+        try:
+            if self.checkpoint_store is None:
+                fetch_job_urls(harvest_job_urls())
+                return
+
+            site = self.get_checkpoint_site()
+            if self.checkpoint_store.is_title_complete(site, job_title):
+                print(f"Skipping {job_title} on {site}, it was completed by the last run")
+                return
+
+            list_of_urls = self.checkpoint_store.get_harvested_urls(site, job_title)
+            if list_of_urls is None:
+                list_of_urls = harvest_job_urls()
+                self.checkpoint_store.mark_harvest_complete(site, job_title, list_of_urls)
+            else:
+                print(f"Resuming {job_title} on {site} from {len(list_of_urls)} harvested job urls")
+
+            fetch_job_urls(self.checkpoint_store.filter_unfetched(site, list_of_urls))
+            self.save_checkpoint()
+            self.checkpoint_store.mark_title_complete(site, job_title)
+        except CircuitOpenError as e:
+            print(f"Skipping the rest of {job_title}: {e}")
+            self.skipped_job_titles.append(job_title)
+            # Keep the records fetched before the site was paused
+            self.save_checkpoint()
+
+    def fetch_record_over_http(self, url : str, webpage_config_dict : dict):
+        '''
+        Attempts to extract a job detail page without the browser. 
+
+        Parameters
+        ----------
+            url : str 
+                The url of the job detail page 
+
+            webpage_config_dict : dict 
+                The extract_data dictionary from the site configuration file 
+
+        Returns
+        ------- 
+            data : dict 
+                The record for the page, or None if the caller should 
+                fall back to loading the page with selenium. 
+        '''
+        if self.http_fetcher is None or not self.http_fetcher.enabled:
+            return None
+
+        self.pace(url)
+        record = self.http_fetcher.extract_record(url, webpage_config_dict, self.get_website_name())
+        status_code = self.http_fetcher.last_status_code
+        if status_code is None:
+            self.rate_limiter.report(url, 'timeout')
+        elif status_code in (429, 503):
+            self.rate_limiter.report(url, 'throttled')
+        else:
+            self.rate_limiter.report(url, 'ok')
+        return record
+
+    def filter_unseen_urls(self, list_of_urls : list):
+        '''
+        Removes the urls scraped on previous runs before their detail pages are scheduled. 
+
+        Parameters
+        ----------
+            list_of_urls : list 
+                The job urls harvested from the results pages 
+
+        Returns
+        ------- 
+            unseen_urls : list 
+                The urls which have not been scraped before 
+        '''
+        if self.seen_url_index is None:
+            return list_of_urls
+
+        unseen_urls = self.seen_url_index.filter_unseen(list_of_urls)
+        print(f"Skipping {len(list_of_urls) - len(unseen_urls)} of {len(list_of_urls)} job urls already scraped")
+        return unseen_urls
+
+    def get_pagination_config(self):
+        '''
+        Returns the pagination section of the site's base_config, an empty dictionary if it is not set. 
+        '''
+        return self.scraper_config['base_config'].get('pagination', {})
+
+    def get_page_limit(self, number_of_pages : int = None):
+        '''
+        Caps the number of results pages which are walked for a job title. 
+
+        Parameters
+        ----------
+            number_of_pages : int, optional 
+                The number of pages requested. None requests every page 
+
+        Returns
+        ------- 
+            page_limit : int 
+                The smaller of number_of_pages and pagination.max_pages (default 50) 
+        '''
+        max_pages = self.get_pagination_config().get('max_pages', 50)
+        if number_of_pages is None:
+            return max_pages
+        return min(number_of_pages, max_pages)
+
+    def is_caught_up(self, page_urls : list, unseen_urls : list):
+        '''
+        Decides whether pagination can stop because a results page is mostly jobs scraped before. 
+
+        Only enabled when pagination.stop_when_seen_fraction is set, and only sound 
+        when the results are sorted newest first. 
+
+        Parameters
+        ----------
+            page_urls : list 
+                Every job url on the results page 
+
+            unseen_urls : list 
+                The urls on the page which have not been scraped before 
+
+        Returns
+        ------- 
+            bool 
+                True if the fraction of seen urls on the page reached stop_when_seen_fraction 
+        '''
+        stop_when_seen_fraction = self.get_pagination_config().get('stop_when_seen_fraction')
+        if stop_when_seen_fraction is None or self.seen_url_index is None or not page_urls:
+            return False
+
+        seen_fraction = 1 - len(unseen_urls) / len(page_urls)
+        if seen_fraction >= stop_when_seen_fraction:
+            print(f"{seen_fraction:.0%} of the jobs on this page were already scraped, stopping pagination")
+            return True
+        return False
+
+    def sort_results_by_date(self):
+        '''
+        Sorts the search results newest first if the site configures pagination.sort_by_date_xpath. 
+
+        Returns
+        ------- 
+            bool 
+                True if the results were sorted 
+        '''
+        sort_by_date_xpath = self.get_pagination_config().get('sort_by_date_xpath')
+        if not sort_by_date_xpath:
+            return False
+        try:
+            self.click_button_on_page(sort_by_date_xpath)
+            print("Sorted results by date")
+            return True
+        except (NoSuchElementException, ElementNotInteractableException):
+            print("Could not sort results by date, continuing with the default order")
+            return False
+
+    def get_search_url_config(self):
+        '''
+        Returns the search_url section of the site's base_config, None if the site searches through its search bar. 
+        '''
+        return self.scraper_config['base_config'].get('search_url')
+
+    def build_search_url(self, job_title : str, page_index : int = 0):
+        '''
+        Builds the url of a results page from the site's search_url template. 
+
+        The template can use {title}, {page} and {offset} placeholders, i.e. 
+        https://uk.indeed.com/jobs?q={title}&sort=date&start={offset} 
+
+        Parameters
+        ----------
+            job_title : str 
+                The job title being searched 
+
+            page_index : int, optional 
+                The zero-based index of the results page. Defaults to 0 
+
+        Returns
+        ------- 
+            search_url : str 
+                The url of the results page 
+        '''
+        search_url_config = self.get_search_url_config()
+        return search_url_config['template'].format(
+            title=quote_plus(job_title),
+            page=search_url_config.get('first_page', 1) + page_index,
+            offset=page_index * search_url_config.get('page_size', 10)
+        )
+
+    def collect_page_links(self, webpage_config_dict : dict, timeout : int = 10):
+        '''
+        Collects the job urls from the results page loaded in the current tab. 
+
+        Parameters
+        ----------
+            webpage_config_dict : dict 
+                The extract_data dictionary containing the main_container and job_url xpaths 
+
+            timeout : int, optional 
+                The number of seconds to wait for the job cards. Defaults to 10 
+
+        Returns
+        ------- 
+            page_urls : list 
+                The job urls on the page, empty if the page has no job cards 
+        '''
+        try:
+            WebDriverWait(self.driver, timeout).until(
+                EC.presence_of_element_located((By.XPATH, webpage_config_dict['main_container']))
+            )
+        except TimeoutException:
+            print(f"No job cards found on {self.driver.current_url}")
+            return []
+        return self.extract_links_batch(webpage_config_dict['main_container'], webpage_config_dict['job_url'])
+
+    def collect_job_card_urls(self, webpage_config_dict : dict, timeout : int = 10):
+        '''
+        Collects the job url from each job card on the results page, scrolling each card into view. 
+
+        A stale job card or a page without job cards raises, so paginate can refresh the page and try again. 
+
+        Parameters
+        ----------
+            webpage_config_dict : dict 
+                The extract_data dictionary containing the main_container and job_url xpaths 
+
+            timeout : int, optional 
+                The number of seconds to wait for the job cards. Defaults to 10 
+
+        Returns
+        ------- 
+            page_urls : list 
+                The job urls on the page 
+        '''
+        list_of_job_cards = WebDriverWait(self.driver, timeout).until(
+            EC.presence_of_all_elements_located((By.XPATH, webpage_config_dict['main_container']))
+        )
+        page_urls = []
+        for job_card in list_of_job_cards:
+            url_element = job_card.find_element(By.XPATH, webpage_config_dict['job_url'])
+            page_urls.append(url_element.get_attribute('href'))
+            self.scroll_to_window(job_card)
+        return page_urls
+
+    def paginate(self, collect_page_urls, go_to_next_page, number_of_pages : int = None):
+        '''
+        Collects the job urls from the current results page and the ones after it. 
+
+        Each page is collected with the retry policy, refreshing the page between attempts. 
+        Pagination stops at the page limit, on the last page, once the results have caught up 
+        with the seen urls, or when a page still fails after every attempt. 
+
+        Parameters
+        ----------
+            collect_page_urls : callable 
+                A callable with no arguments returning the job urls on the current page 
+
+            go_to_next_page : callable 
+                A callable with no arguments which moves to the next page and returns something truthy, 
+                or returns None on the last page 
+
+            number_of_pages : int, optional 
+                The number of pages to be scraped, capped by pagination.max_pages 
+
+        Returns
+        ------- 
+            list_of_urls : list 
+                The unique job urls which have not been scraped before, in the order they were found 
+        '''
+        list_of_urls = []
+        page_limit = self.get_page_limit(number_of_pages)
+        for page_number in range(1, page_limit + 1):
+            try:
+                page_urls = self.retry_policy.run(
+                    collect_page_urls,
+                    f"collecting job urls from page {page_number}",
+                    on_retry=lambda attempt, error: self.refresh_page(),
+                    circuit_breaker=self.circuit_breaker
+                )
+            except self.retry_policy.retry_on:
+                print(f"Stopping pagination at page {page_number} of {self.driver.current_url}")
+                break
+            # Only schedule urls which have not been scraped on a previous run
+            unseen_urls = self.filter_unseen_urls(page_urls)
+            list_of_urls.extend(unseen_urls)
+            # Avoid clicking past the last page which is going to be scraped
+            if page_number >= page_limit or self.is_caught_up(page_urls, unseen_urls):
+                break
+            if not go_to_next_page():
+                break
+
+        # Remove duplicate urls while keeping the order of the results
+        return list(dict.fromkeys(list_of_urls))
+
+    def harvest_search_pages(self, job_title : str, webpage_config_dict : dict, number_of_pages : int = None):
+        '''
+        Collects job urls by opening each results page directly from the search_url template. 
+
+        Skips the landing page, the cookie banner and typing into the search bar. 
+        When stop_when_seen_fraction is not set, the pages are independent of each other 
+        and are loaded concurrently, a batch of base_config.browser_tabs tabs at a time. 
+        No further batch is opened once a page has no job cards, as the results have ended. 
+        Each results page is checkpointed once harvested, so a resumed run only opens the rest. 
+
+        Parameters
+        ----------
+            job_title : str 
+                The job title being searched 
+
+            webpage_config_dict : dict 
+                The extract_data dictionary containing the main_container and job_url xpaths 
+
+            number_of_pages : int, optional 
+                The number of pages to be scraped, capped by pagination.max_pages 
+
+        Returns
+        ------- 
+            list_of_urls : list 
+                The unique job urls which have not been scraped before, in the order they were found 
+        '''
+        page_limit = self.get_page_limit(number_of_pages)
+        site = self.get_checkpoint_site()
+        urls_by_page = {}
+        empty_pages = []
+
+        def harvest_page(page_index, page_urls):
+            if not page_urls:
+                empty_pages.append(page_index)
+            unseen_urls = self.filter_unseen_urls(page_urls)
+            urls_by_page[page_index] = unseen_urls
+            if self.checkpoint_store is not None:
+                self.checkpoint_store.mark_page_complete(site, job_title, page_index, unseen_urls)
+            return unseen_urls
+
+        pending_pages = []
+        for page_index in range(page_limit):
+            if self.checkpoint_store is not None and self.checkpoint_store.is_page_complete(site, job_title, page_index):
+                urls_by_page[page_index] = self.checkpoint_store.get_page_urls(site, job_title, page_index)
+            else:
+                pending_pages.append(page_index)
+        if len(pending_pages) < page_limit:
+            print(f"Skipping {page_limit - len(pending_pages)} results pages harvested by the last run")
+
+        if self.get_pagination_config().get('stop_when_seen_fraction') is None:
+            number_of_tabs = max(self.scraper_config['base_config'].get('browser_tabs', 1), 1)
+            for batch_start in range(0, len(pending_pages), number_of_tabs):
+                page_index_by_url = {
+                    self.build_search_url(job_title, page_index): page_index
+                    for page_index in pending_pages[batch_start:batch_start + number_of_tabs]
+                }
+                self.extract_pages_in_tabs(
+                    list(page_index_by_url),
+                    lambda url: self.collect_page_links(webpage_config_dict),
+                    number_of_tabs,
+                    on_record=lambda url, page_urls: harvest_page(page_index_by_url[url], page_urls)
+                )
+                if empty_pages:
+                    print(f"Stopping at results page {min(empty_pages)} of {job_title}, it has no job cards")
+                    break
+        else:
+            # Pages are walked in order so pagination can stop once it has caught up
+            for page_index in pending_pages:
+                try:
+                    page_urls = self.fetch_page(self.build_search_url(job_title, page_index), lambda url: self.collect_page_links(webpage_config_dict))
+                except self.retry_policy.retry_on:
+                    break
+                if not page_urls:
+                    break
+                unseen_urls = harvest_page(page_index, page_urls)
+                if self.is_caught_up(page_urls, unseen_urls):
+                    break
+
+        list_of_urls = [url for page_index in sorted(urls_by_page) for url in urls_by_page[page_index]]
+        return list(dict.fromkeys(list_of_urls))
+
+    def commit_seen_urls(self):
+        '''
+        Adds the urls extracted so far to the seen url index. 
+
+        The record sink is flushed first, so a crash afterwards 
+        cannot hide unsaved jobs from the next run. 
+        '''
+        if self.record_sink is not None:
+            self.record_sink.flush()
+        list_of_urls = self.extracted_urls
+        if self.resuming:
+            # Include the urls stored by the interrupted run
+            list_of_urls = list(dict.fromkeys(self.checkpoint_store.get_fetched_urls(self.get_checkpoint_site()) + list_of_urls))
+        if self.seen_url_index is not None and list_of_urls:
+            self.seen_url_index.add(list_of_urls)
+            print(f"Added {len(list_of_urls)} job urls to the seen url index")
+        self.extracted_urls = []
+
     def select_options(self):
         '''
         Selects options based on the driver selected from the .yaml file
@@ -156,6 +1261,7 @@ class GeneralScraper:
     
             for argument in self.driver_config['setup_driver']['arguments']:
                 options.add_argument(argument)
+            self.add_performance_logging(options)
             return options
 
         elif self.driver_type == 'stealth_driver':
@@ -168,6 +1274,7 @@ class GeneralScraper:
             for option, argument in self.driver_config['setup_driver']['experimental_options'].items():
                 options.add_experimental_option(option, argument)
 
+            self.add_performance_logging(options)
             return options
 
         elif self.driver_type == 'setup_driver':
@@ -181,8 +1288,24 @@ class GeneralScraper:
                 options.add_experimental_option(option, argument)
                 # Break out of the loop to add only the first experimental option. 
                 break
+            self.add_performance_logging(options)
             return options 
 
+    def add_performance_logging(self, options):
+        '''
+        Asks Chrome for a performance log when resource blocking reports the bytes it saved. 
+
+        Configured by resource_blocking.report_bytes in the driver configuration file. 
+
+        Parameters
+        ----------
+            options : ChromeOptions 
+                The options the driver will be started with 
+        '''
+        resource_blocking_config = self.driver_config.get('resource_blocking', {})
+        if resource_blocking_config.get('report_bytes', False):
+            options.set_capability('goog:loggingPrefs', {'performance': 'ALL'})
+
     def setup_undetected_stealth_driver(self):
         '''
         Sets up an undetected stealth driver using the undetected-chrome package
@@ -195,7 +1318,7 @@ class GeneralScraper:
         
         if self.website_options:
             # Creating the undetected driver
-            driver = uc.Chrome(options=self.options)
+            driver = uc.Chrome(options=self.options, **self.get_undetected_driver_arguments())
 
             # Select options from the driver_config.yaml file for selenium-stealth
             selenium_stealth_options = self.driver_config['selenium-stealth']
@@ -214,7 +1337,7 @@ class GeneralScraper:
         
         else:
             # Creating the undetected driver without options
-            driver = uc.Chrome()
+            driver = uc.Chrome(**self.get_undetected_driver_arguments())
 
             # Select options from the driver_config.yaml file for selenium-stealth
             selenium_stealth_options = self.driver_config['selenium-stealth']
@@ -247,11 +1370,11 @@ class GeneralScraper:
         """
         if self.website_options:
             ua = UserAgent(browsers=[self.driver_config['setup_driver']['browser']]) 
-            service = ChromeService(ChromeDriverManager().install())
+            service = ChromeService(self.get_chromedriver_path())
             return Chrome(service=service, options=self.options)
         else:
             ua = UserAgent(browsers=[self.driver_config['setup_driver']['browser']])
-            service = ChromeService(ChromeDriverManager().install())
+            service = ChromeService(self.get_chromedriver_path())
             # Setup driver without using the extra command line options
             return Chrome(service=service)
 
@@ -271,7 +1394,7 @@ class GeneralScraper:
 
         if self.website_options:
             driver = Chrome(
-                    service=Service(ChromeDriverManager().install()), options=self.options
+                    service=Service(self.get_chromedriver_path()), options=self.options
                 )
 
             # Set up selenium-stealth
@@ -290,7 +1413,7 @@ class GeneralScraper:
         else:
             # Set up driver without using extra command line options
             driver = Chrome(
-            service=Service(ChromeDriverManager().install())
+            service=Service(self.get_chromedriver_path())
                 )
 
             # Set up selenium-stealth
@@ -323,16 +1446,14 @@ class GeneralScraper:
 
         '''
         try:
-            sleep(uniform(1, 3))
-            self.driver.get(url)
+            self.retry_policy.run(lambda: self.load_page(url), f"loading {url}", circuit_breaker=self.circuit_breaker)
             print(f"Successfully navigated to URL: {url}")
-            sleep(uniform(2, 4))
         
         except Exception as e:
             print(f"Error navigating to URL {url}: {e}")
             raise e
 
-    def click_button_on_page(self, button_xpath : str):
+    def click_button_on_page(self, button_xpath : str, navigates : bool = True):
         '''
         Method to click a button on a webpage 
 
@@ -343,6 +1464,11 @@ class GeneralScraper:
 
                 A string representing a button element on a webpage 
 
+            navigates : bool, optional 
+
+                Whether the click can load a new page, which paces it with the rate limiter. 
+                False for clicks which stay on the page i.e. focusing the search bar. Defaults to True 
+
         Returns
         ------- 
             button_element : WebElement 
@@ -352,12 +1478,14 @@ class GeneralScraper:
 
         '''
         try:
-            button_element = self.driver.find_element(By.XPATH, button_xpath)
+            button_element = self.page_readiness.wait_for_element(self.driver, button_xpath, clickable=True, timeout=self.page_readiness.click_timeout)
+            # Clicks can load a new page, so they are paced like any other request
+            if navigates:
+                self.pace()
             button_element.click() 
-            sleep(uniform(0.5, 2))
             return button_element
         # If it does not exist, raise a NoSuchElementException
-        except NoSuchElementException:
+        except (NoSuchElementException, TimeoutException):
             print(f'No such element. Please verify your xpath: {button_xpath}')
             raise NoSuchElementException
 
@@ -391,55 +1519,100 @@ class GeneralScraper:
             None
 
         """
-        # Click the search bar on the webpage 
-        search_bar_element = self.click_button_on_page(search_bar_xpath)
+        # Click the search bar on the webpage, focusing it does not load a page so it is not paced 
+        search_bar_element = self.click_button_on_page(search_bar_xpath, navigates=False)
 
-        # Input the text into the search bar. 
-        for character in search_bar_text:
-            search_bar_element.send_keys(character)
-            # Sleep for a random period of 0.1 to 2.0 seconds.
-            sleep(uniform(0.1, 0.5))
+        # Input the text into the search bar, the search itself is paced once by the rate limiter below
+        search_bar_element.send_keys(search_bar_text)
 
-        # Handling logic for when a search button is present on the page
+        # Handling logic for when a search button is present on the page, click_button_on_page paces it
         if search_bar_button_xpath is not None:
-            self.click_button_on_page(search_bar_xpath)
+            self.click_button_on_page(search_bar_button_xpath)
             return search_bar_element, search_bar_text
 
         # If there is no search bar button, then click the Enter key on the webpage
         else:
+            self.pace()
             search_bar_element.send_keys(Keys.ENTER)
-            sleep(uniform(1, 3))
             return search_bar_element, search_bar_text
 
+    def wait_until_ready(self, xpath : str = None, clickable : bool = False, timeout : float = None):
+        """
+        Waits until the current page is ready, returning as soon as it is. 
+
+        If an XPath is given, waits for the element first. When it does not appear the page 
+        is refreshed, paced by the rate limiter, and waited on again up to page_readiness.max_attempts times. 
+        Then waits for the page_readiness.settle condition, the DOM going quiet or the network going idle. 
+
+        Parameters
+        ----------
+            xpath (str, optional): 
+                The XPath of an element the page needs. Defaults to None, only the settle condition is waited on 
+            clickable (bool, optional): 
+                Whether the element must be clickable rather than present. Defaults to False
+            timeout (float, optional): 
+                The number of seconds each wait for the element may take. Defaults to page_readiness.timeout. 
+                The settle condition is waited on for page_readiness.settle_timeout 
+
+        Returns
+        -------
+            element : WebElement 
+                The element, or None if no XPath was given. 
+                Raises a TimeoutException if the element did not appear on any attempt 
+        """
+        element = None
+        if xpath is not None:
+            max_attempts = self.page_readiness.max_attempts
+            for attempt in range(1, max_attempts + 1):
+                try:
+                    element = self.page_readiness.wait_for_element(self.driver, xpath, clickable, timeout)
+                    break
+                except TimeoutException:
+                    self.rate_limiter.report(self.driver.current_url, 'timeout')
+                    if attempt == max_attempts:
+                        raise
+                    print(f"TimeoutException on this {xpath} refreshing, attempt {attempt} of {max_attempts}.")
+                    self.refresh_page()
+
+        on_log_entries = self.resource_blocker.record_log_entries if self.resource_blocker is not None else None
+        if not self.page_readiness.wait_for_settle(self.driver, on_log_entries=on_log_entries):
+            print(f"Page did not settle ({self.page_readiness.settle}), carrying on.")
+        return element
+
+    def refresh_page(self):
+        """
+        Reloads the current page, paced and counted like any other page load. 
+        """
+        self.pace()
+        self.driver.refresh()
+        if self.driver_pool is not None:
+            self.driver_pool.record_page_load(self.driver)
+
     def wait_for_loading(self, xpath : str, timeout=30):
         """
-        Waits until a specified element is present on the page or until a timeout is reached.
+        Waits until a specified element is present on the page, refreshing the page if it does not appear. 
 
         Parameters
         ----------
             xpath (str): 
                 The XPath of the element to wait for.
             timeout (int, optional): 
-                The number of seconds to wait before timing out. Defaults to 30 seconds.
+                The number of seconds each attempt waits before timing out. Defaults to 30 seconds.
         
         Prints a message indicating whether the element was successfully located or if a timeout occurred.
+
+        Returns
+        -------
+            bool: 
+                True if the element is present, False if it did not appear on any attempt 
         """
         try:
-            element_present = EC.presence_of_element_located((By.XPATH, xpath))
-            WebDriverWait(self.driver, timeout).until(element_present)
-            sleep(uniform(0.5, 2))
+            self.wait_until_ready(xpath, timeout=timeout)
             print(f"Page loaded, element {xpath} is present.")
             return True
         except TimeoutException:
-            print(f"TimeoutException on this {xpath} retrying.")
-            sleep(uniform(0.5,2))
-            self.driver.refresh()
-            element_present = EC.presence_of_element_located((By.XPATH, xpath))
-            WebDriverWait(self.driver, timeout).until(
-                lambda driver: driver.execute_script("return document.readyState") == "complete"
-            )
-            sleep(uniform(0.5, 2))
-            
+            print(f"Gave up waiting for {xpath} after {self.page_readiness.max_attempts} attempts.")
+            return False
 
     def dismiss_element(self, element_xpath, element_description):
         """
@@ -460,19 +1633,23 @@ class GeneralScraper:
             The type of element that is being dismissed.
 
         Returns:
-            None 
+            bool: 
+                True if the element was dismissed 
       
         """
         try:
-            WebDriverWait(self.driver, 5).until(EC.element_to_be_clickable((By.XPATH, element_xpath)))
-            element = self.driver.find_element(By.XPATH, element_xpath)
+            element = self.page_readiness.wait_for_element(self.driver, element_xpath, clickable=True, timeout=self.page_readiness.click_timeout)
             element.click()
-            sleep(uniform(0.5, 1.5))
+            # Carry on as soon as the dialog has gone rather than after a fixed pause
+            if not self.page_readiness.wait_for_element_gone(self.driver, element, timeout=self.page_readiness.click_timeout):
+                print(f"{element_description} was clicked but is still shown.")
             print(f"{element_description} dismissed.")
+            return True
         except TimeoutException:
             print(f"No {element_description} found to dismiss.")
         except Exception as e:
             print(f"Error dismissing {element_description}: {e}")
+        return False
             
     def navigate_to_next_page(self, next_page_xpath : str):
         '''
@@ -519,6 +1696,76 @@ class GeneralScraper:
             print(f"Cannot extract content from {context}")
             return "N/A"
 
+    def extract_elements_batch(self, xpath_dict : dict, context : WebElement = None, attribute="textContent"):
+        """
+        Extracts an attribute from every XPath in a dictionary with a single execute_script call. 
+
+        Replaces one find_element and get_attribute round trip per field with one round trip per page. 
+
+        Parameters
+        ----------
+        xpath_dict (dict): 
+            A dictionary of field names to XPaths, i.e. the fields of an extract_data dictionary 
+        context (WebElement, optional): 
+            The element the XPaths are evaluated relative to. Defaults to the whole document. 
+        attribute (str): 
+            The attribute to retrieve from each element. Defaults to "textContent". 
+
+        Returns
+        -------
+            dict: The extracted value for each field, or "N/A" where no element was found. 
+        """
+        results = self.driver.execute_script(BATCH_EXTRACTION_SCRIPT, xpath_dict, attribute, context) or {}
+        extracted_data = {}
+        for key in xpath_dict:
+            value = results.get(key)
+            if value is None:
+                print(f"Cannot extract {key} from {self.driver.current_url}")
+                extracted_data[key] = "N/A"
+            else:
+                extracted_data[key] = value
+        return extracted_data
+
+    def extract_links_batch(self, container_xpath : str, link_xpath : str):
+        """
+        Collects the link inside every container on the page with a single execute_script call. 
+
+        Parameters
+        ----------
+        container_xpath (str): 
+            The XPath of the job cards on a results page 
+        link_xpath (str): 
+            The XPath of the link, relative to each job card 
+
+        Returns
+        -------
+            list: The absolute url of each card's link. Cards without a link are skipped. 
+        """
+        links = self.driver.execute_script(LINK_EXTRACTION_SCRIPT, container_xpath, link_xpath) or []
+        job_urls = [link for link in links if link]
+        if len(job_urls) < len(links):
+            print(f"No job URL found on {len(links) - len(job_urls)} card(s), skipping them.")
+        return job_urls
+
+    @staticmethod
+    def select_page_fields(webpage_config_dict : dict):
+        '''
+        Selects the fields of an extract_data dictionary which are XPaths evaluated against the page. 
+
+        The main container, url, website name and date fields are filled in by the scraper instead. 
+
+        Parameters
+        ----------
+            webpage_config_dict : dict 
+                The extract_data dictionary from the site configuration file 
+
+        Returns
+        ------- 
+            page_fields : dict 
+                A dictionary of field names to XPaths 
+        '''
+        return SiteSpec.select_page_fields(webpage_config_dict)
+
     def scroll_to_window(self, web_element : WebElement):
         '''
         Scrolls down the webpage into a set position. 
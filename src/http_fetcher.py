@@ -0,0 +1,248 @@
+from datetime import datetime
+from lxml import html
+from lxml.etree import XPathError
+from requests.adapters import HTTPAdapter
+import requests
+
+
+class HttpFetcher:
+    '''
+    A class to extract job details from server-side rendered pages without a browser
+
+    Pages are downloaded through a pooled requests Session and parsed with lxml.
+    The same XPaths from the site configuration files are evaluated against the
+    parsed document, producing the same record dictionaries as the selenium scrapers.
+
+    '''
+    def __init__(self, required_fields : list = None, headers : dict = None, timeout : float = 10, pool_maxsize : int = 10, max_consecutive_fallbacks : int = 5):
+        """
+        Parameters
+        ----------
+        required_fields : list, optional
+            The fields which must be extracted for a record to be accepted.
+            If any of them come back as "N/A" the page falls back to selenium.
+            Defaults to None, which requires every xpath field.
+
+        headers : dict, optional
+            Extra headers sent with each request
+
+        timeout : float, optional
+            The number of seconds to wait for a response. Defaults to 10
+
+        pool_maxsize : int, optional
+            The number of connections kept alive per host. Defaults to 10
+
+        max_consecutive_fallbacks : int, optional
+            The number of consecutive pages which can fall back to selenium
+            before the fetcher is disabled for the rest of the run. Defaults to 5
+
+        Attributes
+        ----------
+        self.enabled : bool
+            False once the site has fallen back to selenium too many times in a row
+
+        self.pages_fetched : int
+            The number of pages successfully extracted over HTTP
+
+        self.pages_fallen_back : int
+            The number of pages which had to be extracted with selenium
+
+        self.last_status_code : int
+            The status code of the last response, None if the request failed without one
+        """
+        self.required_fields = required_fields
+        self.timeout = timeout
+        self.max_consecutive_fallbacks = max_consecutive_fallbacks
+        self.enabled = True
+        self.pages_fetched = 0
+        self.pages_fallen_back = 0
+        self.consecutive_fallbacks = 0
+        self.last_status_code = None
+
+        self.session = requests.Session()
+        adapter = HTTPAdapter(pool_connections=pool_maxsize, pool_maxsize=pool_maxsize, max_retries=1)
+        self.session.mount('https://', adapter)
+        self.session.mount('http://', adapter)
+        self.session.headers.update({
+            'User-Agent': 'Mozilla/5.0 (Windows NT 10.0; Win64; x64) AppleWebKit/537.36 (KHTML, like Gecko) Chrome/124.0.0.0 Safari/537.36',
+            'Accept-Language': 'en-GB,en;q=0.9'
+        })
+        if headers:
+            self.session.headers.update(headers)
+
+    @classmethod
+    def from_scraper_config(cls, scraper_config : dict):
+        '''
+        Creates an HttpFetcher from the http_fetcher section of a site's base_config
+
+        Parameters
+        ----------
+        scraper_config : dict
+            A dictionary representing the configuration file for the website
+
+        Returns
+        -------
+            fetcher : HttpFetcher
+                An HttpFetcher for the site, or None if the site has not enabled the HTTP fast path
+        '''
+        fetcher_config = scraper_config.get('base_config', {}).get('http_fetcher', {})
+        if not fetcher_config.get('enabled', False):
+            return None
+
+        return cls(
+            required_fields=fetcher_config.get('required_fields'),
+            headers=fetcher_config.get('headers'),
+            timeout=fetcher_config.get('timeout', 10),
+            pool_maxsize=fetcher_config.get('pool_maxsize', 10),
+            max_consecutive_fallbacks=fetcher_config.get('max_consecutive_fallbacks', 5)
+        )
+
+    def fetch_document(self, url : str):
+        '''
+        Downloads a webpage and parses it into an lxml document
+
+        Parameters
+        ----------
+        url : str
+            The url of the webpage
+
+        Returns
+        -------
+            document, final_url : tuple
+                The parsed lxml document and the url after any redirects.
+                (None, None) if the request failed.
+        '''
+        self.last_status_code = None
+        try:
+            response = self.session.get(url, timeout=self.timeout)
+            self.last_status_code = response.status_code
+            response.raise_for_status()
+        except requests.RequestException as e:
+            print(f"HTTP fetch failed for {url}: {e}")
+            return None, None
+
+        return html.fromstring(response.content, base_url=response.url), response.url
+
+    @staticmethod
+    def extract_element(document, xpath : str, attribute : str = "textContent"):
+        """
+        Extracts an attribute from the first node matching an XPath, mirroring GeneralScraper.extract_element
+
+        Parameters
+        ----------
+        document : HtmlElement
+            The lxml document or element to search within
+
+        xpath : str
+            The XPath to locate the element
+
+        attribute : str
+            The attribute to retrieve from the element. Defaults to "textContent".
+
+        Returns
+        -------
+            str: The extracted attribute value or "N/A" if the element is not found.
+        """
+        try:
+            matches = document.xpath(xpath)
+        except XPathError:
+            return "N/A"
+
+        if not matches:
+            return "N/A"
+
+        node = matches[0]
+        # XPaths ending in text() or @attribute return strings rather than elements
+        if isinstance(node, str):
+            return node.strip()
+        if attribute == "textContent":
+            return node.text_content().strip()
+
+        value = node.get(attribute)
+        return value.strip() if value is not None else "N/A"
+
+    def extract_record(self, url : str, webpage_config_dict : dict, website_name : str = None):
+        '''
+        Fetches a job detail page over HTTP and builds its record dictionary
+
+        Parameters
+        ----------
+        url : str
+            The url of the job detail page
+
+        webpage_config_dict : dict
+            The extract_data dictionary from the site configuration file
+
+        website_name : str, optional
+            The website_name stored when the configuration file leaves it empty, the same one the
+            browser path stores so both produce the same records. Defaults to None
+
+        Returns
+        -------
+            data : dict
+                A dictionary representing the elements on the webpage,
+                or None if the page must be extracted with selenium instead.
+        '''
+        if not self.enabled:
+            return None
+
+        document, final_url = self.fetch_document(url)
+        data = None
+        if document is not None:
+            data = {}
+            for key, value in webpage_config_dict.items():
+                if key == "main_container":
+                    continue
+                elif 'url' in key:
+                    data[key] = final_url
+                elif key == 'website_name':
+                    data[key] = value or website_name
+                elif 'date' in key:
+                    data[key] = datetime.today()
+                else:
+                    data[key] = self.extract_element(document, value)
+
+        if data is None or self.is_missing_required_fields(data, webpage_config_dict):
+            self.record_fallback(url)
+            return None
+
+        self.pages_fetched += 1
+        self.consecutive_fallbacks = 0
+        return data
+
+    def is_missing_required_fields(self, data : dict, webpage_config_dict : dict):
+        '''
+        Checks whether any of the required fields came back as "N/A"
+
+        Returns
+        -------
+            bool
+                True if the record is incomplete and the page should fall back to selenium
+        '''
+        if self.required_fields is not None:
+            required_fields = self.required_fields
+        else:
+            required_fields = [
+                key for key in webpage_config_dict
+                if key != 'main_container' and key != 'website_name' and 'url' not in key and 'date' not in key
+            ]
+        return any(data.get(field, "N/A") == "N/A" for field in required_fields)
+
+    def record_fallback(self, url : str):
+        '''
+        Records that a page fell back to selenium, disabling the fetcher for the site
+        once max_consecutive_fallbacks is reached.
+        '''
+        self.pages_fallen_back += 1
+        self.consecutive_fallbacks += 1
+        print(f"Falling back to selenium for {url}")
+        if self.consecutive_fallbacks >= self.max_consecutive_fallbacks:
+            print(f"{self.consecutive_fallbacks} consecutive fallbacks, using selenium for the rest of the run")
+            self.enabled = False
+
+    def close(self):
+        '''
+        Closes the pooled HTTP connections
+        '''
+        print(f"HTTP fetcher: {self.pages_fetched} pages over HTTP, {self.pages_fallen_back} fell back to selenium")
+        self.session.close()
@@ -0,0 +1,181 @@
+from sqlalchemy import create_engine, text
+from sqlalchemy.engine import Engine
+from time import time
+import re
+
+
+# The zero padded date partition of a key i.e. indeed/2024/10/19/indeed_jobs.csv
+PARTITION_DATE_PATTERN = re.compile(r'(?:^|/)(\d{4})/(\d{2})/(\d{2})/[^/]+$')
+
+
+class IngestionManifest:
+    '''
+    A record of the S3 objects already loaded into the job database
+
+    Each loaded object is stored with its ETag and size. A load lists each site's
+    prefix only from the watermark, the newest date partition loaded under it,
+    and keeps the objects whose ETag has not been loaded, so a daily load costs
+    time in proportion to the new files rather than the whole history. An output
+    file uploaded again on the same day has a new ETag, so it is loaded again.
+
+    The watermark is the newest partition date of the zero padded <site>/<yyyy>/<mm>/<dd>/
+    keys written by upload_to_s3, stored in its own column. Keys uploaded before the dates
+    were padded, i.e. indeed/2024/9/30/, have no partition date, so they never move the
+    watermark. They sort after the padded keys of the same year, so they are still listed
+    but skipped by their ETag. A backfill ignores the watermark and the ETags and lists
+    every object again.
+
+    '''
+    def __init__(self, engine : Engine, table_name : str = 'ingestion_manifest'):
+        """
+        Parameters
+        ----------
+        engine : Engine
+            A sqlalchemy Engine object pointing to the database holding the manifest, i.e. the job database
+
+        table_name : str, optional
+            The table the loaded objects are recorded in. Defaults to 'ingestion_manifest'
+        """
+        self.engine = engine
+        self.table_name = table_name
+        self.create_table()
+
+    @staticmethod
+    def from_url(manifest_url : str, **kwargs):
+        '''
+        Creates the IngestionManifest for a database url i.e. sqlite:///ingestion_manifest.db or postgresql+psycopg2://...
+        '''
+        return IngestionManifest(create_engine(manifest_url), **kwargs)
+
+    def create_table(self):
+        '''
+        Creates the manifest table if it does not exist
+        '''
+        with self.engine.begin() as connection:
+            connection.execute(text(f"""
+                CREATE TABLE IF NOT EXISTS {self.table_name} (
+                    s3_key TEXT PRIMARY KEY,
+                    etag TEXT NOT NULL,
+                    size BIGINT NOT NULL,
+                    last_modified TEXT,
+                    partition_date TEXT,
+                    processed_at DOUBLE PRECISION NOT NULL
+                )
+            """))
+
+    @staticmethod
+    def get_partition_date(s3_key : str):
+        '''
+        Returns the partition date of a key as yyyy/mm/dd, None for a key without a zero padded date partition
+        '''
+        match = PARTITION_DATE_PATTERN.search(s3_key)
+        return '/'.join(match.groups()) if match else None
+
+    def get_watermark(self, prefix : str):
+        '''
+        Returns where the listing of a prefix starts, the newest date partition loaded under it
+
+        Parameters
+        ----------
+        prefix : str
+            A site's prefix i.e. 'indeed/'
+
+        Returns
+        -------
+            start_after : str
+                i.e. 'indeed/2024/10/19/', so every key in that directory and after it is listed.
+                None if no key with a zero padded date partition has been loaded under the prefix
+        '''
+        with self.engine.connect() as connection:
+            newest_partition_date = connection.execute(text(f"""
+                SELECT MAX(partition_date) FROM {self.table_name}
+                WHERE substr(s3_key, 1, length(:prefix)) = :prefix
+            """), {'prefix': prefix}).scalar()
+        if newest_partition_date is None:
+            return None
+        return f'{prefix}{newest_partition_date}/'
+
+    def get_loaded_etags(self, prefix : str, start_after : str = None):
+        '''
+        Returns the ETag of every loaded object under a prefix, from start_after onwards
+
+        Returns
+        -------
+            loaded_etags : dict
+                A dictionary mapping each key to its ETag
+        '''
+        with self.engine.connect() as connection:
+            rows = connection.execute(text(f"""
+                SELECT s3_key, etag FROM {self.table_name}
+                WHERE substr(s3_key, 1, length(:prefix)) = :prefix AND s3_key > :start_after
+            """), {'prefix': prefix, 'start_after': start_after or ''}).fetchall()
+        return {s3_key: etag for s3_key, etag in rows}
+
+    def find_new_objects(self, data_processor, prefixes : list, file_type=None, backfill : bool = False):
+        '''
+        Lists the objects under each prefix which have not been loaded
+
+        Parameters
+        ----------
+        data_processor : S3DataProcessing
+            The bucket to list
+
+        prefixes : list
+            One prefix per site i.e. ['indeed/', 'reed/']
+
+        file_type : str or tuple, optional
+            Only list keys ending in these extensions i.e. ('csv', 'parquet'). Defaults to None, every key
+
+        backfill : bool, optional
+            Whether to list every object under the prefixes, whether it was loaded or not. Defaults to False
+
+        Returns
+        -------
+            new_objects : list
+                The list_objects_v2 entries of the objects to load, each with its Key, ETag, Size and LastModified
+        '''
+        new_objects = []
+        for prefix in prefixes:
+            start_after = None if backfill else self.get_watermark(prefix)
+            loaded_etags = {} if backfill else self.get_loaded_etags(prefix, start_after)
+            prefix_objects = [
+                s3_object for s3_object in data_processor.iter_object_summaries(prefix, file_type, start_after)
+                if loaded_etags.get(s3_object['Key']) != s3_object['ETag']
+            ]
+            print(f"{len(prefix_objects)} new objects under {prefix}" + (f" since {start_after}" if start_after else ''))
+            new_objects.extend(prefix_objects)
+        return new_objects
+
+    def record_loaded(self, list_of_objects : list):
+        '''
+        Records objects as loaded, replacing the ETag and size of objects loaded before
+
+        Call it once the objects are in the database, so a failed load is picked up by the next one.
+
+        Parameters
+        ----------
+        list_of_objects : list
+            The list_objects_v2 entries returned by find_new_objects
+        '''
+        if not list_of_objects:
+            return 0
+        processed_at = time()
+        with self.engine.begin() as connection:
+            connection.execute(text(f"""
+                INSERT INTO {self.table_name} (s3_key, etag, size, last_modified, partition_date, processed_at)
+                VALUES (:s3_key, :etag, :size, :last_modified, :partition_date, :processed_at)
+                ON CONFLICT (s3_key) DO UPDATE SET
+                    etag = excluded.etag, size = excluded.size, last_modified = excluded.last_modified,
+                    partition_date = excluded.partition_date, processed_at = excluded.processed_at
+            """), [
+                {
+                    's3_key': s3_object['Key'],
+                    'etag': s3_object['ETag'],
+                    'size': s3_object['Size'],
+                    'last_modified': str(s3_object.get('LastModified')),
+                    'partition_date': self.get_partition_date(s3_object['Key']),
+                    'processed_at': processed_at
+                }
+                for s3_object in list_of_objects
+            ])
+        return len(list_of_objects)
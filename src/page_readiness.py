@@ -0,0 +1,238 @@
+from selenium.common.exceptions import TimeoutException, WebDriverException
+from selenium.webdriver.common.by import By
+from selenium.webdriver.support import expected_conditions as EC
+from selenium.webdriver.support.ui import WebDriverWait
+from time import monotonic, sleep
+import json
+
+
+# Installs a MutationObserver on the first call, then returns the milliseconds since the DOM last changed
+DOM_QUIET_SCRIPT = '''
+if (!window.jobScraperMutationObserver) {
+    window.jobScraperLastMutation = performance.now();
+    window.jobScraperMutationObserver = new MutationObserver(function () {
+        window.jobScraperLastMutation = performance.now();
+    });
+    window.jobScraperMutationObserver.observe(document, {childList: true, subtree: true, attributes: true, characterData: true});
+}
+return document.readyState === 'complete' ? performance.now() - window.jobScraperLastMutation : -1;
+'''
+
+
+class PageReadiness:
+    '''
+    A class to wait for a page to be ready on explicit conditions instead of fixed sleeps
+
+    Three conditions are supported, each returning as soon as it holds:
+
+        element     an XPath is present, or clickable
+        dom_quiet   the document has loaded and the DOM has not changed for quiet_period seconds
+        network_idle no more than max_inflight requests have been in flight for quiet_period
+                    seconds, read from the DevTools events in the driver's performance log
+
+    '''
+    def __init__(self, timeout : float = 30, poll_frequency : float = 0.1, quiet_period : float = 0.3, max_inflight : int = 0, max_attempts : int = 2, settle : str = 'dom_quiet', click_timeout : float = 5, settle_timeout : float = 2.5):
+        """
+        Parameters
+        ----------
+        timeout : float, optional
+            The number of seconds to wait for an element. Defaults to 30
+
+        poll_frequency : float, optional
+            The number of seconds between checks of a condition. Defaults to 0.1
+
+        quiet_period : float, optional
+            The number of seconds the DOM or the network must stay quiet. Defaults to 0.3
+
+        max_inflight : int, optional
+            The number of requests which may still be in flight when the network counts as idle. Defaults to 0
+
+        max_attempts : int, optional
+            The number of times a page is loaded before an element is given up on,
+            the page is refreshed between attempts. Defaults to 2
+
+        settle : str, optional
+            The condition checked once an element is present, one of 'dom_quiet', 'network_idle' or None.
+            Defaults to 'dom_quiet'
+
+        click_timeout : float, optional
+            The number of seconds to wait for a button or dialog to become clickable, kept short
+            because a missing button is how pagination finds its last page. Defaults to 5
+
+        settle_timeout : float, optional
+            The number of seconds to wait for the settle condition, kept short because pages with ad
+            or carousel timers never stop changing and are usable long before. Defaults to 2.5
+        """
+        if settle not in ('dom_quiet', 'network_idle', None):
+            raise ValueError(f"Invalid settle condition {settle} only dom_quiet, network_idle and None are valid")
+
+        self.timeout = timeout
+        self.poll_frequency = poll_frequency
+        self.quiet_period = quiet_period
+        self.max_inflight = max_inflight
+        self.max_attempts = max_attempts
+        self.settle = settle
+        self.click_timeout = click_timeout
+        self.settle_timeout = settle_timeout
+
+    @classmethod
+    def from_config(cls, driver_config : dict):
+        '''
+        Creates a PageReadiness from the page_readiness section of the driver configuration file
+
+        Parameters
+        ----------
+        driver_config : dict
+            A dictionary representing the driver configuration file
+
+        Returns
+        -------
+            readiness : PageReadiness
+        '''
+        readiness_config = driver_config.get('page_readiness', {})
+        return cls(
+            timeout=readiness_config.get('timeout', 30),
+            poll_frequency=readiness_config.get('poll_frequency', 0.1),
+            quiet_period=readiness_config.get('quiet_period', 0.3),
+            max_inflight=readiness_config.get('max_inflight', 0),
+            max_attempts=readiness_config.get('max_attempts', 2),
+            settle=readiness_config.get('settle', 'dom_quiet'),
+            click_timeout=readiness_config.get('click_timeout', 5),
+            settle_timeout=readiness_config.get('settle_timeout', 2.5)
+        )
+
+    def wait_for_element(self, driver, xpath : str, clickable : bool = False, timeout : float = None):
+        '''
+        Waits for an element to be present, or clickable
+
+        Parameters
+        ----------
+        driver : WebDriver
+            A selenium WebDriver object
+
+        xpath : str
+            The XPath of the element
+
+        clickable : bool, optional
+            Whether to wait until the element is visible and enabled. Defaults to False
+
+        timeout : float, optional
+            Overrides the timeout
+
+        Returns
+        -------
+            element : WebElement
+                The element, raises a TimeoutException if it did not appear in time
+        '''
+        condition = EC.element_to_be_clickable if clickable else EC.presence_of_element_located
+        wait = WebDriverWait(driver, timeout if timeout is not None else self.timeout, poll_frequency=self.poll_frequency)
+        return wait.until(condition((By.XPATH, xpath)))
+
+    def wait_for_element_gone(self, driver, element, timeout : float = None):
+        '''
+        Waits for an element to be removed from the page or hidden i.e. after a dialog was dismissed
+
+        Returns
+        -------
+            bool
+                True if the element went, False if it was still shown after the timeout
+        '''
+        wait = WebDriverWait(driver, timeout if timeout is not None else self.timeout, poll_frequency=self.poll_frequency)
+        try:
+            wait.until(EC.any_of(EC.staleness_of(element), EC.invisibility_of_element(element)))
+            return True
+        except TimeoutException:
+            return False
+
+    def wait_for_dom_quiet(self, driver, timeout : float = None):
+        '''
+        Waits for the document to load and its DOM to stop changing for quiet_period seconds
+
+        Returns
+        -------
+            bool
+                True if the DOM went quiet, False if it was still changing after the timeout
+        '''
+        quiet_milliseconds = self.quiet_period * 1000
+        wait = WebDriverWait(driver, timeout if timeout is not None else self.timeout, poll_frequency=self.poll_frequency)
+        try:
+            wait.until(lambda driver: driver.execute_script(DOM_QUIET_SCRIPT) >= quiet_milliseconds)
+            return True
+        except TimeoutException:
+            return False
+
+    def wait_for_network_idle(self, driver, timeout : float = None, on_log_entries=None):
+        '''
+        Waits until no more than max_inflight requests have been in flight for quiet_period seconds
+
+        The requests are followed through the Network events in the performance log, which
+        holds every event since it was last read. The driver needs the goog:loggingPrefs
+        performance capability, otherwise this falls back to wait_for_dom_quiet.
+
+        Parameters
+        ----------
+        driver : WebDriver
+            A selenium WebDriver object
+
+        timeout : float, optional
+            Overrides the timeout
+
+        on_log_entries : callable, optional
+            Called with each batch of performance log entries read, because reading the log empties it.
+            i.e. ResourceBlocker.record_log_entries
+
+        Returns
+        -------
+            bool
+                True if the network went idle, False if requests were still in flight after the timeout
+        '''
+        deadline = monotonic() + (timeout if timeout is not None else self.timeout)
+        inflight_requests = set()
+        last_activity = monotonic()
+        while True:
+            try:
+                entries = driver.get_log('performance')
+            except (WebDriverException, ValueError):
+                return self.wait_for_dom_quiet(driver, max(deadline - monotonic(), 0))
+            if on_log_entries is not None:
+                on_log_entries(entries)
+
+            for entry in entries:
+                message = entry['message']
+                if 'Network.requestWillBeSent' not in message and 'Network.loadingFinished' not in message and 'Network.loadingFailed' not in message:
+                    continue
+                event = json.loads(message)['message']
+                request_id = event.get('params', {}).get('requestId')
+                if event.get('method') == 'Network.requestWillBeSent':
+                    inflight_requests.add(request_id)
+                else:
+                    inflight_requests.discard(request_id)
+                last_activity = monotonic()
+
+            now = monotonic()
+            if len(inflight_requests) <= self.max_inflight and now - last_activity >= self.quiet_period:
+                return True
+            if now >= deadline:
+                return False
+            sleep(self.poll_frequency)
+
+    def wait_for_settle(self, driver, timeout : float = None, on_log_entries=None):
+        '''
+        Waits for the settle condition, if any, once the element a caller needs is present
+
+        Parameters
+        ----------
+        timeout : float, optional
+            Overrides the settle_timeout
+
+        Returns
+        -------
+            bool
+                True if the page settled or there is no settle condition
+        '''
+        timeout = timeout if timeout is not None else self.settle_timeout
+        if self.settle == 'dom_quiet':
+            return self.wait_for_dom_quiet(driver, timeout)
+        if self.settle == 'network_idle':
+            return self.wait_for_network_idle(driver, timeout, on_log_entries)
+        return True
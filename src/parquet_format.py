@@ -0,0 +1,163 @@
+import pandas as pd
+
+
+# The columns repeated across many records, stored once per row group and referenced by index
+DICTIONARY_COLUMNS = ['company_name', 'location', 'website_name', 'salary_range']
+
+
+class ParquetFormat:
+    '''
+    A class to write and read the scraped records as Parquet files
+
+    Every column is typed, the date columns as timestamps and the rest as strings,
+    the file is compressed with zstd and the repetitive columns are dictionary encoded.
+    Parquet needs pyarrow, which is optional, CSV output works without it.
+
+    '''
+    def __init__(self, compression : str = 'zstd', compression_level : int = None, dictionary_columns : list = None, row_group_size : int = 50000):
+        """
+        Parameters
+        ----------
+        compression : str, optional
+            The compression codec. Defaults to 'zstd'
+
+        compression_level : int, optional
+            The codec's compression level. Defaults to None, the codec's default
+
+        dictionary_columns : list, optional
+            The columns which are dictionary encoded. Defaults to DICTIONARY_COLUMNS
+
+        row_group_size : int, optional
+            The maximum number of records in a row group. Defaults to 50000
+        """
+        self.compression = compression
+        self.compression_level = compression_level
+        self.dictionary_columns = DICTIONARY_COLUMNS if dictionary_columns is None else dictionary_columns
+        self.row_group_size = row_group_size
+
+    @staticmethod
+    def import_pyarrow():
+        '''
+        Imports pyarrow, which is only needed for Parquet
+
+        Returns
+        -------
+            pa, pq : module
+                pyarrow and pyarrow.parquet, raises an ImportError explaining how to install pyarrow
+        '''
+        try:
+            import pyarrow as pa
+            import pyarrow.parquet as pq
+        except ImportError as e:
+            raise ImportError("Parquet files need pyarrow, install it with pip install pyarrow or use a .csv output_file_name") from e
+        return pa, pq
+
+    def build_schema(self, df : pd.DataFrame):
+        '''
+        Builds the schema of the records, date columns are timestamps and every other column is a string
+        '''
+        pa, _ = self.import_pyarrow()
+        return pa.schema([
+            pa.field(column, pa.timestamp('us') if 'date' in column else pa.string())
+            for column in df.columns
+        ])
+
+    def to_table(self, df : pd.DataFrame, schema=None):
+        '''
+        Converts a DataFrame of records to a pyarrow Table with the record schema
+
+        Parameters
+        ----------
+        df : pd.DataFrame
+            The records, read back from the record sink or a CSV file
+
+        schema : pa.Schema, optional
+            The schema to convert to, so every chunk of a file has the same columns. Defaults to build_schema(df)
+
+        Returns
+        -------
+            table : pa.Table
+        '''
+        pa, _ = self.import_pyarrow()
+        schema = schema or self.build_schema(df)
+        columns = []
+        for field in schema:
+            values = df[field.name] if field.name in df.columns else pd.Series([None] * len(df), dtype=object)
+            if pa.types.is_timestamp(field.type):
+                values = pd.to_datetime(values, errors='coerce', format='mixed')
+            else:
+                values = values.astype(object).where(values.notna(), None).map(lambda value: value if value is None else str(value))
+            columns.append(pa.array(values, type=field.type, from_pandas=True))
+        return pa.Table.from_arrays(columns, schema=schema)
+
+    def write_dataframes(self, output_file_name : str, dataframes):
+        '''
+        Writes chunks of records to a single Parquet file, holding one chunk in memory at a time
+
+        Parameters
+        ----------
+        output_file_name : str
+            The file path of the Parquet file
+
+        dataframes : iterable
+            The chunks of records i.e. RecordSink.iter_dataframes()
+
+        Returns
+        -------
+            number_of_records : int
+                The number of records written, no file is written if there were none
+        '''
+        _, pq = self.import_pyarrow()
+        writer = None
+        number_of_records = 0
+        try:
+            for df in dataframes:
+                if writer is None:
+                    schema = self.build_schema(df)
+                    writer = pq.ParquetWriter(
+                        output_file_name,
+                        schema,
+                        compression=self.compression,
+                        compression_level=self.compression_level,
+                        use_dictionary=[column for column in self.dictionary_columns if column in schema.names]
+                    )
+                writer.write_table(self.to_table(df, writer.schema), row_group_size=self.row_group_size)
+                number_of_records += len(df)
+        finally:
+            if writer is not None:
+                writer.close()
+        return number_of_records
+
+    def iter_dataframes(self, source, chunksize : int = 100000):
+        '''
+        Reads a Parquet file one record batch at a time 
+
+        The dictionary encoded columns are read as pandas categoricals, so each
+        repeated value is held in memory once per batch.
+
+        Parameters
+        ----------
+        source : str or file-like
+            The file path of the Parquet file, or a seekable file-like object holding its bytes
+
+        chunksize : int, optional
+            The maximum number of records in each DataFrame. Defaults to 100000
+
+        Yields
+        ------
+            df : pd.DataFrame
+        '''
+        _, pq = self.import_pyarrow()
+        parquet_file = pq.ParquetFile(source, read_dictionary=self.get_dictionary_columns(source))
+        for record_batch in parquet_file.iter_batches(batch_size=chunksize):
+            yield record_batch.to_pandas()
+
+    def get_dictionary_columns(self, source):
+        '''
+        Returns the dictionary_columns present in a Parquet file, leaving a file-like source at its start
+        '''
+        _, pq = self.import_pyarrow()
+        schema_names = pq.read_schema(source).names
+        if hasattr(source, 'seek'):
+            source.seek(0)
+        return [column for column in self.dictionary_columns if column in schema_names]
@@ -0,0 +1,242 @@
+from random import uniform
+from time import monotonic, sleep
+from urllib.parse import urlparse
+import threading
+
+
+class TokenBucket:
+    '''
+    A token bucket holding the request budget of a single domain
+
+    The refill rate adapts to the health of the site. It is cut by
+    backoff_factor whenever the site throttles, shows a captcha or times out,
+    and raised by recovery_factor after recovery_after healthy requests in a row.
+
+    '''
+    def __init__(self,
+                 requests_per_second : float = 0.5,
+                 burst : int = 1,
+                 jitter : list = (0.0, 1.0),
+                 min_requests_per_second : float = 0.05,
+                 max_requests_per_second : float = 2.0,
+                 backoff_factor : float = 0.5,
+                 recovery_factor : float = 1.1,
+                 recovery_after : int = 10):
+        """
+        Parameters
+        ----------
+        requests_per_second : float, optional
+            The starting refill rate of the bucket. Defaults to 0.5
+
+        burst : int, optional
+            The maximum number of tokens held, i.e. requests which can be made back to back. Defaults to 1
+
+        jitter : list, optional
+            The [minimum, maximum] number of seconds of random delay added to every request. Defaults to (0.0, 1.0)
+
+        min_requests_per_second : float, optional
+            The lowest rate the bucket will back off to. Defaults to 0.05
+
+        max_requests_per_second : float, optional
+            The highest rate the bucket will recover to. Defaults to 2.0
+
+        backoff_factor : float, optional
+            The factor the rate is multiplied by on a throttle, captcha or timeout signal. Defaults to 0.5
+
+        recovery_factor : float, optional
+            The factor the rate is multiplied by after recovery_after healthy requests. Defaults to 1.1
+
+        recovery_after : int, optional
+            The number of consecutive healthy requests before the rate is raised. Defaults to 10
+        """
+        self.rate = requests_per_second
+        self.burst = burst
+        self.jitter = tuple(jitter)
+        self.min_rate = min_requests_per_second
+        self.max_rate = max_requests_per_second
+        self.backoff_factor = backoff_factor
+        self.recovery_factor = recovery_factor
+        self.recovery_after = recovery_after
+
+        self.tokens = float(burst)
+        self.last_refill = monotonic()
+        self.consecutive_healthy = 0
+        self.requests = 0
+        self.seconds_waited = 0.0
+        self.signals = {}
+
+    def reserve(self):
+        '''
+        Takes a token from the bucket
+
+        Returns
+        -------
+            delay : float
+                The number of seconds the caller must wait before making the request
+        '''
+        now = monotonic()
+        self.tokens = min(self.burst, self.tokens + (now - self.last_refill) * self.rate)
+        self.last_refill = now
+
+        # Tokens may go negative, which queues concurrent callers behind each other
+        self.tokens -= 1
+        delay = 0.0 if self.tokens >= 0 else -self.tokens / self.rate
+        delay += uniform(*self.jitter)
+
+        self.requests += 1
+        self.seconds_waited += delay
+        return delay
+
+    def record_signal(self, signal : str):
+        '''
+        Adapts the refill rate to a signal from the site
+
+        Parameters
+        ----------
+        signal : str
+            'ok' for a healthy response, 'throttled', 'captcha' or 'timeout' otherwise
+        '''
+        self.signals[signal] = self.signals.get(signal, 0) + 1
+
+        if signal == 'ok':
+            self.consecutive_healthy += 1
+            if self.consecutive_healthy >= self.recovery_after:
+                self.rate = min(self.max_rate, self.rate * self.recovery_factor)
+                self.consecutive_healthy = 0
+        else:
+            self.consecutive_healthy = 0
+            self.rate = max(self.min_rate, self.rate * self.backoff_factor)
+            # Drain the bucket so the next request pays the full backed-off interval
+            self.tokens = min(self.tokens, 0.0)
+            print(f"Received {signal} signal, backing off to {self.rate:.3f} requests per second")
+
+
+class RateLimiter:
+    '''
+    A politeness scheduler which paces requests with a token bucket per domain
+
+    A single RateLimiter can be shared between scrapers and threads.
+    Domains without their own budget use the default settings.
+
+    '''
+    def __init__(self, **default_settings):
+        """
+        Parameters
+        ----------
+        **default_settings
+            Keyword arguments for the TokenBucket of domains which have not been configured
+
+        Attributes
+        ----------
+        self.buckets : dict
+            A dictionary mapping each domain to its TokenBucket
+        """
+        self.default_settings = default_settings
+        self.domain_settings = {}
+        self.buckets = {}
+        self.started_at = monotonic()
+        self._lock = threading.Lock()
+
+    @staticmethod
+    def get_domain(url : str):
+        '''
+        Extracts the domain from a url i.e. https://www.reed.co.uk/jobs -> www.reed.co.uk
+        '''
+        return urlparse(url).netloc or url
+
+    def configure_domain(self, url : str, rate_limit_config : dict):
+        '''
+        Sets the request budget of a domain from the rate_limit section of a site configuration file
+
+        Parameters
+        ----------
+        url : str
+            Any url on the domain, usually the base_url of the site
+
+        rate_limit_config : dict
+            Keyword arguments for the domain's TokenBucket i.e. requests_per_second, burst and jitter
+        '''
+        domain = self.get_domain(url)
+        with self._lock:
+            self.domain_settings[domain] = {**self.default_settings, **(rate_limit_config or {})}
+            self.buckets.pop(domain, None)
+
+    def get_bucket(self, domain : str):
+        # Callers must hold self._lock
+        if domain not in self.buckets:
+            settings = self.domain_settings.get(domain, self.default_settings)
+            self.buckets[domain] = TokenBucket(**settings)
+        return self.buckets[domain]
+
+    def wait(self, url : str):
+        '''
+        Blocks until a request to the url's domain is within budget
+
+        Parameters
+        ----------
+        url : str
+            The url about to be requested
+
+        Returns
+        -------
+            delay : float
+                The number of seconds spent waiting
+        '''
+        with self._lock:
+            delay = self.get_bucket(self.get_domain(url)).reserve()
+        if delay > 0:
+            sleep(delay)
+        return delay
+
+    def report(self, url : str, signal : str):
+        '''
+        Reports the outcome of a request so the domain's rate can adapt
+
+        Parameters
+        ----------
+        url : str
+            The url which was requested
+
+        signal : str
+            'ok' for a healthy response, 'throttled', 'captcha' or 'timeout' otherwise
+        '''
+        with self._lock:
+            self.get_bucket(self.get_domain(url)).record_signal(signal)
+
+    def summary(self):
+        '''
+        Summarises how much of the run was spent waiting on the scheduler
+
+        Returns
+        -------
+            summary : dict
+                A dictionary containing the elapsed and waited seconds for the run
+                and the request count, waited seconds, current rate and signals of each domain
+        '''
+        elapsed = monotonic() - self.started_at
+        with self._lock:
+            domains = {
+                domain: {
+                    'requests': bucket.requests,
+                    'seconds_waited': round(bucket.seconds_waited, 2),
+                    'requests_per_second': round(bucket.rate, 3),
+                    'signals': dict(bucket.signals)
+                }
+                for domain, bucket in self.buckets.items()
+            }
+        seconds_waited = sum(domain['seconds_waited'] for domain in domains.values())
+        return {
+            'elapsed_seconds': round(elapsed, 2),
+            'seconds_waited': round(seconds_waited, 2),
+            'domains': domains
+        }
+
+    def print_summary(self):
+        '''
+        Prints the time spent waiting versus working for each domain
+        '''
+        summary = self.summary()
+        print(f"Rate limiter: waited {summary['seconds_waited']}s of {summary['elapsed_seconds']}s elapsed")
+        for domain, stats in summary['domains'].items():
+            print(f"  {domain}: {stats['requests']} requests, waited {stats['seconds_waited']}s, "
+                  f"now {stats['requests_per_second']} requests per second, signals {stats['signals']}")
@@ -0,0 +1,317 @@
+from glob import escape, glob
+import csv
+import json
+import os
+import pandas as pd
+from src.parquet_format import ParquetFormat
+
+
+# The formats a site's records can be exported to, see RecordSink.get_output_file_name
+OUTPUT_FORMATS = ('csv', 'parquet')
+
+
+class RecordSink:
+    '''
+    A class to stream scraped records to local files as they are extracted
+
+    Records are appended to the current part file and flushed periodically,
+    so a crash only loses the records since the last flush and memory stays
+    flat however long the run is. Part files are rotated once they hold
+    max_records_per_file records i.e. indeed_jobs_records-0001.jsonl,
+    indeed_jobs_records-0002.jsonl
+
+    '''
+    def __init__(self, output_path : str, file_format : str = None, flush_every : int = 50, max_records_per_file : int = 10000, append : bool = False):
+        """
+        Parameters
+        ----------
+        output_path : str
+            The base file path of the part files i.e. indeed_jobs_records.jsonl
+
+        file_format : str, optional
+            'jsonl' or 'csv'. Defaults to the extension of output_path
+
+        flush_every : int, optional
+            The number of records written between flushes to disk. Defaults to 50
+
+        max_records_per_file : int, optional
+            The number of records after which a new part file is started. Defaults to 10000
+
+        append : bool, optional
+            Whether to keep the part files of a previous run and add to them.
+            Defaults to False, which removes them when the first record is written.
+
+        Attributes
+        ----------
+        self.records_written : int
+            The number of records written by this sink
+        """
+        self.stem, extension = os.path.splitext(output_path)
+        self.file_format = file_format or extension.lstrip('.') or 'jsonl'
+        if self.file_format not in ('jsonl', 'csv'):
+            raise ValueError('Invalid file format only jsonl and csv are valid')
+
+        self.extension = f'.{self.file_format}'
+        self.flush_every = flush_every
+        self.max_records_per_file = max_records_per_file
+        self.records_written = 0
+
+        self._file = None
+        self._csv_writer = None
+        self._records_in_file = 0
+        self._unflushed_records = 0
+
+        # Old part files are only removed once this sink writes, so creating
+        # a sink in another process does not wipe the files of a running one
+        self._replace_existing_files = not append
+        self._part_number = len(self.files)
+
+    @classmethod
+    def from_scraper_config(cls, scraper_config : dict, append : bool = False):
+        '''
+        Creates a RecordSink from the record_sink section of a site's base_config
+
+        Defaults to a JSONL sink next to the output file i.e. indeed_jobs.csv -> indeed_jobs_records.jsonl
+
+        Parameters
+        ----------
+        scraper_config : dict
+            A dictionary representing the configuration file for the website
+
+        append : bool, optional
+            Whether to add to the part files of a previous run. Defaults to False
+
+        Returns
+        -------
+            sink : RecordSink
+        '''
+        base_config = scraper_config['base_config']
+        sink_config = base_config.get('record_sink', {})
+        default_path = f"{os.path.splitext(base_config['output_file_name'])[0]}_records.jsonl"
+        return cls(
+            sink_config.get('path', default_path),
+            file_format=sink_config.get('file_format'),
+            flush_every=sink_config.get('flush_every', 50),
+            max_records_per_file=sink_config.get('max_records_per_file', 10000),
+            append=append
+        )
+
+    @property
+    def files(self):
+        '''
+        The part files of the sink in the order they were written
+        '''
+        return sorted(glob(f'{escape(self.stem)}-[0-9][0-9][0-9][0-9]{self.extension}'))
+
+    def __len__(self):
+        return self.records_written
+
+    def write(self, record : dict):
+        '''
+        Appends a record to the current part file
+
+        Parameters
+        ----------
+        record : dict
+            A dictionary representing the elements on a job detail page
+        '''
+        if self._file is None or self._records_in_file >= self.max_records_per_file:
+            self._open_next_file(record)
+
+        if self.file_format == 'jsonl':
+            # default=str writes datetimes the same way DataFrame.to_csv does
+            self._file.write(json.dumps(record, default=str) + '\n')
+        else:
+            self._csv_writer.writerow(record)
+
+        self.records_written += 1
+        self._records_in_file += 1
+        self._unflushed_records += 1
+        if self._unflushed_records >= self.flush_every:
+            self.flush()
+
+    def write_many(self, records : list):
+        '''
+        Appends several records to the sink
+        '''
+        for record in records:
+            self.write(record)
+
+    def flush(self):
+        '''
+        Flushes the records written so far to disk
+        '''
+        if self._file is not None:
+            self._file.flush()
+            os.fsync(self._file.fileno())
+        self._unflushed_records = 0
+
+    def close(self):
+        '''
+        Flushes and closes the current part file. Writing again opens a new part file.
+        '''
+        if self._file is not None:
+            self.flush()
+            self._file.close()
+            self._file = None
+            self._csv_writer = None
+
+    def iter_dataframes(self, chunksize : int = 5000):
+        '''
+        Reads the records back from the part files in bounded chunks
+
+        Parameters
+        ----------
+        chunksize : int, optional
+            The number of records per DataFrame. Defaults to 5000
+
+        Yields
+        ------
+            df : pd.DataFrame
+                A chunk of the records
+        '''
+        self.flush()
+        if self._replace_existing_files:
+            # Nothing has been written yet, the files on disk belong to a previous run
+            return
+        for file_path in self.files:
+            if os.path.getsize(file_path) == 0:
+                continue
+            if self.file_format == 'jsonl':
+                reader = pd.read_json(file_path, lines=True, dtype=False, chunksize=chunksize)
+            else:
+                reader = pd.read_csv(file_path, dtype=str, keep_default_na=False, chunksize=chunksize)
+            with reader:
+                for df in reader:
+                    yield df
+
+    def read_dataframe(self):
+        '''
+        Reads every record written to the sink into a single DataFrame
+
+        Returns
+        -------
+            df : pd.DataFrame
+                A pandas Dataframe object, empty if no records were written
+        '''
+        list_of_dataframes = list(self.iter_dataframes())
+        if not list_of_dataframes:
+            return pd.DataFrame()
+        return pd.concat(list_of_dataframes, ignore_index=True)
+
+    def export_csv(self, output_file_name : str, chunksize : int = 5000):
+        '''
+        Writes every record to a single CSV file one chunk at a time
+
+        Parameters
+        ----------
+        output_file_name : str
+            The file path of the CSV file
+
+        chunksize : int, optional
+            The number of records held in memory at once. Defaults to 5000
+
+        Returns
+        -------
+            number_of_records : int
+                The number of records written to the CSV file
+        '''
+        number_of_records = 0
+        with open(output_file_name, 'w', newline='', encoding='utf-8') as file:
+            for df in self.iter_dataframes(chunksize):
+                df.to_csv(file, index=False, header=number_of_records == 0)
+                number_of_records += len(df)
+        print(f"Exported {number_of_records} records to {output_file_name}")
+        return number_of_records
+
+    def export_parquet(self, output_file_name : str, chunksize : int = 5000, parquet_format : ParquetFormat = None):
+        '''
+        Writes every record to a single Parquet file one chunk at a time, needs pyarrow
+
+        Parameters
+        ----------
+        output_file_name : str
+            The file path of the Parquet file
+
+        chunksize : int, optional
+            The number of records held in memory at once. Defaults to 5000
+
+        parquet_format : ParquetFormat, optional
+            The compression and encoding of the file. Defaults to zstd with the DICTIONARY_COLUMNS dictionary encoded
+
+        Returns
+        -------
+            number_of_records : int
+                The number of records written to the Parquet file, no file is written if there are none
+        '''
+        parquet_format = parquet_format or ParquetFormat()
+        # Never leave the file of a previous run behind, a Parquet file is only written if there are records
+        if os.path.exists(output_file_name):
+            os.remove(output_file_name)
+        number_of_records = parquet_format.write_dataframes(output_file_name, self.iter_dataframes(chunksize))
+        print(f"Exported {number_of_records} records to {output_file_name}")
+        return number_of_records
+
+    def export(self, output_file_name : str, chunksize : int = 5000):
+        '''
+        Writes every record to a CSV or Parquet file, chosen by the extension of output_file_name
+
+        Returns
+        -------
+            number_of_records : int
+                The number of records written
+        '''
+        if output_file_name.endswith('.parquet'):
+            return self.export_parquet(output_file_name, chunksize)
+        return self.export_csv(output_file_name, chunksize)
+
+    @staticmethod
+    def get_output_file_name(base_config : dict):
+        '''
+        Returns the file a site's records are exported to
+
+        base_config.output_format can be 'csv' or 'parquet', it replaces the extension
+        of output_file_name i.e. indeed_jobs.csv -> indeed_jobs.parquet. Defaults to the
+        extension of output_file_name.
+        '''
+        output_file_name = base_config['output_file_name']
+        output_format = base_config.get('output_format')
+        if output_format is None:
+            return output_file_name
+        if output_format not in OUTPUT_FORMATS:
+            raise ValueError(f"Invalid output format {output_format} only {', '.join(OUTPUT_FORMATS)} are valid")
+        return f"{os.path.splitext(output_file_name)[0]}.{output_format}"
+
+    @staticmethod
+    def get_worker_output_file_name(output_file_name : str, worker_id : str):
+        '''
+        Returns the file a task worker exports a site's records to, i.e. indeed_jobs.csv -> indeed_jobs-<worker_id>.csv,
+        so workers on different nodes never upload to the same key
+        '''
+        file_stem, extension = os.path.splitext(output_file_name)
+        return f"{file_stem}-{worker_id}{extension}"
+
+    @staticmethod
+    def find_output_files(output_file_name : str):
+        '''
+        Returns the files a site's records were exported to, its output_file_name and any task worker's file, see get_worker_output_file_name
+        '''
+        file_stem, extension = os.path.splitext(output_file_name)
+        output_files = [output_file_name] if os.path.exists(output_file_name) else []
+        return output_files + sorted(glob(f"{escape(file_stem)}-*{escape(extension)}"))
+
+    def _open_next_file(self, record : dict):
+        self.close()
+        if self._replace_existing_files:
+            for file_path in self.files:
+                os.remove(file_path)
+            self._part_number = 0
+            self._replace_existing_files = False
+        self._part_number += 1
+        file_path = f'{self.stem}-{self._part_number:04d}{self.extension}'
+        self._file = open(file_path, 'a', newline='', encoding='utf-8')
+        self._records_in_file = 0
+        if self.file_format == 'csv':
+            self._csv_writer = csv.DictWriter(self._file, fieldnames=list(record.keys()), extrasaction='ignore')
+            self._csv_writer.writeheader()
+
@@ -0,0 +1,221 @@
+from selenium.common.exceptions import WebDriverException
+import json
+
+
+# Chrome's Network.setBlockedURLs matches urls against wildcard patterns, so each
+# resource type is blocked by the file extensions it is served with
+RESOURCE_TYPE_PATTERNS = {
+    'image': ['png', 'jpg', 'jpeg', 'gif', 'webp', 'avif', 'svg', 'ico', 'bmp'],
+    'font': ['woff', 'woff2', 'ttf', 'otf', 'eot'],
+    'media': ['mp4', 'webm', 'mp3', 'm4a', 'ogg', 'wav'],
+    'stylesheet': ['css']
+}
+
+# Ad, analytics and session recording hosts which no XPath depends on
+TRACKER_PATTERNS = [
+    '*google-analytics.com*',
+    '*googletagmanager.com*',
+    '*googlesyndication.com*',
+    '*googleadservices.com*',
+    '*doubleclick.net*',
+    '*connect.facebook.net*',
+    '*hotjar.com*',
+    '*scorecardresearch.com*',
+    '*quantserve.com*',
+    '*criteo.com*',
+    '*criteo.net*',
+    '*adnxs.com*',
+    '*bat.bing.com*',
+    '*clarity.ms*',
+    '*newrelic.com*',
+    '*nr-data.net*'
+]
+
+# Typical transfer sizes, used to estimate the bytes saved by requests which were never made
+ESTIMATED_BYTES_PER_REQUEST = {
+    'Image': 30000,
+    'Font': 40000,
+    'Media': 250000,
+    'Stylesheet': 25000,
+    'Script': 40000,
+    'Other': 5000
+}
+
+
+class ResourceBlocker:
+    '''
+    A class to stop Chrome downloading resources the scrapers never read
+
+    Images, fonts, media, stylesheets and tracker hosts are blocked through
+    the DevTools Network.setBlockedURLs command, which applies to the tab it
+    is sent to. When the driver records a performance log, the blocked
+    requests and the bytes downloaded are counted from it.
+
+    '''
+    def __init__(self, block_resource_types : list = ('image', 'font', 'media'), deny_patterns : list = None, allow_patterns : list = None, block_trackers : bool = True, estimated_bytes_per_request : dict = None):
+        """
+        Parameters
+        ----------
+        block_resource_types : list, optional
+            The resource types to block, any of 'image', 'font', 'media' and 'stylesheet'.
+            Defaults to ('image', 'font', 'media'). Stylesheets are left alone by default
+            because innerText, used by the Reed scraper, depends on them.
+
+        deny_patterns : list, optional
+            Extra url patterns to block i.e. ['*cookielaw.org*']
+
+        allow_patterns : list, optional
+            Patterns removed from the blocked list i.e. ['*.svg'] or ['*hotjar.com*'].
+            setBlockedURLs has no exceptions, so only whole patterns can be allowed.
+
+        block_trackers : bool, optional
+            Whether to block the ad and analytics hosts in TRACKER_PATTERNS. Defaults to True
+
+        estimated_bytes_per_request : dict, optional
+            Overrides for ESTIMATED_BYTES_PER_REQUEST, keyed by DevTools resource type
+
+        Attributes
+        ----------
+        self.blocked_requests : dict
+            The number of blocked requests for each DevTools resource type i.e. {'Image': 120}
+
+        self.bytes_downloaded : int
+            The bytes downloaded by the requests which were not blocked
+        """
+        for resource_type in block_resource_types:
+            if resource_type not in RESOURCE_TYPE_PATTERNS:
+                raise ValueError(f"Invalid resource type {resource_type} only {', '.join(RESOURCE_TYPE_PATTERNS)} are valid")
+
+        patterns = []
+        for resource_type in block_resource_types:
+            for extension in RESOURCE_TYPE_PATTERNS[resource_type]:
+                # The second pattern catches cache busting query strings i.e. logo.png?v=3
+                patterns.extend([f'*.{extension}', f'*.{extension}?*'])
+        if block_trackers:
+            patterns.extend(TRACKER_PATTERNS)
+        patterns.extend(deny_patterns or [])
+
+        allowed = set(allow_patterns or [])
+        self.blocked_urls = [pattern for pattern in dict.fromkeys(patterns) if pattern not in allowed]
+        self.estimated_bytes_per_request = {**ESTIMATED_BYTES_PER_REQUEST, **(estimated_bytes_per_request or {})}
+        self.blocked_requests = {}
+        self.bytes_downloaded = 0
+
+    @classmethod
+    def from_config(cls, driver_config : dict, scraper_config : dict):
+        '''
+        Creates a ResourceBlocker from the resource_blocking sections of the driver and site configuration files
+
+        The site's settings override the defaults from options_config.yaml, and its
+        deny_patterns and allow_patterns are added to the defaults.
+
+        Parameters
+        ----------
+        driver_config : dict
+            A dictionary representing the driver configuration file
+
+        scraper_config : dict
+            A dictionary representing the configuration file for the website
+
+        Returns
+        -------
+            blocker : ResourceBlocker
+                A ResourceBlocker for the site, or None if resource blocking is not enabled
+        '''
+        default_config = driver_config.get('resource_blocking', {})
+        site_config = scraper_config.get('base_config', {}).get('resource_blocking', {})
+        if not site_config.get('enabled', default_config.get('enabled', False)):
+            return None
+
+        return cls(
+            block_resource_types=site_config.get('block_resource_types', default_config.get('block_resource_types', ['image', 'font', 'media'])),
+            deny_patterns=default_config.get('deny_patterns', []) + site_config.get('deny_patterns', []),
+            allow_patterns=default_config.get('allow_patterns', []) + site_config.get('allow_patterns', []),
+            block_trackers=site_config.get('block_trackers', default_config.get('block_trackers', True)),
+            estimated_bytes_per_request=default_config.get('estimated_bytes_per_request')
+        )
+
+    def apply(self, driver):
+        '''
+        Blocks the resources in the current tab of a driver
+
+        Parameters
+        ----------
+        driver : WebDriver
+            A selenium WebDriver object, the command is sent to its current tab
+        '''
+        try:
+            driver.execute_cdp_cmd('Network.enable', {})
+            driver.execute_cdp_cmd('Network.setBlockedURLs', {'urls': self.blocked_urls})
+        except (WebDriverException, AttributeError) as e:
+            # Only Chromium drivers speak the DevTools protocol
+            print(f"Could not block resources: {e}")
+
+    def record_performance_log(self, driver):
+        '''
+        Counts the blocked requests and downloaded bytes since the performance log was last read
+
+        Does nothing unless the driver was started with the goog:loggingPrefs performance capability.
+
+        Parameters
+        ----------
+        driver : WebDriver
+            A selenium WebDriver object
+        '''
+        try:
+            entries = driver.get_log('performance')
+        except (WebDriverException, AttributeError, ValueError):
+            return
+        self.record_log_entries(entries)
+
+    def record_log_entries(self, entries : list):
+        '''
+        Counts the blocked requests and downloaded bytes in a batch of performance log entries
+
+        Used directly by anything else which reads the performance log, since reading it empties it.
+
+        Parameters
+        ----------
+        entries : list
+            The entries returned by driver.get_log('performance')
+        '''
+        for entry in entries:
+            message = entry['message']
+            # Skip parsing the many events which are not needed
+            if 'Network.loadingFailed' not in message and 'Network.loadingFinished' not in message:
+                continue
+            event = json.loads(message)['message']
+            params = event.get('params', {})
+            if event.get('method') == 'Network.loadingFinished':
+                self.bytes_downloaded += int(params.get('encodedDataLength', 0))
+            elif event.get('method') == 'Network.loadingFailed' and params.get('blockedReason') == 'inspector':
+                resource_type = params.get('type', 'Other')
+                self.blocked_requests[resource_type] = self.blocked_requests.get(resource_type, 0) + 1
+
+    def summary(self):
+        '''
+        Summarises the requests blocked so far
+
+        Returns
+        -------
+            summary : dict
+                A dictionary containing the blocked requests by resource type, the bytes
+                downloaded and the estimated bytes saved
+        '''
+        estimated_bytes_saved = sum(
+            number_of_requests * self.estimated_bytes_per_request.get(resource_type, self.estimated_bytes_per_request['Other'])
+            for resource_type, number_of_requests in self.blocked_requests.items()
+        )
+        return {
+            'blocked_requests': dict(self.blocked_requests),
+            'bytes_downloaded': self.bytes_downloaded,
+            'estimated_bytes_saved': estimated_bytes_saved
+        }
+
+    def print_summary(self, site_name : str = ''):
+        '''
+        Prints the requests blocked and the bandwidth saved
+        '''
+        summary = self.summary()
+        print(f"Resource blocking {site_name}: blocked {sum(summary['blocked_requests'].values())} requests {summary['blocked_requests']}, "
+              f"downloaded {summary['bytes_downloaded'] / 1e6:.1f} MB, saved about {summary['estimated_bytes_saved'] / 1e6:.1f} MB")
@@ -0,0 +1,224 @@
+from random import uniform
+from time import monotonic, sleep
+from selenium.common.exceptions import WebDriverException
+
+
+class CircuitOpenError(RuntimeError):
+    '''
+    Raised instead of making a request to a site whose circuit breaker is open
+    '''
+    pass
+
+
+class RetryPolicy:
+    '''
+    A class to retry an operation with exponential backoff and jitter
+
+    The delay before retry n is base_delay * multiplier ** (n - 1), capped at
+    max_delay, with up to jitter of it taken off at random so workers which
+    failed together do not retry together.
+
+    '''
+    def __init__(self, max_attempts : int = 3, base_delay : float = 1.0, multiplier : float = 2.0, max_delay : float = 30.0, jitter : float = 0.5, retry_on : tuple = (WebDriverException,)):
+        """
+        Parameters
+        ----------
+        max_attempts : int, optional
+            The number of times the operation is tried. Defaults to 3
+
+        base_delay : float, optional
+            The number of seconds before the first retry. Defaults to 1.0
+
+        multiplier : float, optional
+            The factor the delay grows by after each retry. Defaults to 2.0
+
+        max_delay : float, optional
+            The longest delay in seconds. Defaults to 30.0
+
+        jitter : float, optional
+            The fraction of each delay which is randomised, between 0 and 1. Defaults to 0.5
+
+        retry_on : tuple, optional
+            The exceptions which are retried, anything else is raised straight away.
+            Defaults to (WebDriverException,), which covers timeouts and stale elements
+        """
+        if max_attempts < 1:
+            raise ValueError('max_attempts must be at least 1')
+        if not 0 <= jitter <= 1:
+            raise ValueError('jitter must be between 0 and 1')
+
+        self.max_attempts = max_attempts
+        self.base_delay = base_delay
+        self.multiplier = multiplier
+        self.max_delay = max_delay
+        self.jitter = jitter
+        self.retry_on = retry_on
+
+    @classmethod
+    def from_config(cls, driver_config : dict, scraper_config : dict):
+        '''
+        Creates a RetryPolicy from the retry sections of the driver and site configuration files
+
+        The site's base_config.retry overrides the defaults in options_config.yaml.
+
+        Parameters
+        ----------
+        driver_config : dict
+            A dictionary representing the driver configuration file
+
+        scraper_config : dict
+            A dictionary representing the configuration file for the website
+
+        Returns
+        -------
+            policy : RetryPolicy
+        '''
+        retry_config = {**driver_config.get('retry', {}), **scraper_config.get('base_config', {}).get('retry', {})}
+        return cls(
+            max_attempts=retry_config.get('max_attempts', 3),
+            base_delay=retry_config.get('base_delay', 1.0),
+            multiplier=retry_config.get('multiplier', 2.0),
+            max_delay=retry_config.get('max_delay', 30.0),
+            jitter=retry_config.get('jitter', 0.5)
+        )
+
+    def get_delay(self, attempt : int):
+        '''
+        Returns the number of seconds to wait after a failed attempt, starting from attempt 1
+        '''
+        delay = min(self.max_delay, self.base_delay * self.multiplier ** (attempt - 1))
+        return uniform(delay * (1 - self.jitter), delay)
+
+    def run(self, operation, description : str = 'operation', retry_on : tuple = None, on_retry=None, circuit_breaker=None):
+        '''
+        Runs an operation, retrying it when it raises one of the retried exceptions
+
+        Parameters
+        ----------
+        operation : callable
+            Takes no arguments, its return value is returned
+
+        description : str, optional
+            What the operation does, used in the messages i.e. 'loading https://www.reed.co.uk/'
+
+        retry_on : tuple, optional
+            Overrides the exceptions which are retried
+
+        on_retry : callable, optional
+            Called with the attempt number and the exception before the operation is tried again,
+            i.e. to refresh the page
+
+        circuit_breaker : CircuitBreaker, optional
+            The site's circuit breaker. It is checked before every attempt, and the outcome of the
+            operation is recorded once it succeeds or runs out of attempts
+
+        Returns
+        -------
+            result
+                The return value of the operation. The last exception is raised if every attempt failed,
+                and a CircuitOpenError is raised if the site's circuit breaker is open
+        '''
+        retry_on = retry_on or self.retry_on
+        for attempt in range(1, self.max_attempts + 1):
+            if circuit_breaker is not None:
+                circuit_breaker.check()
+            try:
+                result = operation()
+            except retry_on as e:
+                if attempt == self.max_attempts:
+                    print(f"Gave up {description} after {attempt} attempts: {type(e).__name__}")
+                    if circuit_breaker is not None:
+                        circuit_breaker.record_failure()
+                    raise
+                delay = self.get_delay(attempt)
+                print(f"{type(e).__name__} {description}, retrying in {delay:.1f}s (attempt {attempt} of {self.max_attempts})")
+                sleep(delay)
+                if on_retry is not None:
+                    on_retry(attempt, e)
+            else:
+                if circuit_breaker is not None:
+                    circuit_breaker.record_success()
+                return result
+
+
+class CircuitBreaker:
+    '''
+    A class to pause a site after too many operations in a row have failed
+
+    While the breaker is closed every request is allowed. After failure_threshold
+    consecutive failures it opens and check() raises a CircuitOpenError, so the
+    scraper stops hammering a site which is down or blocking it. After
+    reset_timeout seconds it lets a single trial through: a success closes it
+    again, a failure opens it for another reset_timeout.
+
+    '''
+    def __init__(self, name : str = '', failure_threshold : int = 5, reset_timeout : float = 300):
+        """
+        Parameters
+        ----------
+        name : str, optional
+            The site the breaker protects, used in the messages
+
+        failure_threshold : int, optional
+            The number of consecutive failures which open the breaker. Defaults to 5
+
+        reset_timeout : float, optional
+            The number of seconds the breaker stays open before a trial is allowed. Defaults to 300
+
+        Attributes
+        ----------
+        self.consecutive_failures : int
+            The number of failures since the last success
+
+        self.times_opened : int
+            The number of times the breaker has opened during the run
+        """
+        self.name = name
+        self.failure_threshold = failure_threshold
+        self.reset_timeout = reset_timeout
+        self.consecutive_failures = 0
+        self.times_opened = 0
+        self.opened_at = None
+
+    @classmethod
+    def from_config(cls, name : str, driver_config : dict, scraper_config : dict):
+        '''
+        Creates a CircuitBreaker from the circuit_breaker sections of the driver and site configuration files
+
+        The site's base_config.circuit_breaker overrides the defaults in options_config.yaml.
+        '''
+        breaker_config = {**driver_config.get('circuit_breaker', {}), **scraper_config.get('base_config', {}).get('circuit_breaker', {})}
+        return cls(
+            name,
+            failure_threshold=breaker_config.get('failure_threshold', 5),
+            reset_timeout=breaker_config.get('reset_timeout', 300)
+        )
+
+    @property
+    def is_open(self):
+        '''
+        True while requests are refused, False once the reset_timeout has passed and a trial is allowed
+        '''
+        return self.opened_at is not None and monotonic() - self.opened_at < self.reset_timeout
+
+    def check(self):
+        '''
+        Raises a CircuitOpenError if the breaker is open
+        '''
+        if self.is_open:
+            remaining = self.reset_timeout - (monotonic() - self.opened_at)
+            raise CircuitOpenError(f"{self.name} is paused for another {remaining:.0f}s after {self.consecutive_failures} consecutive failures")
+
+    def record_success(self):
+        if self.opened_at is not None:
+            print(f"{self.name} recovered, closing its circuit breaker")
+        self.consecutive_failures = 0
+        self.opened_at = None
+
+    def record_failure(self):
+        self.consecutive_failures += 1
+        # A failed trial after the reset_timeout opens the breaker again straight away
+        if self.consecutive_failures >= self.failure_threshold or self.opened_at is not None:
+            self.opened_at = monotonic()
+            self.times_opened += 1
+            print(f"{self.consecutive_failures} consecutive failures on {self.name}, pausing it for {self.reset_timeout}s")
@@ -0,0 +1,125 @@
+from datetime import datetime
+from sqlalchemy import text
+from sqlalchemy.engine import Engine
+import sqlite3
+import threading
+
+
+class SeenUrlIndex:
+    '''
+    A persistent index of job urls which have already been scraped
+
+    Backed by a local SQLite file so that it survives between runs.
+    The harvesters consult it before scheduling a detail page fetch,
+    so postings already stored are not visited again.
+
+    '''
+    def __init__(self, index_path : str = 'seen_urls.db'):
+        """
+        Parameters
+        ----------
+        index_path : str, optional
+            The file path to the SQLite file. Defaults to 'seen_urls.db'
+        """
+        self.index_path = index_path
+        self._connection = sqlite3.connect(index_path, check_same_thread=False, timeout=30)
+        self._lock = threading.Lock()
+        with self._lock, self._connection:
+            self._connection.execute(
+                "CREATE TABLE IF NOT EXISTS seen_urls (url TEXT PRIMARY KEY, first_seen TEXT)"
+            )
+
+    @staticmethod
+    def normalise_url(url : str):
+        '''
+        Removes the fragment and trailing slash from a url so that equivalent urls share one entry
+        '''
+        return url.split('#', 1)[0].rstrip('/')
+
+    def __contains__(self, url : str):
+        return not self.filter_unseen([url])
+
+    def __len__(self):
+        with self._lock:
+            return self._connection.execute("SELECT COUNT(*) FROM seen_urls").fetchone()[0]
+
+    def filter_unseen(self, list_of_urls : list, chunk_size : int = 500):
+        '''
+        Filters out the urls which are already in the index
+
+        Parameters
+        ----------
+        list_of_urls : list
+            The job urls collected from a results page
+
+        chunk_size : int, optional
+            The number of urls looked up per query. Defaults to 500
+
+        Returns
+        -------
+            unseen_urls : list
+                The urls not in the index, in their original order
+        '''
+        normalised_urls = [self.normalise_url(url) for url in list_of_urls]
+        seen = set()
+        with self._lock:
+            for start in range(0, len(normalised_urls), chunk_size):
+                chunk = normalised_urls[start:start + chunk_size]
+                placeholders = ', '.join('?' for _ in chunk)
+                rows = self._connection.execute(
+                    f"SELECT url FROM seen_urls WHERE url IN ({placeholders})", chunk
+                ).fetchall()
+                seen.update(row[0] for row in rows)
+
+        return [url for url, normalised_url in zip(list_of_urls, normalised_urls) if normalised_url not in seen]
+
+    def add(self, list_of_urls : list):
+        '''
+        Adds urls to the index
+
+        Parameters
+        ----------
+        list_of_urls : list
+            The job urls which have been extracted and stored
+        '''
+        first_seen = datetime.now().isoformat()
+        with self._lock, self._connection:
+            self._connection.executemany(
+                "INSERT OR IGNORE INTO seen_urls (url, first_seen) VALUES (?, ?)",
+                [(self.normalise_url(url), first_seen) for url in list_of_urls]
+            )
+
+    def seed_from_database(self, engine : Engine, table_name : str = 'dim_job_url', column_name : str = 'job_url'):
+        '''
+        Adds every job url already stored in the target database to the index
+
+        Parameters
+        ----------
+        engine : Engine
+            A sqlalchemy Engine object pointing to the target database
+
+        table_name : str, optional
+            The table containing the job urls. Defaults to 'dim_job_url'
+
+        column_name : str, optional
+            The column containing the job urls. Defaults to 'job_url'
+
+        Returns
+        -------
+            number_of_urls : int
+                The number of urls read from the database
+        '''
+        with engine.connect() as connection:
+            rows = connection.execute(text(f"SELECT {column_name} FROM {table_name}")).fetchall()
+
+        list_of_urls = [row[0] for row in rows if row[0]]
+        self.add(list_of_urls)
+        print(f"Seeded seen url index with {len(list_of_urls)} urls from {table_name}")
+        return len(list_of_urls)
+
+    def close(self):
+        '''
+        Closes the connection to the SQLite file
+        '''
+        with self._lock:
+            self._connection.close()
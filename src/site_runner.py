@@ -0,0 +1,256 @@
+from queue import Empty
+from time import monotonic
+from src.checkpoint_store import CheckpointStore
+from src.driver_pool import DriverPool
+from src.rate_limiter import RateLimiter
+from src.seen_url_index import SeenUrlIndex
+import multiprocessing
+import os
+import signal
+import traceback
+import yaml
+
+
+def run_site_worker(site_spec : dict, events, resume : bool = False):
+    '''
+    Scrapes every job title of one site inside a worker process
+
+    The worker builds its own driver pool, rate limiter, seen url index and
+    checkpoint, so nothing is shared with the other sites. Progress is sent
+    back to the parent as dictionaries on the events queue:
+
+        heartbeat   before every request the scraper makes
+        progress    after each job title, with the number of records stored
+        done        with the number of records, the CSV file they were exported to and
+                    the job titles skipped because the site's circuit breaker opened
+        error       with the traceback of the exception which stopped the worker
+
+    Parameters
+    ----------
+    site_spec : dict
+        A dictionary describing the site, see SiteOrchestrator.run
+
+    events : Queue
+        The multiprocessing queue read by the parent
+
+    resume : bool, optional
+        Whether to pick up from the site's checkpoint. Defaults to False
+    '''
+    site_name = site_spec['site_name']
+
+    def send(event, **data):
+        events.put({'site': site_name, 'event': event, **data})
+
+    # Lead a new process group so a hung worker can be killed along with its Chrome processes
+    if hasattr(os, 'setsid'):
+        os.setsid()
+
+    driver_config_file = site_spec.get('driver_config_file', 'config/options_config.yaml')
+    driver_pool = DriverPool.from_config(driver_config_file, website_options=True)
+    rate_limiter = RateLimiter()
+    seen_url_index = SeenUrlIndex(site_spec.get('seen_url_index_path', 'seen_urls.db'))
+    checkpoint_store = CheckpointStore(f'checkpoint_{site_name}.json', resume=resume)
+    scraper = None
+    try:
+        scraper = site_spec['scraper_class'](
+            site_spec['base_url'],
+            site_spec['scraper_config_file'],
+            driver_config_file,
+            website_options=True,
+            driver_pool=driver_pool,
+            rate_limiter=rate_limiter,
+            seen_url_index=seen_url_index,
+            checkpoint_store=checkpoint_store
+        )
+        scraper.heartbeat = lambda: send('heartbeat')
+        run = getattr(scraper, site_spec['run_method'])
+        base_config = scraper.scraper_config['base_config']
+
+        for job_title in base_config['job_titles']:
+            run(job_title, **site_spec.get('run_kwargs', {}))
+            send('progress', job_title=job_title, records=len(scraper.record_sink))
+
+        output_file_name = scraper.site_spec.output_file_name
+        number_of_records = scraper.record_sink.export(output_file_name)
+        # The records are saved, so their urls can be skipped on the next run
+        scraper.commit_seen_urls()
+        # Keep the checkpoint of a site which was paused, so --resume picks up its skipped job titles
+        if not scraper.skipped_job_titles:
+            checkpoint_store.clear()
+        send('done', records=number_of_records, output_file=output_file_name, skipped_job_titles=scraper.skipped_job_titles)
+    except Exception:
+        send('error', error=traceback.format_exc())
+    finally:
+        if scraper is not None:
+            scraper.print_resource_summary()
+        driver_pool.close()
+        rate_limiter.print_summary()
+        seen_url_index.close()
+
+
+class SiteOrchestrator:
+    '''
+    A class to scrape several sites in parallel, one isolated worker process per site
+
+    Workers are started with the spawn method, so each one has its own interpreter,
+    drivers and state. A worker which runs past its timeout, or which stops sending
+    heartbeats for hang_timeout seconds, is killed together with its Chrome processes.
+
+    '''
+    def __init__(self, max_workers : int = None, timeout : float = None, hang_timeout : float = 300, poll_interval : float = 1.0):
+        """
+        Parameters
+        ----------
+        max_workers : int, optional
+            The number of sites scraped at once. Defaults to None, which runs every site at once
+
+        timeout : float, optional
+            The number of seconds a worker may run for. Defaults to None, no limit
+
+        hang_timeout : float, optional
+            The number of seconds a worker may go without a heartbeat. Defaults to 300
+
+        poll_interval : float, optional
+            The number of seconds between checks on the workers. Defaults to 1.0
+        """
+        self.max_workers = max_workers
+        self.timeout = timeout
+        self.hang_timeout = hang_timeout
+        self.poll_interval = poll_interval
+        self.context = multiprocessing.get_context('spawn')
+
+    @classmethod
+    def from_config(cls, driver_config_file : str):
+        '''
+        Creates a SiteOrchestrator from the orchestrator section of the driver configuration file
+
+        Parameters
+        ----------
+        driver_config_file : str
+            The file path to the driver configuration file i.e. config/options_config.yaml
+
+        Returns
+        -------
+            orchestrator : SiteOrchestrator
+        '''
+        with open(driver_config_file, 'r') as file:
+            orchestrator_config = (yaml.safe_load(file) or {}).get('orchestrator', {})
+
+        return cls(
+            max_workers=orchestrator_config.get('max_workers'),
+            timeout=orchestrator_config.get('timeout'),
+            hang_timeout=orchestrator_config.get('hang_timeout', 300)
+        )
+
+    def run(self, site_specs : list, resume : bool = False):
+        '''
+        Scrapes every site and waits for the workers to finish
+
+        Parameters
+        ----------
+        site_specs : list
+            A list of dictionaries, one per site, with the keys
+                site_name : str, i.e. 'indeed', used for the checkpoint file and the results
+                scraper_class : type, i.e. IndeedScraper
+                base_url : str
+                scraper_config_file : str
+                run_method : str, the method scraping one job title i.e. 'run'
+                run_kwargs : dict, optional, extra keyword arguments for the run method
+                driver_config_file : str, optional
+                seen_url_index_path : str, optional
+
+        resume : bool, optional
+            Whether each worker picks up from its site's checkpoint. Defaults to False
+
+        Returns
+        -------
+            results : dict
+                A dictionary mapping each site_name to its outcome. Each outcome has a status of
+                'done', 'error', 'timed_out', 'hung' or 'crashed' and the records stored so far
+        '''
+        events = self.context.Queue()
+        pending_specs = list(site_specs)
+        running = {}
+        results = {}
+        max_workers = self.max_workers or len(site_specs)
+
+        while pending_specs or running:
+            while pending_specs and len(running) < max_workers:
+                site_spec = pending_specs.pop(0)
+                process = self.context.Process(
+                    target=run_site_worker,
+                    args=(site_spec, events, resume),
+                    name=f"scrape-{site_spec['site_name']}"
+                )
+                process.start()
+                now = monotonic()
+                running[site_spec['site_name']] = {'process': process, 'started_at': now, 'last_heartbeat': now}
+                results[site_spec['site_name']] = {'status': 'running', 'records': 0}
+                print(f"Started worker {process.pid} for {site_spec['site_name']}")
+
+            self.read_events(events, running, results)
+
+            now = monotonic()
+            for site_name, worker in list(running.items()):
+                process = worker['process']
+                if not process.is_alive():
+                    process.join()
+                    # Pick up anything the worker sent just before it exited
+                    self.read_events(events, running, results, block=False)
+                    if results[site_name]['status'] == 'running':
+                        results[site_name]['status'] = 'crashed'
+                        print(f"Worker for {site_name} exited with code {process.exitcode}")
+                    del running[site_name]
+                elif self.timeout is not None and now - worker['started_at'] > self.timeout:
+                    self.kill_worker(site_name, process)
+                    results[site_name]['status'] = 'timed_out'
+                    del running[site_name]
+                elif now - worker['last_heartbeat'] > self.hang_timeout:
+                    self.kill_worker(site_name, process)
+                    results[site_name]['status'] = 'hung'
+                    del running[site_name]
+
+        events.close()
+        return results
+
+    def read_events(self, events, running : dict, results : dict, block : bool = True):
+        '''
+        Applies the events sent by the workers to the results
+
+        Waits up to poll_interval for the first event when block is True, then reads any others already queued.
+        '''
+        timeout = self.poll_interval if block else 0
+        while True:
+            try:
+                event = events.get(timeout=timeout) if timeout else events.get_nowait()
+            except Empty:
+                return
+            timeout = 0
+
+            site_name = event['site']
+            if site_name in running:
+                running[site_name]['last_heartbeat'] = monotonic()
+            result = results[site_name]
+            if event['event'] == 'progress':
+                result['records'] = event['records']
+                print(f"{site_name}: finished {event['job_title']}, {event['records']} records stored")
+            elif event['event'] == 'done':
+                result.update(status='done', records=event['records'], output_file=event['output_file'], skipped_job_titles=event['skipped_job_titles'])
+                print(f"{site_name}: exported {event['records']} records to {event['output_file']}")
+                if event['skipped_job_titles']:
+                    print(f"{site_name}: skipped {', '.join(event['skipped_job_titles'])} while the site was paused")
+            elif event['event'] == 'error':
+                result.update(status='error', error=event['error'])
+                print(f"{site_name}: worker failed\n{event['error']}")
+
+    def kill_worker(self, site_name : str, process):
+        '''
+        Kills a worker process and every Chrome process it started
+        '''
+        print(f"Killing worker {process.pid} for {site_name}")
+        try:
+            os.killpg(process.pid, signal.SIGKILL)
+        except (AttributeError, OSError):
+            # No process groups on this platform, or the worker had not started its group yet
+            process.kill()
+        process.join(5)
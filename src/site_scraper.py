@@ -0,0 +1,320 @@
+from datetime import datetime
+from selenium.common.exceptions import ElementClickInterceptedException, NoSuchElementException, TimeoutException
+from selenium.webdriver.common.by import By
+from src.general_scraper import GeneralScraper
+from src.site_spec import SiteSpec, SiteSpecError
+
+
+class SiteScraper(GeneralScraper):
+    '''
+    A scraper for any job site described by its configuration file
+
+    The configuration file is compiled into a SiteSpec when the scraper is created.
+    Every site then goes through the same steps for each job title:
+
+        harvest     open the results pages, from the search_url template or by landing on the
+                    site, dismissing the cookie banner, searching and clicking the configured buttons,
+                    then walk the results pages collecting the job urls
+        fetch       extract each job detail page, over HTTP when possible, otherwise in browser tabs
+
+    Site quirks are handled by hooks. The cookie banner names its hook in the spec,
+    the methods are looked up in consent_hooks, so a new kind of banner is one method
+    on a subclass and a new site is a configuration file.
+
+    '''
+    # Maps the hook named by cookie_banner in the site spec to the method which dismisses the banner
+    consent_hooks = {
+        'click': 'dismiss_cookie_banner',
+        'shadow_root': 'dismiss_shadow_root_banner'
+    }
+
+    # Values for the site spec the configuration file can still override, set by the site subclasses
+    spec_defaults = {}
+
+    def __init__(self, base_url : str, scraper_config_filename : str, driver_config_file : str, file_type : str = 'yaml', website_options=False, driver_pool=None, rate_limiter=None, seen_url_index=None, checkpoint_store=None):
+        """
+        Parameters
+        ----------
+        base_url : str
+            The landing page of the site i.e. https://uk.indeed.com/
+
+        scraper_config_filename : str
+            The file path to the site configuration file i.e. config/indeed_config.json
+
+        driver_config_file : str
+            The file path to the driver configuration file i.e. config/options_config.yaml
+
+        The remaining parameters are passed to GeneralScraper.
+
+        Attributes
+        ----------
+        self.site_spec : SiteSpec
+            The compiled site configuration, raises a SiteSpecError if the configuration file is invalid
+        """
+        super().__init__(driver_config_file, file_type, website_options=website_options, driver_pool=driver_pool, rate_limiter=rate_limiter, seen_url_index=seen_url_index, checkpoint_store=checkpoint_store)
+        self.base_url = base_url
+        self.scraper_config = self.load_config_file(scraper_config_filename, file_type)
+        self.site_spec = SiteSpec.from_config(self.scraper_config, base_url, self.spec_defaults)
+        if self.site_spec.cookie_banner is not None and self.site_spec.cookie_banner['hook'] not in self.consent_hooks:
+            raise SiteSpecError(f"Invalid cookie banner hook {self.site_spec.cookie_banner['hook']} for {base_url}, only {list(self.consent_hooks)} are valid")
+        self.setup_http_fetcher(self.scraper_config)
+        self.setup_rate_limiter(self.base_url, self.scraper_config)
+        self.setup_resource_blocker(self.scraper_config)
+        self.setup_browser_state(self.scraper_config)
+        self.setup_retry_policy(self.scraper_config)
+        self.setup_record_sink(self.scraper_config)
+
+    def run(self, job_title : str, number_of_pages : int = None):
+        '''
+        Harvests and fetches the jobs for a job title, picking up from the checkpoint when there is one
+
+        Parameters
+        ----------
+            job_title : str
+                The job title being scraped
+
+            number_of_pages : int, optional
+                The number of results pages to walk. Defaults to None, the number_of_pages of the configuration file
+        '''
+        if number_of_pages is None:
+            number_of_pages = self.site_spec.number_of_pages
+        with self.checkout_driver():
+            self.run_job_title(job_title, lambda: self.harvest_job_links(job_title, number_of_pages), self.extract_job_data)
+
+    def harvest_job_links(self, job_title : str, number_of_pages : int = None):
+        '''
+        Collects the job urls for a job title from the results pages
+
+        Returns
+        -------
+            list_of_urls : list
+                The unique job urls which have not been scraped before, in the order they were found
+        '''
+        # Jump straight to the results pages when the site has a search url template
+        if self.site_spec.has_search_url:
+            return self.harvest_search_pages(job_title, self.site_spec.extract_data, number_of_pages)
+        return self.harvest_through_search_bar(job_title, number_of_pages)
+
+    def harvest_through_search_bar(self, job_title : str, number_of_pages : int = None):
+        '''
+        Collects the job urls for a job title by landing on the site and searching through its search bar
+
+        Returns
+        -------
+            list_of_urls : list
+                The unique job urls which have not been scraped before
+        '''
+        if not self.site_spec.search_bar_xpath:
+            raise SiteSpecError(f"{self.site_spec.name} has no search bar XPath, its jobs can only be harvested from base_config.search_url")
+
+        self.land_first_page(self.base_url)
+        self.dismiss_cookie_banner_hook()
+        self.dismiss_popup()
+        self.interact_with_search_bar(self.site_spec.search_bar_xpath, job_title, self.site_spec.search_button_xpath)
+        self.dismiss_popup()
+        for button_xpath in self.site_spec.click_buttons:
+            self.retry_policy.run(
+                lambda: self.click_button_on_page(button_xpath),
+                f"clicking {button_xpath}",
+                retry_on=(NoSuchElementException,),
+                on_retry=lambda attempt, error: self.refresh_page(),
+                circuit_breaker=self.circuit_breaker
+            )
+        return self.paginate_results(number_of_pages)
+
+    def paginate_results(self, number_of_pages : int = None):
+        '''
+        Walks the results pages from the current one, sorted newest first when the site allows it
+
+        Returns
+        -------
+            list_of_urls : list
+                The unique job urls which have not been scraped before
+        '''
+        self.sort_results_by_date()
+        list_of_urls = self.paginate(self.collect_result_links, self.go_to_next_page, number_of_pages)
+        print(f"Harvested {len(list_of_urls)} job urls from {self.site_spec.name}")
+        return list_of_urls
+
+    def collect_result_links(self):
+        '''
+        Collects the job urls on the current results page with the site's harvest_mode
+        '''
+        if self.site_spec.harvest_mode == 'scroll':
+            return self.collect_job_card_urls(self.site_spec.extract_data)
+
+        # A results page without job cards is retried by paginate
+        if not self.wait_for_loading(self.site_spec.main_container):
+            raise TimeoutException(f"No job cards on {self.driver.current_url}")
+        job_urls = self.extract_links_batch(self.site_spec.main_container, self.site_spec.job_url)
+        print(f"Collected {len(job_urls)} job urls from {self.driver.current_url}")
+        return job_urls
+
+    def go_to_next_page(self):
+        '''
+        Clicks the next page button of the results
+
+        Returns
+        -------
+            next_page_button : WebElement
+                The button which was clicked, None on the last page or when the site has no next_page_xpath
+        '''
+        if not self.site_spec.next_page_xpath:
+            return None
+        try:
+            return self.navigate_to_next_page(self.site_spec.next_page_xpath)
+        except ElementClickInterceptedException:
+            # The next button can sit behind a footer until the page is scrolled to the bottom
+            self.driver.execute_script("window.scrollTo(0, document.body.scrollHeight)")
+            return self.navigate_to_next_page(self.site_spec.next_page_xpath)
+
+    def extract_job_data(self, list_of_urls : list):
+        '''
+        Extracts and stores the record of each job url, over HTTP when possible, otherwise in browser tabs
+
+        Returns
+        -------
+            number_of_records : int
+                The number of records written to the record sink so far
+        '''
+        extract_data = self.site_spec.extract_data
+        browser_urls = []
+        for url in list_of_urls:
+            record = self.fetch_record_over_http(url, extract_data)
+            if record is None:
+                browser_urls.append(url)
+            else:
+                self.store_record(url, record)
+
+        self.extract_pages_in_tabs(
+            browser_urls,
+            lambda url: self.extract_detail_page(extract_data),
+            self.site_spec.browser_tabs,
+            on_record=self.store_record
+        )
+        return len(self.record_sink)
+
+    def fetch_job_detail(self, url : str, webpage_config_dict : dict, keep_record=None):
+        '''
+        Fetches a single job detail page, over HTTP when possible, and stores its record. 
+
+        Parameters
+        ----------
+            url : str 
+                The url of the job detail page 
+
+            webpage_config_dict : dict 
+                The extract_data dictionary from the site configuration file 
+
+            keep_record : callable, optional 
+                Called with the record before it is stored, the record is dropped if it returns False 
+                i.e. when the task queue lease on the page was lost. Defaults to None, every record is stored 
+
+        Returns
+        ------- 
+            data : dict 
+                The record which was stored, None if keep_record dropped it 
+        '''
+        record = self.fetch_record_over_http(url, webpage_config_dict)
+        if record is None:
+            record = self.fetch_page(url, lambda url: self.extract_detail_page(webpage_config_dict))
+        if keep_record is not None and not keep_record(record):
+            return None
+        self.store_record(url, record)
+        return record
+
+    def extract_detail_page(self, webpage_config_dict : dict = None):
+        '''
+        Extracts the record of the job detail page loaded in the driver
+
+        Every XPath field is read in a single script call. The url and date fields are filled in
+        from the driver, and the website_name field from the configuration file or the site name.
+
+        Parameters
+        ----------
+            webpage_config_dict : dict, optional
+                An extract_data dictionary. Defaults to None, the site spec's fields
+
+        Returns
+        -------
+            data : dict
+                A dictionary representing the elements on the webpage
+        '''
+        if webpage_config_dict is None or webpage_config_dict is self.site_spec.extract_data:
+            extract_data, page_fields = self.site_spec.extract_data, self.site_spec.page_fields
+        else:
+            extract_data, page_fields = webpage_config_dict, self.select_page_fields(webpage_config_dict)
+        page_data = self.extract_elements_batch(page_fields, attribute=self.site_spec.text_attribute)
+
+        data = {}
+        for key, value in extract_data.items():
+            if key == 'main_container':
+                continue
+            elif 'url' in key:
+                data[key] = self.driver.current_url or 'N/A'
+            elif key == 'website_name':
+                data[key] = value or self.get_website_name()
+            elif 'date' in key:
+                data[key] = datetime.today()
+            else:
+                data[key] = page_data[key]
+        return data
+
+    def get_website_name(self):
+        '''
+        Returns the site spec's name, stored in records whose configuration file leaves website_name empty
+        '''
+        return self.site_spec.name
+
+    def dismiss_cookie_banner_hook(self):
+        '''
+        Dismisses the cookie banner with the hook named in the site spec, skipped while the saved consent is valid
+        '''
+        cookie_banner = self.site_spec.cookie_banner
+        if cookie_banner is None:
+            return False
+        dismiss_banner = getattr(self, self.consent_hooks[cookie_banner['hook']])
+        return self.handle_consent(lambda: dismiss_banner(cookie_banner))
+
+    def dismiss_cookie_banner(self, cookie_banner : dict):
+        '''
+        Hook for a cookie banner with an ordinary button, cookie_banner needs the xpath of the button
+        '''
+        return self.dismiss_element(cookie_banner['xpath'], 'Cookies Content')
+
+    def dismiss_shadow_root_banner(self, cookie_banner : dict):
+        '''
+        Hook for a cookie banner inside a shadow root i.e. CV-Library's
+
+        cookie_banner needs the container_selector, the CSS selector of the shadow host, and the script,
+        which is called with the shadow host and returns the accept button.
+        '''
+        try:
+            container_element = self.driver.find_element(By.CSS_SELECTOR, cookie_banner['container_selector'])
+            accept_button = self.driver.execute_script(cookie_banner['script'], container_element)
+            if accept_button:
+                accept_button.click()
+                self.page_readiness.wait_for_element_gone(self.driver, container_element, timeout=self.page_readiness.click_timeout)
+                print("Cookies Content dismissed.")
+                return True
+        except (NoSuchElementException, TimeoutException):
+            print("No Cookies Content found to dismiss.")
+        except Exception as e:
+            print(f"Error dismissing Cookies Content: {e}")
+        return False
+
+    def dismiss_popup(self):
+        '''
+        Dismisses the site's pop-up if the spec has a popup_path
+        '''
+        if self.site_spec.popup_path:
+            return self.dismiss_element(self.site_spec.popup_path, 'Pop-up')
+        return False
+
+    def output_to_dataframe(self):
+        '''
+        Reads the records streamed to the record sink into a pandas DataFrame
+        '''
+        df = self.record_sink.read_dataframe()
+        print(df)
+        return df
@@ -0,0 +1,253 @@
+from urllib.parse import urlparse
+from src.record_sink import RecordSink
+
+
+# How the job urls are collected from a results page
+HARVEST_MODES = ('batch', 'scroll')
+
+
+class SiteSpecError(ValueError):
+    '''
+    Raised when a site configuration file cannot be compiled into a SiteSpec
+    '''
+    pass
+
+
+class SiteSpec:
+    '''
+    A site configuration file compiled once into the values the scraper engine uses
+
+    The nested dictionaries of the configuration file are looked up and validated
+    when the scraper is created, so the harvest and extraction loops read plain
+    attributes instead of walking scraper_config on every job card.
+
+    The spec is read from the layout the configuration files already use:
+
+        base_config                 job_titles, output_file_name, output_format, number_of_pages, next_page_xpath,
+                                    cookies_path, popup_path, browser_tabs, search_url and pagination
+        base_config.site_spec       optional overrides for the engine, see SPEC_KEYS
+        jobs.*.interact_with_searchbar*   the search bar, in any section of jobs
+        jobs.*.click_button*        buttons clicked after searching i.e. filters, in the order they appear
+        jobs.*.next_page_xpath      used when base_config has no next_page_xpath
+        jobs.start_extraction.extract_data   the job card and detail page XPaths
+        jobs.dismiss_element        the shadow root cookie banner i.e. CV-Library's
+
+    '''
+    # The keys of base_config.site_spec, which take precedence over the rest of the file
+    SPEC_KEYS = ('name', 'harvest_mode', 'text_attribute', 'cookie_banner', 'search_bar_xpath', 'search_button_xpath', 'click_buttons', 'next_page_xpath', 'popup_path')
+
+    def __init__(self, name : str, base_url : str, extract_data : dict, job_titles : list, output_file_name : str, number_of_pages : int = None, search_bar_xpath : str = None, search_button_xpath : str = None, click_buttons : list = None, next_page_xpath : str = None, popup_path : str = None, cookie_banner : dict = None, harvest_mode : str = 'batch', text_attribute : str = 'textContent', browser_tabs : int = 1, has_search_url : bool = False):
+        """
+        Parameters
+        ----------
+        name : str
+            The name of the site, stored as the website_name of each record unless extract_data sets one
+
+        base_url : str
+            The landing page of the site
+
+        extract_data : dict
+            The extract_data dictionary, with the main_container and job_url XPaths of the results
+            pages and the XPath of each field on the job detail pages
+
+        job_titles : list
+            The job titles searched on the site
+
+        output_file_name : str
+            The CSV or Parquet file the records are exported to, with the extension of base_config.output_format
+
+        number_of_pages : int, optional
+            The number of results pages walked for each job title. Defaults to None, every page
+
+        search_bar_xpath : str, optional
+            The search bar on the landing page. Required unless the site has a search_url template
+
+        search_button_xpath : str, optional
+            The button which submits the search, the return key is pressed if it is not set
+
+        click_buttons : list, optional
+            The XPaths of the buttons clicked after searching i.e. a date posted filter
+
+        next_page_xpath : str, optional
+            The next page button of the results. Without it only the first page is harvested
+
+        popup_path : str, optional
+            A pop-up dismissed after landing and after searching
+
+        cookie_banner : dict, optional
+            How the cookie banner is dismissed, a dictionary with a hook key naming the
+            SiteScraper hook and the values it needs, i.e. {'hook': 'click', 'xpath': ...}
+
+        harvest_mode : str, optional
+            'batch' reads every job url on a results page in one script call,
+            'scroll' scrolls each job card into view for sites which load them lazily. Defaults to 'batch'
+
+        text_attribute : str, optional
+            The attribute read from the detail page fields, textContent or innerText. Defaults to 'textContent'
+
+        browser_tabs : int, optional
+            The number of detail pages loaded at once. Defaults to 1
+
+        has_search_url : bool, optional
+            Whether the site's results pages can be opened directly from base_config.search_url
+        """
+        self.name = name
+        self.base_url = base_url
+        self.extract_data = extract_data
+        self.main_container = extract_data.get('main_container')
+        self.job_url = extract_data.get('job_url')
+        self.page_fields = self.select_page_fields(extract_data)
+        self.job_titles = job_titles
+        self.output_file_name = output_file_name
+        self.number_of_pages = number_of_pages
+        self.search_bar_xpath = search_bar_xpath
+        self.search_button_xpath = search_button_xpath
+        self.click_buttons = click_buttons or []
+        self.next_page_xpath = next_page_xpath
+        self.popup_path = popup_path
+        self.cookie_banner = cookie_banner
+        self.harvest_mode = harvest_mode
+        self.text_attribute = text_attribute
+        self.browser_tabs = browser_tabs
+        self.has_search_url = has_search_url
+        self.validate()
+
+    @classmethod
+    def from_config(cls, scraper_config : dict, base_url : str, defaults : dict = None):
+        '''
+        Compiles a site configuration file into a SiteSpec
+
+        Parameters
+        ----------
+        scraper_config : dict
+            A dictionary representing the configuration file for the website
+
+        base_url : str
+            The landing page of the site
+
+        defaults : dict, optional
+            Values for the SPEC_KEYS used when the configuration file does not set them,
+            i.e. {'harvest_mode': 'scroll'} from a site's scraper class
+
+        Returns
+        -------
+            spec : SiteSpec
+                Raises a SiteSpecError naming every missing or invalid setting
+        '''
+        if 'base_config' not in scraper_config or 'jobs' not in scraper_config:
+            raise SiteSpecError(f"The configuration file for {base_url} needs a base_config and a jobs section")
+
+        base_config = scraper_config['base_config']
+        jobs = scraper_config['jobs']
+        overrides = {**(defaults or {}), **base_config.get('site_spec', {})}
+        unknown_keys = set(overrides) - set(cls.SPEC_KEYS)
+        if unknown_keys:
+            raise SiteSpecError(f"Invalid site_spec settings {sorted(unknown_keys)} for {base_url}, only {list(cls.SPEC_KEYS)} are valid")
+
+        try:
+            output_file_name = RecordSink.get_output_file_name(base_config) if base_config.get('output_file_name') else None
+        except ValueError as e:
+            raise SiteSpecError(f"{e} for {base_url}") from e
+
+        extract_data = jobs.get('start_extraction', {}).get('extract_data')
+        if not isinstance(extract_data, dict):
+            raise SiteSpecError(f"The configuration file for {base_url} has no jobs.start_extraction.extract_data section")
+
+        # Walk the action sections in the order they are written, as the scrapers always have
+        search_bar_xpath = None
+        click_buttons = []
+        next_page_xpath = base_config.get('next_page_xpath')
+        for section in jobs.values():
+            if not isinstance(section, dict):
+                continue
+            for key, value in section.items():
+                if 'interact_with_searchbar' in key and search_bar_xpath is None:
+                    search_bar_xpath = value
+                elif 'click_button' in key:
+                    click_buttons.append(value)
+                elif key == 'next_page_xpath' and next_page_xpath is None:
+                    next_page_xpath = value
+
+        return cls(
+            name=overrides.get('name') or extract_data.get('website_name') or urlparse(base_url).netloc,
+            base_url=base_url,
+            extract_data=extract_data,
+            job_titles=base_config.get('job_titles'),
+            output_file_name=output_file_name,
+            number_of_pages=base_config.get('number_of_pages'),
+            search_bar_xpath=overrides.get('search_bar_xpath', search_bar_xpath),
+            search_button_xpath=overrides.get('search_button_xpath'),
+            click_buttons=overrides.get('click_buttons', click_buttons),
+            next_page_xpath=overrides.get('next_page_xpath', next_page_xpath),
+            popup_path=overrides.get('popup_path', base_config.get('popup_path')),
+            cookie_banner=overrides.get('cookie_banner', cls.find_cookie_banner(scraper_config)),
+            harvest_mode=overrides.get('harvest_mode', 'batch'),
+            text_attribute=overrides.get('text_attribute', 'textContent'),
+            browser_tabs=base_config.get('browser_tabs', 1),
+            has_search_url=bool(base_config.get('search_url'))
+        )
+
+    @staticmethod
+    def find_cookie_banner(scraper_config : dict):
+        '''
+        Works out the cookie banner hook from the settings the configuration files already use
+
+        Returns
+        -------
+            cookie_banner : dict
+                {'hook': 'shadow_root', ...} when jobs.dismiss_element has a shadow_root_script,
+                {'hook': 'click', ...} when base_config has a cookies_path, otherwise None
+        '''
+        dismiss_element = scraper_config['jobs'].get('dismiss_element', {})
+        if 'shadow_root_script' in dismiss_element:
+            return {
+                'hook': 'shadow_root',
+                'container_selector': dismiss_element.get('accept_cookies_container'),
+                'script': dismiss_element['shadow_root_script']
+            }
+        cookies_path = scraper_config['base_config'].get('cookies_path')
+        if cookies_path:
+            return {'hook': 'click', 'xpath': cookies_path}
+        return None
+
+    @staticmethod
+    def select_page_fields(extract_data : dict):
+        '''
+        Selects the fields of an extract_data dictionary which are XPaths evaluated against the detail page
+
+        The main container, url, website name and date fields are filled in by the scraper instead.
+        '''
+        return {
+            key: value for key, value in extract_data.items()
+            if key != 'main_container' and 'url' not in key and key != 'website_name' and 'date' not in key
+        }
+
+    def validate(self):
+        '''
+        Checks the spec describes a site the engine can scrape
+
+        Raises
+        ------
+            SiteSpecError listing every problem found
+        '''
+        problems = []
+        if not self.main_container:
+            problems.append('extract_data has no main_container XPath for the job cards')
+        if not self.job_url:
+            problems.append('extract_data has no job_url XPath')
+        if not self.page_fields:
+            problems.append('extract_data has no detail page fields')
+        if not isinstance(self.job_titles, list) or not self.job_titles:
+            problems.append('base_config.job_titles must be a non-empty list')
+        if not self.output_file_name:
+            problems.append('base_config.output_file_name is not set')
+        if not self.search_bar_xpath and not self.has_search_url:
+            problems.append('there is no search bar XPath and no base_config.search_url template')
+        if self.harvest_mode not in HARVEST_MODES:
+            problems.append(f'harvest_mode {self.harvest_mode} is not one of {list(HARVEST_MODES)}')
+        if self.text_attribute not in ('textContent', 'innerText'):
+            problems.append(f'text_attribute {self.text_attribute} is not textContent or innerText')
+        if self.cookie_banner is not None and 'hook' not in self.cookie_banner:
+            problems.append('cookie_banner needs a hook i.e. click or shadow_root')
+        if problems:
+            raise SiteSpecError(f"Invalid site configuration for {self.base_url}: " + '; '.join(problems))
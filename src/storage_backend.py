@@ -0,0 +1,408 @@
+from abc import ABC, abstractmethod
+from collections import deque
+from concurrent.futures import ThreadPoolExecutor
+from datetime import datetime, timezone
+from hashlib import md5
+from io import BytesIO
+from threading import Lock
+from urllib.parse import urlparse
+import os
+import shutil
+
+
+class StorageBackend(ABC):
+    '''
+    The object store the output files are uploaded to and loaded from
+
+    Objects are addressed by S3 style keys, the site and date partitions of upload_to_s3
+    i.e. indeed/2024/10/19/indeed_jobs.csv, and are returned in the shape of the boto3
+    responses so DataFrameManipulation and the ingestion manifest work with any backend.
+
+    A backend implements three abstract methods:
+
+        iter_object_summaries   the list_objects_v2 entries under a prefix, in key order
+        open_object             a get_object response with a Key and a readable Body
+        upload_file             copies a local file to a key
+
+    and inherits the listing, concurrent download and upload helpers built on them.
+
+    The backends are S3DataProcessing for the S3 bucket, LocalStorageBackend for a
+    directory on disk and InMemoryStorageBackend for a dictionary, see from_url.
+
+    '''
+    def __init__(self, bucket_name : str, max_workers : int = 16):
+        """
+        Parameters
+        ----------
+        bucket_name (str):
+            The name of the bucket, or the directory of a local backend
+        max_workers (int, optional):
+            The number of objects downloaded at once. Defaults to 16
+        """
+        self.bucket_name = bucket_name
+        self.max_workers = max_workers
+        self.list_of_objects = []
+
+    @staticmethod
+    def from_url(storage_url : str, **kwargs):
+        '''
+        Creates the StorageBackend for a storage url
+
+        Parameters
+        ----------
+        storage_url : str
+            s3://job-scraper-data-bucket for an S3 bucket, file:///path/to/directory or a plain
+            directory path for a local directory, memory:// for a dictionary held in memory
+
+        Returns
+        -------
+            storage_backend : StorageBackend
+                A S3DataProcessing, LocalStorageBackend or InMemoryStorageBackend
+        '''
+        parsed_url = urlparse(storage_url)
+        if parsed_url.scheme == 's3':
+            from src.data_processing import S3DataProcessing
+            return S3DataProcessing(parsed_url.netloc, **kwargs)
+        elif parsed_url.scheme == 'file':
+            return LocalStorageBackend(parsed_url.netloc + parsed_url.path, **kwargs)
+        elif parsed_url.scheme == 'memory':
+            return InMemoryStorageBackend(parsed_url.netloc or 'memory', **kwargs)
+        elif parsed_url.scheme == '':
+            return LocalStorageBackend(storage_url, **kwargs)
+        raise ValueError(f'Invalid storage url only s3://, file:// and memory:// are valid, not {storage_url}')
+
+    @staticmethod
+    def get_extensions(file_type=None):
+        '''
+        Turns a file_type i.e. 'csv' or ('csv', 'parquet') into the key endings it matches, None matches every key
+        '''
+        file_types = (file_type,) if isinstance(file_type, str) else file_type
+        return None if file_types is None else tuple(f".{extension}" for extension in file_types)
+
+    @abstractmethod
+    def iter_object_summaries(self, file_directory : str, file_type : str = None, start_after : str = None):
+        """
+        Yields the listing entry of every object under a prefix
+
+        Parameters
+        ----------
+        file_directory (str):
+            The prefix of the keys i.e. 'indeed/'
+        file_type (str or tuple, optional):
+            Only yield objects whose key ends in this extension, or one of these. Defaults to None, every object
+        start_after (str, optional):
+            Only list the keys which sort after this one i.e. 'indeed/2024/10/19/'. Defaults to None, every key
+
+        Yields
+        ------
+        s3_object (dict):
+            The list_objects_v2 entry of each object, with its Key, ETag, Size and LastModified, in key order
+        """
+
+    @abstractmethod
+    def open_object(self, key : str):
+        """
+        Opens a single object without reading it
+
+        Returns
+        -------
+        s3_object (dict):
+            A get_object response with its Key and a Body to read the object from
+        """
+
+    @abstractmethod
+    def upload_file(self, file_name : str, object_name : str):
+        """
+        Copies a local file to a key, raising an exception if it fails
+        """
+
+    def iter_keys(self, file_directory : str, file_type : str = None):
+        """
+        Yields every key under a prefix
+
+        Parameters
+        ----------
+        file_directory (str):
+            The file path to the file directory in the bucket
+        file_type (str or tuple, optional):
+            Only yield keys ending in this extension i.e. 'csv', or one of these i.e. ('csv', 'parquet').
+            Defaults to None, every key
+
+        Yields
+        ------
+        key (str):
+            The key of each object, in key order
+        """
+        for s3_object in self.iter_object_summaries(file_directory, file_type):
+            yield s3_object['Key']
+
+    def list_objects(self, file_directory : str):
+        """
+        Lists every object under a prefix
+
+        Parameters
+        ----------
+        file_directory (str):
+            The file path to the file directory in the bucket
+
+        Returns
+        -------
+        s3_response  (dict):
+            A dictionary shaped like a list_objects_v2 response,
+            with the Contents of every page and their KeyCount
+        """
+        contents = list(self.iter_object_summaries(file_directory))
+        print(f"Listed {len(contents)} objects under {file_directory}")
+
+        return {'Name': self.bucket_name, 'Prefix': file_directory, 'Contents': contents, 'KeyCount': len(contents)}
+
+    def fetch_object(self, key : str):
+        """
+        Downloads a single object, reading its body inside the calling thread
+
+        Parameters
+        ----------
+        key (str):
+            The key of the object
+
+        Returns
+        -------
+        s3_object (dict):
+            The get_object response with its Key, and its Body replaced by an in-memory
+            file holding the downloaded bytes, so s3_object['Body'].read() still works
+        """
+        s3_object = self.open_object(key)
+        body = s3_object['Body']
+        try:
+            # BytesIO shares the downloaded bytes rather than copying them
+            s3_object['Body'] = BytesIO(body.read())
+        finally:
+            body.close()
+        return s3_object
+
+    def iter_objects(self, keys, max_workers : int = None):
+        """
+        Downloads objects concurrently through a bounded thread pool, yielding them in the order of the keys
+
+        At most twice max_workers objects are held at once, however many keys there are.
+        A failed download raises its exception instead of being skipped.
+
+        Parameters
+        ----------
+        keys (iterable):
+            The keys to download, i.e. from iter_keys
+        max_workers (int, optional):
+            Overrides the number of objects downloaded at once
+
+        Yields
+        ------
+        s3_object (dict):
+            Each object, see fetch_object
+        """
+        max_workers = max_workers or self.max_workers
+        pending_downloads = deque()
+        with ThreadPoolExecutor(max_workers=max_workers, thread_name_prefix='storage-download') as executor:
+            try:
+                for key in keys:
+                    pending_downloads.append(executor.submit(self.fetch_object, key))
+                    if len(pending_downloads) >= max_workers * 2:
+                        yield pending_downloads.popleft().result()
+                while pending_downloads:
+                    yield pending_downloads.popleft().result()
+            finally:
+                # Stop the queued downloads if the caller stops early or a download failed
+                for download in pending_downloads:
+                    download.cancel()
+
+    def read_objects_from_s3(self, s3_response : dict, file_type : str):
+        '''
+        Method to read in objects from the bucket based on a specified file type.
+
+        Parameters
+        ----------
+        s3_response : dict
+            A dictionary containing information
+        about objects stored within the bucket, see list_objects
+        file_type : str
+            The type of file to look for within the bucket.
+
+        Returns
+        -------
+        s3_objects : list
+            every object retrieved from the bucket that matches
+            the specified file type, downloaded concurrently, see fetch_object.
+
+        '''
+        keys = [s3_object['Key'] for s3_object in s3_response.get('Contents', []) if s3_object['Key'].endswith(f".{file_type}")]
+        s3_objects = list(self.iter_objects(keys))
+        print(f"Read {len(s3_objects)} .{file_type} objects from {self.bucket_name}")
+        self.list_of_objects.extend(s3_objects)
+        return s3_objects
+
+    def upload_file_to_s3(self, file_name : str, object_name : str, folder : str):
+        '''
+        Method to upload a file to the bucket with error handling.
+
+        Parameters
+        ----------
+        file_name : str
+            A string that specifies the full path to the file
+            on your local system.
+        object_name : str
+            A string representing the key or path under which the file will be stored in the bucket.
+        folder : str
+            A string which represents the folder within the
+            bucket where you want to upload the file.
+
+        Returns
+        -------
+            uploaded : bool
+                Whether the file was uploaded
+
+        '''
+        try:
+            self.upload_file(file_name, object_name)
+            print(f"Uploaded {file_name} to {self.bucket_name} in folder {folder}.")
+            return True
+        except Exception as e:
+            print(f"Failed to upload {file_name} to {self.bucket_name}: {e}")
+            return False
+
+
+class LocalStorageBackend(StorageBackend):
+    '''
+    A StorageBackend in a local directory, for running the pipeline offline or staging the output files
+
+    Each key is a file path under the directory, so the site and year/month/day
+    partitions of the bucket become sub directories. The ETag is the MD5 of the
+    file quoted, as S3 sets it for a file uploaded in one part.
+
+    '''
+    def __init__(self, root_directory : str, max_workers : int = 16):
+        """
+        Parameters
+        ----------
+        root_directory (str):
+            The directory holding the objects, created if it does not exist
+        max_workers (int, optional):
+            The number of objects read at once. Defaults to 16
+        """
+        super().__init__(os.path.abspath(root_directory), max_workers)
+        os.makedirs(self.bucket_name, exist_ok=True)
+
+    def get_file_path(self, key : str):
+        '''
+        Returns the file path of a key, refusing keys which point outside the directory
+        '''
+        file_path = os.path.abspath(os.path.join(self.bucket_name, *key.split('/')))
+        if os.path.commonpath([self.bucket_name, file_path]) != self.bucket_name:
+            raise ValueError(f'Invalid key {key} is outside of {self.bucket_name}')
+        return file_path
+
+    def iter_object_summaries(self, file_directory : str, file_type : str = None, start_after : str = None):
+        extensions = self.get_extensions(file_type)
+        # Only walk the directory the prefix points into, the rest of the prefix is matched against the keys
+        walk_directory = self.get_file_path(file_directory.rsplit('/', 1)[0]) if '/' in file_directory else self.bucket_name
+        keys = []
+        for directory, _, file_names in os.walk(walk_directory):
+            relative_directory = os.path.relpath(directory, self.bucket_name).replace(os.sep, '/')
+            for file_name in file_names:
+                key = file_name if relative_directory == '.' else f'{relative_directory}/{file_name}'
+                if key.startswith(file_directory) and (start_after is None or key > start_after) and (extensions is None or key.endswith(extensions)):
+                    keys.append(key)
+        for key in sorted(keys):
+            yield self.summarise_file(key)
+
+    def summarise_file(self, key : str):
+        '''
+        Builds the list_objects_v2 entry of a file
+        '''
+        file_path = self.get_file_path(key)
+        file_hash = md5()
+        with open(file_path, 'rb') as file:
+            for block in iter(lambda: file.read(1024 * 1024), b''):
+                file_hash.update(block)
+        file_stat = os.stat(file_path)
+        return {
+            'Key': key,
+            'ETag': f'"{file_hash.hexdigest()}"',
+            'Size': file_stat.st_size,
+            'LastModified': datetime.fromtimestamp(file_stat.st_mtime, tz=timezone.utc)
+        }
+
+    def open_object(self, key : str):
+        file_path = self.get_file_path(key)
+        if not os.path.isfile(file_path):
+            raise FileNotFoundError(f'No object {key} in {self.bucket_name}')
+        file_stat = os.stat(file_path)
+        return {
+            'Key': key,
+            'Body': open(file_path, 'rb'),
+            'ContentLength': file_stat.st_size,
+            'LastModified': datetime.fromtimestamp(file_stat.st_mtime, tz=timezone.utc)
+        }
+
+    def upload_file(self, file_name : str, object_name : str):
+        file_path = self.get_file_path(object_name)
+        os.makedirs(os.path.dirname(file_path), exist_ok=True)
+        # Copy next to the target then rename, so a reader never sees half a file
+        temporary_path = f'{file_path}.{os.getpid()}.tmp'
+        shutil.copyfile(file_name, temporary_path)
+        os.replace(temporary_path, file_path)
+
+
+class InMemoryStorageBackend(StorageBackend):
+    '''
+    A StorageBackend in a dictionary, for tests and benchmarks which should not touch the disk or network
+
+    The objects are lost when the backend is garbage collected.
+
+    '''
+    def __init__(self, bucket_name : str = 'memory', max_workers : int = 16):
+        """
+        Parameters
+        ----------
+        bucket_name (str, optional):
+            A name for the backend, used in its log messages. Defaults to 'memory'
+        max_workers (int, optional):
+            The number of objects read at once. Defaults to 16
+        """
+        super().__init__(bucket_name, max_workers)
+        self.objects = {}
+        self.objects_lock = Lock()
+
+    def put_object(self, key : str, body : bytes):
+        '''
+        Stores the bytes of an object under a key, replacing any object already there
+        '''
+        with self.objects_lock:
+            self.objects[key] = {
+                'Body': bytes(body),
+                'ETag': f'"{md5(body).hexdigest()}"',
+                'LastModified': datetime.now(timezone.utc)
+            }
+
+    def iter_object_summaries(self, file_directory : str, file_type : str = None, start_after : str = None):
+        extensions = self.get_extensions(file_type)
+        with self.objects_lock:
+            objects = sorted(self.objects.items())
+        for key, stored_object in objects:
+            if key.startswith(file_directory) and (start_after is None or key > start_after) and (extensions is None or key.endswith(extensions)):
+                yield {'Key': key, 'ETag': stored_object['ETag'], 'Size': len(stored_object['Body']), 'LastModified': stored_object['LastModified']}
+
+    def open_object(self, key : str):
+        with self.objects_lock:
+            if key not in self.objects:
+                raise KeyError(f'No object {key} in {self.bucket_name}')
+            stored_object = self.objects[key]
+        return {
+            'Key': key,
+            'Body': BytesIO(stored_object['Body']),
+            'ContentLength': len(stored_object['Body']),
+            'ETag': stored_object['ETag'],
+            'LastModified': stored_object['LastModified']
+        }
+
+    def upload_file(self, file_name : str, object_name : str):
+        with open(file_name, 'rb') as file:
+            self.put_object(object_name, file.read())
@@ -0,0 +1,463 @@
+from abc import ABC, abstractmethod
+from sqlalchemy import create_engine, text
+from sqlalchemy.engine import Engine
+from time import sleep, time
+import socket
+import os
+import uuid
+
+
+class LeaseExpiredError(Exception):
+    '''
+    Raised when a worker's lease on a task expired and the task may have been leased by another worker
+    '''
+    pass
+
+
+class TaskQueue(ABC):
+    '''
+    A durable queue of crawl tasks with lease/ack semantics
+
+    The crawl is split into two kinds of task:
+
+        search_page     open results page page_index of job_title on site
+        job_detail      fetch the job detail page at url on site
+
+    Each task has a dedupe_key, so publishing the same work twice is a no-op.
+    A worker leases a task for lease_seconds. It then acks it, or fails it so
+    it is retried. A lease which expires, because its worker died, makes the
+    task available to other workers again. Use PostgresTaskQueue to share tasks
+    between nodes and SQLiteTaskQueue on a single machine or in tests, or let
+    from_url/from_engine pick one for the database.
+
+    '''
+    def __init__(self, engine : Engine, table_name : str = 'scrape_tasks', lease_seconds : float = 600, max_attempts : int = 3):
+        """
+        Parameters
+        ----------
+        engine : Engine
+            A sqlalchemy Engine object pointing to the database holding the queue
+
+        table_name : str, optional
+            The table the tasks are stored in. Defaults to 'scrape_tasks'
+
+        lease_seconds : float, optional
+            The number of seconds a worker holds a task before it can be leased again. Defaults to 600
+
+        max_attempts : int, optional
+            The number of leases after which a failing task is given up on. Defaults to 3
+        """
+        self.engine = engine
+        self.table_name = table_name
+        self.lease_seconds = lease_seconds
+        self.max_attempts = max_attempts
+        self.create_table()
+
+    @staticmethod
+    def from_url(queue_url : str, **kwargs):
+        '''
+        Creates the TaskQueue for a database url i.e. sqlite:///task_queue.db or postgresql+psycopg2://...
+
+        Returns
+        -------
+            task_queue : TaskQueue
+                A PostgresTaskQueue or SQLiteTaskQueue depending on the database
+        '''
+        return TaskQueue.from_engine(create_engine(queue_url), **kwargs)
+
+    @staticmethod
+    def from_engine(engine : Engine, **kwargs):
+        '''
+        Creates the TaskQueue for an existing sqlalchemy Engine
+        '''
+        if engine.dialect.name == 'postgresql':
+            return PostgresTaskQueue(engine, **kwargs)
+        elif engine.dialect.name == 'sqlite':
+            return SQLiteTaskQueue(engine, **kwargs)
+        raise ValueError(f'Invalid database only postgresql and sqlite are valid, not {engine.dialect.name}')
+
+    @staticmethod
+    def search_page_task(site : str, job_title : str, page_index : int):
+        '''
+        Describes opening one results page of a job title
+        '''
+        return {
+            'task_type': 'search_page',
+            'site': site,
+            'job_title': job_title,
+            'page_index': page_index,
+            'url': None,
+            'dedupe_key': f'search_page:{site}:{job_title}:{page_index}'
+        }
+
+    @staticmethod
+    def job_detail_task(site : str, url : str, job_title : str = None):
+        '''
+        Describes fetching one job detail page
+        '''
+        return {
+            'task_type': 'job_detail',
+            'site': site,
+            'job_title': job_title,
+            'page_index': None,
+            'url': url,
+            'dedupe_key': f"job_detail:{site}:{url.split('#', 1)[0].rstrip('/')}"
+        }
+
+    @abstractmethod
+    def id_column_definition(self):
+        '''
+        Returns the type of the auto incrementing id column in this database
+        '''
+
+    @abstractmethod
+    def lease_statement(self):
+        '''
+        Returns the UPDATE ... RETURNING statement leasing the oldest available task, formatted with table_name and available
+        '''
+
+    def create_table(self):
+        '''
+        Creates the task table if it does not exist
+        '''
+        with self.engine.begin() as connection:
+            connection.execute(text(f"""
+                CREATE TABLE IF NOT EXISTS {self.table_name} (
+                    id {self.id_column_definition()},
+                    task_type VARCHAR(32) NOT NULL,
+                    site VARCHAR(64) NOT NULL,
+                    job_title TEXT,
+                    page_index INTEGER,
+                    url TEXT,
+                    dedupe_key TEXT NOT NULL UNIQUE,
+                    status VARCHAR(16) NOT NULL DEFAULT 'pending',
+                    attempts INTEGER NOT NULL DEFAULT 0,
+                    leased_by TEXT,
+                    lease_token TEXT,
+                    lease_expires_at DOUBLE PRECISION,
+                    last_error TEXT,
+                    created_at DOUBLE PRECISION NOT NULL
+                )
+            """))
+            connection.execute(text(
+                f"CREATE INDEX IF NOT EXISTS {self.table_name}_status_idx ON {self.table_name} (status, lease_expires_at)"
+            ))
+
+    def publish(self, list_of_tasks : list):
+        '''
+        Adds tasks to the queue, skipping any whose dedupe_key was published before
+
+        Parameters
+        ----------
+        list_of_tasks : list
+            A list of dictionaries made by search_page_task or job_detail_task
+
+        Returns
+        -------
+            number_of_tasks : int
+                The number of new tasks added
+        '''
+        if not list_of_tasks:
+            return 0
+        created_at = time()
+        with self.engine.begin() as connection:
+            result = connection.execute(text(f"""
+                INSERT INTO {self.table_name} (task_type, site, job_title, page_index, url, dedupe_key, created_at)
+                VALUES (:task_type, :site, :job_title, :page_index, :url, :dedupe_key, :created_at)
+                ON CONFLICT (dedupe_key) DO NOTHING
+            """), [{**task, 'created_at': created_at} for task in list_of_tasks])
+        return max(result.rowcount, 0)
+
+    def lease(self, worker_id : str, task_types : list = None, sites : list = None, lease_seconds : float = None):
+        '''
+        Leases the oldest available task
+
+        A task is available if it is pending, or if its lease expired before it was acked.
+        A task whose lease expired on its last attempt is marked failed, so the queue still drains.
+
+        Parameters
+        ----------
+        worker_id : str
+            The name of the worker taking the task, stored for debugging
+
+        task_types : list, optional
+            Only lease these task types i.e. ['job_detail']. Defaults to None, any task type
+
+        sites : list, optional
+            Only lease tasks for these sites i.e. ['indeed', 'reed']. Defaults to None, any site
+
+        lease_seconds : float, optional
+            How long the task is held for. Defaults to self.lease_seconds
+
+        Returns
+        -------
+            task : dict
+                The leased task including its id and lease_token, None if no task is available
+        '''
+        task_types = task_types or ['search_page', 'job_detail']
+        now = time()
+        parameters = {
+            'worker_id': worker_id,
+            'lease_token': uuid.uuid4().hex,
+            'now': now,
+            'lease_expires_at': now + (lease_seconds or self.lease_seconds),
+            'max_attempts': self.max_attempts
+        }
+        type_placeholders = ', '.join(f':task_type_{index}' for index in range(len(task_types)))
+        parameters.update({f'task_type_{index}': task_type for index, task_type in enumerate(task_types)})
+        site_condition = ''
+        if sites:
+            site_condition = 'AND site IN ({})'.format(', '.join(f':site_{index}' for index in range(len(sites))))
+            parameters.update({f'site_{index}': site for index, site in enumerate(sites)})
+
+        with self.engine.begin() as connection:
+            self.fail_expired_leases(connection, now)
+            row = connection.execute(text(self.lease_statement().format(
+                table_name=self.table_name,
+                available=f"""
+                    task_type IN ({type_placeholders}) {site_condition}
+                    AND attempts < :max_attempts
+                    AND (status = 'pending' OR (status = 'leased' AND lease_expires_at < :now))
+                """
+            )), parameters).mappings().first()
+        return dict(row) if row is not None else None
+
+    def fail_expired_leases(self, connection, now : float):
+        '''
+        Gives up on the tasks whose lease expired on their last attempt, which fail() was never called for
+        '''
+        connection.execute(text(f"""
+            UPDATE {self.table_name}
+            SET status = 'failed', lease_expires_at = NULL,
+                last_error = COALESCE(last_error, 'The lease expired on the last attempt')
+            WHERE status = 'leased' AND lease_expires_at < :now AND attempts >= :max_attempts
+        """), {'now': now, 'max_attempts': self.max_attempts})
+
+    def extend_lease(self, task : dict, lease_seconds : float = None):
+        '''
+        Extends the lease of a task which is taking longer than expected
+
+        Returns
+        -------
+            bool
+                False if the lease has already expired and been taken by another worker
+        '''
+        with self.engine.begin() as connection:
+            result = connection.execute(text(f"""
+                UPDATE {self.table_name} SET lease_expires_at = :lease_expires_at
+                WHERE id = :id AND lease_token = :lease_token AND status = 'leased'
+            """), {'id': task['id'], 'lease_token': task['lease_token'], 'lease_expires_at': time() + (lease_seconds or self.lease_seconds)})
+        return result.rowcount == 1
+
+    def ack(self, task : dict):
+        '''
+        Marks a leased task as done
+
+        Returns
+        -------
+            bool
+                False if the lease expired and the task was leased by another worker
+        '''
+        with self.engine.begin() as connection:
+            result = connection.execute(text(f"""
+                UPDATE {self.table_name} SET status = 'done', lease_expires_at = NULL
+                WHERE id = :id AND lease_token = :lease_token AND status = 'leased'
+            """), {'id': task['id'], 'lease_token': task['lease_token']})
+        return result.rowcount == 1
+
+    def fail(self, task : dict, error : str):
+        '''
+        Returns a leased task to the queue, or gives up on it after max_attempts
+
+        Parameters
+        ----------
+        task : dict
+            The leased task
+
+        error : str
+            A description of what went wrong, stored on the task
+        '''
+        with self.engine.begin() as connection:
+            connection.execute(text(f"""
+                UPDATE {self.table_name}
+                SET status = CASE WHEN attempts >= :max_attempts THEN 'failed' ELSE 'pending' END,
+                    lease_expires_at = NULL, last_error = :error
+                WHERE id = :id AND lease_token = :lease_token AND status = 'leased'
+            """), {'id': task['id'], 'lease_token': task['lease_token'], 'max_attempts': self.max_attempts, 'error': error})
+
+    def counts(self):
+        '''
+        Counts the tasks in each status
+
+        Returns
+        -------
+            counts : dict
+                A dictionary mapping each status to its number of tasks i.e. {'pending': 10, 'done': 5}
+        '''
+        with self.engine.connect() as connection:
+            rows = connection.execute(text(f"SELECT status, COUNT(*) FROM {self.table_name} GROUP BY status")).fetchall()
+        return {status: count for status, count in rows}
+
+
+class PostgresTaskQueue(TaskQueue):
+    '''
+    A TaskQueue in Postgres, shared by workers on any node
+
+    Leasing uses SELECT ... FOR UPDATE SKIP LOCKED, so concurrent workers
+    never wait on or take the same task.
+
+    '''
+    def id_column_definition(self):
+        return 'BIGSERIAL PRIMARY KEY'
+
+    def lease_statement(self):
+        return """
+            UPDATE {table_name}
+            SET status = 'leased', attempts = attempts + 1, leased_by = :worker_id,
+                lease_token = :lease_token, lease_expires_at = :lease_expires_at
+            WHERE id = (
+                SELECT id FROM {table_name}
+                WHERE {available}
+                ORDER BY id
+                LIMIT 1
+                FOR UPDATE SKIP LOCKED
+            )
+            RETURNING *
+        """
+
+
+class SQLiteTaskQueue(TaskQueue):
+    '''
+    A TaskQueue in a local SQLite file, for a single machine or for tests
+
+    SQLite runs one write at a time, so leasing with a single UPDATE
+    statement cannot hand the same task to two workers.
+
+    '''
+    def id_column_definition(self):
+        return 'INTEGER PRIMARY KEY AUTOINCREMENT'
+
+    def lease_statement(self):
+        return """
+            UPDATE {table_name}
+            SET status = 'leased', attempts = attempts + 1, leased_by = :worker_id,
+                lease_token = :lease_token, lease_expires_at = :lease_expires_at
+            WHERE id = (
+                SELECT id FROM {table_name}
+                WHERE {available}
+                ORDER BY id
+                LIMIT 1
+            )
+            RETURNING *
+        """
+
+
+class TaskWorker:
+    '''
+    A class to pull crawl tasks from a TaskQueue and run them with the site scrapers
+
+    Search page tasks publish a job detail task for every unseen job url on the page.
+    Job detail tasks store their record with the scraper's record sink, which is
+    flushed before the task is acked, so an acked task is never lost. The lease is
+    extended before the record is stored, and the record is dropped if the lease
+    was lost, so a task re-run by another worker never writes a second record.
+
+    '''
+    def __init__(self, task_queue : TaskQueue, scrapers : dict, worker_id : str = None, idle_timeout : float = 60, poll_interval : float = 5):
+        """
+        Parameters
+        ----------
+        task_queue : TaskQueue
+            The queue to lease tasks from
+
+        scrapers : dict
+            A dictionary mapping each site name to its scraper i.e. {'indeed': IndeedScraper(...)}.
+            Only tasks for these sites are leased, skipping a site while its circuit breaker is open.
+
+        worker_id : str, optional
+            The name stored on leased tasks. Defaults to <hostname>-<pid>
+
+        idle_timeout : float, optional
+            The number of seconds without an available task after which the worker stops. Defaults to 60
+
+        poll_interval : float, optional
+            The number of seconds to wait before asking again when no task is available. Defaults to 5
+        """
+        self.task_queue = task_queue
+        self.scrapers = scrapers
+        self.worker_id = worker_id or f'{socket.gethostname()}-{os.getpid()}'
+        self.idle_timeout = idle_timeout
+        self.poll_interval = poll_interval
+        self.tasks_done = 0
+        self.tasks_failed = 0
+
+    def run(self):
+        '''
+        Runs tasks until none have been available for idle_timeout seconds
+
+        Returns
+        -------
+            tasks_done : int
+                The number of tasks this worker completed
+        '''
+        idle_since = time()
+        while time() - idle_since < self.idle_timeout:
+            # Leave the tasks of a paused site in the queue until its circuit breaker lets a trial through
+            available_sites = [site for site, scraper in self.scrapers.items() if not scraper.circuit_breaker.is_open]
+            task = self.task_queue.lease(self.worker_id, sites=available_sites) if available_sites else None
+            if task is None:
+                sleep(self.poll_interval)
+                continue
+
+            try:
+                self.run_task(task)
+            except LeaseExpiredError as e:
+                # Another worker owns the task now, it is neither acked nor failed here
+                print(e)
+            except Exception as e:
+                print(f"Task {task['id']} ({task['task_type']} on {task['site']}) failed: {e}")
+                self.task_queue.fail(task, repr(e))
+                self.tasks_failed += 1
+            else:
+                if self.task_queue.ack(task):
+                    self.tasks_done += 1
+                else:
+                    print(f"Lease on task {task['id']} expired before it was acked")
+            idle_since = time()
+
+        print(f"Worker {self.worker_id} stopping: {self.tasks_done} tasks done, {self.tasks_failed} failed")
+        return self.tasks_done
+
+    def run_task(self, task : dict):
+        '''
+        Runs a single leased task with its site's scraper
+
+        Parameters
+        ----------
+        task : dict
+            A task leased from the queue
+        '''
+        scraper = self.scrapers[task['site']]
+        extract_data = scraper.site_spec.extract_data
+        with scraper.checkout_driver():
+            if task['task_type'] == 'search_page':
+                if not scraper.get_search_url_config():
+                    raise ValueError(f"{task['site']} has no search_url template, its results pages cannot be opened directly")
+                page_urls = scraper.fetch_page(
+                    scraper.build_search_url(task['job_title'], task['page_index']),
+                    lambda url: scraper.collect_page_links(extract_data)
+                )
+                unseen_urls = scraper.filter_unseen_urls(page_urls)
+                next_tasks = [TaskQueue.job_detail_task(task['site'], url, task['job_title']) for url in unseen_urls]
+                # Only queue the next results page while this one had job cards and the results have not caught up with the seen urls
+                page_limit = scraper.get_page_limit(scraper.scraper_config['base_config'].get('number_of_pages'))
+                if page_urls and task['page_index'] + 1 < page_limit and not scraper.is_caught_up(page_urls, unseen_urls):
+                    next_tasks.append(TaskQueue.search_page_task(task['site'], task['job_title'], task['page_index'] + 1))
+                self.task_queue.publish(next_tasks)
+            elif task['task_type'] == 'job_detail':
+                record = scraper.fetch_job_detail(task['url'], extract_data, keep_record=lambda record: self.task_queue.extend_lease(task))
+                if record is None:
+                    raise LeaseExpiredError(f"Lease on task {task['id']} expired before its record was stored, dropping the record")
+                scraper.record_sink.flush()
+            else:
+                raise ValueError(f"Invalid task type {task['task_type']}")
@@ -0,0 +1,60 @@
+import json
+from src.browser_state import BrowserState
+
+
+class FakeDriver:
+    def __init__(self, cookies):
+        self.cookies = cookies
+        self.loaded_cookies = None
+
+    def execute_cdp_cmd(self, command, parameters):
+        if command == 'Network.getCookies':
+            return {'cookies': self.cookies}
+        self.loaded_cookies = parameters['cookies']
+        return {}
+
+
+CONSENT_COOKIE = {'name': 'OptanonAlertBoxClosed', 'value': '1', 'domain': '.indeed.com', 'path': '/', 'expires': -1}
+
+
+def make_state(tmp_path, **kwargs):
+    return BrowserState(str(tmp_path / 'uk.indeed.com.json'), 'https://uk.indeed.com/', **kwargs)
+
+
+def age_jar(browser_state, hours):
+    with open(browser_state.state_path, 'r', encoding='utf-8') as file:
+        state = json.load(file)
+    state['saved_at'] -= hours * 3600
+    with open(browser_state.state_path, 'w', encoding='utf-8') as file:
+        json.dump(state, file)
+
+
+def test_saved_consent_is_loaded(tmp_path):
+    browser_state = make_state(tmp_path, consent_cookies=['OptanonAlertBoxClosed'])
+    browser_state.save(FakeDriver([CONSENT_COOKIE]))
+    driver = FakeDriver([])
+    assert browser_state.load(driver)
+    assert driver.loaded_cookies == [{key: value for key, value in CONSENT_COOKIE.items() if key != 'expires'}]
+
+
+def test_jar_without_a_consent_cookie_is_ignored(tmp_path):
+    browser_state = make_state(tmp_path, consent_cookies=['OptanonAlertBoxClosed'])
+    browser_state.save(FakeDriver([{**CONSENT_COOKIE, 'name': 'session'}]))
+    assert browser_state.read_cookies() == []
+
+
+def test_refreshing_cookies_keeps_the_consent_age(tmp_path):
+    browser_state = make_state(tmp_path, max_age_hours=24)
+    browser_state.save(FakeDriver([CONSENT_COOKIE]))
+    age_jar(browser_state, 25)
+    # A driver checked in after a task refreshes the cookies, the consent is still 25 hours old
+    browser_state.save(FakeDriver([CONSENT_COOKIE]), new_consent=False)
+    assert browser_state.read_cookies() == []
+
+
+def test_accepting_the_banner_again_restarts_the_consent_age(tmp_path):
+    browser_state = make_state(tmp_path, max_age_hours=24)
+    browser_state.save(FakeDriver([CONSENT_COOKIE]))
+    age_jar(browser_state, 25)
+    browser_state.save(FakeDriver([CONSENT_COOKIE]))
+    assert browser_state.read_cookies() == [CONSENT_COOKIE]
@@ -0,0 +1,53 @@
+import os
+from src.checkpoint_store import CheckpointStore
+
+
+def test_resume_picks_up_every_checkpointed_step(tmp_path):
+    checkpoint_path = str(tmp_path / 'checkpoint.json')
+    checkpoint_store = CheckpointStore(checkpoint_path)
+    checkpoint_store.mark_page_complete('www.reed.co.uk', 'Data Engineer', 0, ['https://www.reed.co.uk/jobs/1'])
+    checkpoint_store.mark_harvest_complete('www.reed.co.uk', 'Data Engineer', ['https://www.reed.co.uk/jobs/1', 'https://www.reed.co.uk/jobs/2'])
+    checkpoint_store.mark_fetched('www.reed.co.uk', ['https://www.reed.co.uk/jobs/1'])
+    checkpoint_store.mark_title_complete('www.reed.co.uk', 'Data Analyst')
+
+    # The run was interrupted, the next one resumes from the file
+    resumed_store = CheckpointStore(checkpoint_path, resume=True)
+    assert resumed_store.resumed
+    assert resumed_store.is_page_complete('www.reed.co.uk', 'Data Engineer', 0)
+    assert not resumed_store.is_page_complete('www.reed.co.uk', 'Data Engineer', 1)
+    assert resumed_store.get_page_urls('www.reed.co.uk', 'Data Engineer', 0) == ['https://www.reed.co.uk/jobs/1']
+    assert resumed_store.get_harvested_urls('www.reed.co.uk', 'Data Engineer') == ['https://www.reed.co.uk/jobs/1', 'https://www.reed.co.uk/jobs/2']
+    assert resumed_store.filter_unfetched('www.reed.co.uk', resumed_store.get_harvested_urls('www.reed.co.uk', 'Data Engineer')) == ['https://www.reed.co.uk/jobs/2']
+    assert resumed_store.is_title_complete('www.reed.co.uk', 'Data Analyst')
+    assert not resumed_store.is_title_complete('www.reed.co.uk', 'Data Engineer')
+    assert resumed_store.get_harvested_urls('uk.indeed.com', 'Data Engineer') is None
+
+
+def test_without_resume_the_old_checkpoint_is_ignored(tmp_path):
+    checkpoint_path = str(tmp_path / 'checkpoint.json')
+    CheckpointStore(checkpoint_path).mark_fetched('www.reed.co.uk', ['https://www.reed.co.uk/jobs/1'])
+    checkpoint_store = CheckpointStore(checkpoint_path)
+    assert not checkpoint_store.resumed
+    assert checkpoint_store.get_fetched_urls('www.reed.co.uk') == []
+    # Resuming without a checkpoint file starts from an empty checkpoint
+    assert not CheckpointStore(str(tmp_path / 'missing.json'), resume=True).resumed
+
+
+def test_fetched_urls_are_stored_once(tmp_path):
+    checkpoint_path = str(tmp_path / 'checkpoint.json')
+    checkpoint_store = CheckpointStore(checkpoint_path)
+    checkpoint_store.mark_fetched('www.reed.co.uk', ['https://www.reed.co.uk/jobs/1', 'https://www.reed.co.uk/jobs/2'])
+    checkpoint_store.mark_fetched('www.reed.co.uk', ['https://www.reed.co.uk/jobs/2', 'https://www.reed.co.uk/jobs/3'])
+    assert CheckpointStore(checkpoint_path, resume=True).get_fetched_urls('www.reed.co.uk') == [
+        'https://www.reed.co.uk/jobs/1', 'https://www.reed.co.uk/jobs/2', 'https://www.reed.co.uk/jobs/3'
+    ]
+
+
+def test_save_leaves_no_temporary_files_and_clear_removes_the_checkpoint(tmp_path):
+    checkpoint_path = str(tmp_path / 'checkpoint.json')
+    checkpoint_store = CheckpointStore(checkpoint_path)
+    checkpoint_store.mark_title_complete('www.reed.co.uk', 'Data Engineer')
+    assert os.listdir(tmp_path) == ['checkpoint.json']
+    checkpoint_store.clear()
+    assert os.listdir(tmp_path) == []
+    assert not CheckpointStore(checkpoint_path, resume=True).is_title_complete('www.reed.co.uk', 'Data Engineer')
@@ -0,0 +1,89 @@
+import pytest
+from src.driver_pool import DriverPool
+
+
+class FakeDriver:
+    def __init__(self, number):
+        self.number = number
+        self.quit_count = 0
+        self.healthy = True
+
+    @property
+    def current_window_handle(self):
+        if not self.healthy:
+            raise RuntimeError('browser is gone')
+        return f'handle-{self.number}'
+
+    def quit(self):
+        self.quit_count += 1
+
+
+def make_pool(**kwargs):
+    drivers = []
+
+    def driver_factory():
+        drivers.append(FakeDriver(len(drivers)))
+        return drivers[-1]
+
+    pool = DriverPool(driver_factory, **kwargs)
+    return pool, drivers
+
+
+def test_drivers_are_started_lazily_and_reused():
+    pool, drivers = make_pool(pool_size=2)
+    assert drivers == []
+    with pool.driver() as driver:
+        pass
+    with pool.driver() as second_driver:
+        assert second_driver is driver
+    assert len(drivers) == 1
+    pool.close()
+
+
+def test_checkout_blocks_at_the_pool_size():
+    pool, drivers = make_pool(pool_size=1, checkout_timeout=0.01)
+    driver = pool.checkout()
+    with pytest.raises(TimeoutError):
+        pool.checkout()
+    pool.checkin(driver)
+    assert pool.checkout() is driver
+    pool.close()
+
+
+def test_driver_is_recycled_after_max_page_loads():
+    pool, drivers = make_pool(max_page_loads=2)
+    driver = pool.checkout()
+    pool.record_page_load(driver)
+    pool.record_page_load(driver)
+    pool.checkin(driver)
+    assert driver.quit_count == 1
+    assert pool.checkout() is not driver
+    assert len(drivers) == 2
+    pool.close()
+
+
+def test_unhealthy_idle_driver_is_replaced():
+    pool, drivers = make_pool()
+    driver = pool.checkout()
+    pool.checkin(driver)
+    driver.healthy = False
+    replacement = pool.checkout()
+    assert replacement is not driver
+    assert driver.quit_count == 1
+    pool.close()
+
+
+def test_close_quits_every_driver_once():
+    pool, drivers = make_pool(pool_size=2)
+    first_driver, second_driver = pool.checkout(), pool.checkout()
+    pool.checkin(first_driver)
+    pool.close()
+    pool.close()
+    assert [driver.quit_count for driver in drivers] == [1, 1]
+    with pytest.raises(RuntimeError):
+        pool.checkout()
+
+
+def test_pool_size_must_be_positive():
+    with pytest.raises(ValueError):
+        DriverPool(lambda: None, pool_size=0)
@@ -0,0 +1,92 @@
+from src.general_scraper import GeneralScraper
+
+
+class FakeElement:
+    def __init__(self):
+        self.clicks = 0
+        self.keys = []
+
+    def click(self):
+        self.clicks += 1
+
+    def send_keys(self, keys):
+        self.keys.append(keys)
+
+
+class FakePageReadiness:
+    click_timeout = 5
+
+    def __init__(self):
+        self.elements = {}
+
+    def wait_for_element(self, driver, xpath, clickable=False, timeout=None):
+        return self.elements.setdefault(xpath, FakeElement())
+
+
+class CountingRateLimiter:
+    def __init__(self):
+        self.waits = 0
+
+    def wait(self, url):
+        self.waits += 1
+        return 0
+
+
+def make_scraper():
+    # Skips __init__, which reads the driver configuration file and starts a browser
+    scraper = GeneralScraper.__new__(GeneralScraper)
+    scraper.driver = type('Driver', (), {'current_url': 'https://www.reed.co.uk/'})()
+    scraper.heartbeat = None
+    scraper.page_readiness = FakePageReadiness()
+    scraper.rate_limiter = CountingRateLimiter()
+    return scraper
+
+
+def test_search_with_a_button_takes_one_rate_limiter_token():
+    scraper = make_scraper()
+    scraper.interact_with_search_bar('//input', 'Data Engineer', '//button')
+    assert scraper.rate_limiter.waits == 1
+    assert scraper.page_readiness.elements['//button'].clicks == 1
+
+
+def test_search_with_the_return_key_takes_one_rate_limiter_token():
+    scraper = make_scraper()
+    scraper.interact_with_search_bar('//input', 'Data Engineer')
+    assert scraper.rate_limiter.waits == 1
+    assert scraper.page_readiness.elements['//input'].keys[0] == 'Data Engineer'
+
+
+def test_button_clicks_are_paced():
+    scraper = make_scraper()
+    scraper.click_button_on_page('//a[@id="next"]')
+    assert scraper.rate_limiter.waits == 1
+
+
+def test_resource_summary_closes_the_http_fetcher():
+    closed = []
+    scraper = make_scraper()
+    scraper.resource_blocker = None
+    scraper.http_fetcher = type('HttpFetcher', (), {'close': lambda self: closed.append(True)})()
+    scraper.print_resource_summary()
+    assert closed == [True]
+
+
+def test_tab_harvest_stops_after_the_batch_with_an_empty_page():
+    scraper = make_scraper()
+    scraper.base_url = 'https://www.reed.co.uk/'
+    scraper.checkpoint_store = None
+    scraper.seen_url_index = None
+    scraper.scraper_config = {'base_config': {'browser_tabs': 2, 'search_url': {'template': 'https://www.reed.co.uk/jobs?q={title}&pageno={page}'}}}
+    results = {f'https://www.reed.co.uk/jobs?q=Data+Engineer&pageno={page}': [f'https://www.reed.co.uk/jobs/{page}'] for page in range(1, 4)}
+    dispatched = []
+
+    def extract_pages_in_tabs(list_of_urls, extract_page, number_of_tabs=1, timeout=30, on_record=None):
+        dispatched.append(list_of_urls)
+        for url in list_of_urls:
+            on_record(url, results.get(url, []))
+
+    scraper.extract_pages_in_tabs = extract_pages_in_tabs
+    list_of_urls = scraper.harvest_search_pages('Data Engineer', {})
+    # The fourth page has no job cards, so the other 46 of the 50 pages are never opened
+    assert [len(batch) for batch in dispatched] == [2, 2]
+    assert list_of_urls == ['https://www.reed.co.uk/jobs/1', 'https://www.reed.co.uk/jobs/2', 'https://www.reed.co.uk/jobs/3']
@@ -0,0 +1,35 @@
+from lxml import html
+from src.http_fetcher import HttpFetcher
+
+
+EXTRACT_DATA = {
+    'main_container': '//div[@class="job-card"]',
+    'job_title': '//h1',
+    'job_url': '//a/@href',
+    'website_name': '',
+    'date_extracted': ''
+}
+
+
+def make_fetcher(monkeypatch, page='<html><body><h1>Data Engineer</h1></body></html>'):
+    fetcher = HttpFetcher()
+    monkeypatch.setattr(fetcher, 'fetch_document', lambda url: (html.fromstring(page), url))
+    return fetcher
+
+
+def test_empty_website_name_falls_back_to_the_site_name(monkeypatch):
+    record = make_fetcher(monkeypatch).extract_record('https://www.reed.co.uk/jobs/1', EXTRACT_DATA, 'www.reed.co.uk')
+    assert record['website_name'] == 'www.reed.co.uk'
+    assert record['job_title'] == 'Data Engineer'
+    assert record['job_url'] == 'https://www.reed.co.uk/jobs/1'
+
+
+def test_configured_website_name_is_kept(monkeypatch):
+    record = make_fetcher(monkeypatch).extract_record('https://uk.indeed.com/viewjob', {**EXTRACT_DATA, 'website_name': 'indeed'}, 'uk.indeed.com')
+    assert record['website_name'] == 'indeed'
+
+
+def test_missing_required_field_falls_back_to_selenium(monkeypatch):
+    fetcher = make_fetcher(monkeypatch, page='<html><body></body></html>')
+    assert fetcher.extract_record('https://www.reed.co.uk/jobs/1', EXTRACT_DATA, 'www.reed.co.uk') is None
+    assert fetcher.pages_fallen_back == 1
@@ -0,0 +1,57 @@
+import pytest
+from sqlalchemy import create_engine
+from src.ingestion_manifest import IngestionManifest
+from src.storage_backend import InMemoryStorageBackend
+
+
+@pytest.fixture
+def storage():
+    return InMemoryStorageBackend()
+
+
+@pytest.fixture
+def manifest():
+    return IngestionManifest(create_engine('sqlite://'))
+
+
+def load(manifest, storage, backfill=False):
+    new_objects = manifest.find_new_objects(storage, ['indeed/'], ('csv', 'parquet'), backfill=backfill)
+    manifest.record_loaded(new_objects)
+    return [s3_object['Key'] for s3_object in new_objects]
+
+
+def test_partition_date_only_matches_zero_padded_keys():
+    assert IngestionManifest.get_partition_date('indeed/2024/10/05/indeed_jobs.csv') == '2024/10/05'
+    assert IngestionManifest.get_partition_date('indeed/2024/9/30/indeed_jobs.csv') is None
+
+
+def test_incremental_load_only_lists_new_objects(manifest, storage):
+    storage.put_object('indeed/2024/10/04/indeed_jobs.csv', b'a')
+    storage.put_object('indeed/2024/10/05/indeed_jobs.csv', b'b')
+    assert load(manifest, storage) == ['indeed/2024/10/04/indeed_jobs.csv', 'indeed/2024/10/05/indeed_jobs.csv']
+    assert manifest.get_watermark('indeed/') == 'indeed/2024/10/05/'
+    assert load(manifest, storage) == []
+
+    # A file uploaded again on the same day has a new ETag
+    storage.put_object('indeed/2024/10/05/indeed_jobs.csv', b'c')
+    storage.put_object('indeed/2024/10/06/indeed_jobs.csv', b'd')
+    assert load(manifest, storage) == ['indeed/2024/10/05/indeed_jobs.csv', 'indeed/2024/10/06/indeed_jobs.csv']
+
+
+def test_backfill_over_unpadded_keys_keeps_the_watermark(manifest, storage):
+    storage.put_object('indeed/2024/9/30/indeed_jobs.csv', b'a')
+    storage.put_object('indeed/2024/10/05/indeed_jobs.csv', b'b')
+    assert len(load(manifest, storage, backfill=True)) == 2
+    # The unpadded key sorts after every padded key of 2024, it must not become the watermark
+    assert manifest.get_watermark('indeed/') == 'indeed/2024/10/05/'
+
+    storage.put_object('indeed/2024/10/20/indeed_jobs.csv', b'c')
+    assert load(manifest, storage) == ['indeed/2024/10/20/indeed_jobs.csv']
+    assert load(manifest, storage) == []
+
+
+def test_watermark_without_padded_keys(manifest, storage):
+    storage.put_object('indeed/2024/9/30/indeed_jobs.csv', b'a')
+    load(manifest, storage, backfill=True)
+    assert manifest.get_watermark('indeed/') is None
+    assert load(manifest, storage) == []
@@ -0,0 +1,63 @@
+from time import monotonic
+import pytest
+from src.page_readiness import PageReadiness
+
+
+class FakeDriver:
+    '''
+    A driver whose DOM last changed quiet_milliseconds ago, or keeps changing if it is 0
+    '''
+    def __init__(self, quiet_milliseconds=0, log_entries=None):
+        self.quiet_milliseconds = quiet_milliseconds
+        self.log_entries = log_entries
+
+    def execute_script(self, script, *args):
+        return self.quiet_milliseconds
+
+    def get_log(self, log_type):
+        if self.log_entries is None:
+            raise ValueError('performance log is not enabled')
+        entries, self.log_entries = self.log_entries, []
+        return entries
+
+
+def test_from_config_reads_the_settle_timeout():
+    readiness = PageReadiness.from_config({'page_readiness': {'timeout': 30, 'settle_timeout': 1.5}})
+    assert readiness.timeout == 30
+    assert readiness.settle_timeout == 1.5
+    assert PageReadiness.from_config({}).settle_timeout == 2.5
+
+
+def test_invalid_settle_condition():
+    with pytest.raises(ValueError):
+        PageReadiness(settle='load')
+
+
+def test_quiet_dom_settles_at_once():
+    readiness = PageReadiness(timeout=30, quiet_period=0.3)
+    started = monotonic()
+    assert readiness.wait_for_settle(FakeDriver(quiet_milliseconds=500))
+    assert monotonic() - started < 0.5
+
+
+def test_changing_dom_gives_up_after_the_settle_timeout_not_the_element_timeout():
+    readiness = PageReadiness(timeout=30, settle_timeout=0.3, poll_frequency=0.05)
+    started = monotonic()
+    assert not readiness.wait_for_settle(FakeDriver(quiet_milliseconds=0))
+    assert monotonic() - started < 2
+
+
+def test_network_idle_falls_back_to_dom_quiet_without_a_performance_log():
+    readiness = PageReadiness(settle='network_idle', settle_timeout=0.3, poll_frequency=0.05)
+    assert readiness.wait_for_settle(FakeDriver(quiet_milliseconds=500))
+
+
+def test_network_idle_waits_for_requests_to_finish():
+    sent = {'message': '{"message": {"method": "Network.requestWillBeSent", "params": {"requestId": "1"}}}'}
+    readiness = PageReadiness(settle='network_idle', settle_timeout=0.3, quiet_period=0.05, poll_frequency=0.05)
+    recorded_entries = []
+    assert not readiness.wait_for_settle(FakeDriver(log_entries=[sent]), on_log_entries=recorded_entries.extend)
+    assert recorded_entries == [sent]
+
+    finished = {'message': '{"message": {"method": "Network.loadingFinished", "params": {"requestId": "1"}}}'}
+    assert readiness.wait_for_settle(FakeDriver(log_entries=[sent, finished]))
@@ -0,0 +1,62 @@
+from io import BytesIO
+import pandas as pd
+import pyarrow.parquet as pq
+from src.parquet_format import ParquetFormat
+
+
+def make_records(number_of_records : int, start : int = 0):
+    return pd.DataFrame({
+        'job_title': [f'Data Engineer {number}' for number in range(start, start + number_of_records)],
+        'company_name': ['Acme' if number % 2 else 'Initech' for number in range(start, start + number_of_records)],
+        'salary_range': [None] * number_of_records,
+        'date_extracted': ['2024-10-05 09:30:00'] * number_of_records
+    })
+
+
+def test_schema_types_dates_as_timestamps_and_the_rest_as_strings():
+    schema = ParquetFormat().build_schema(make_records(1))
+    assert str(schema.field('date_extracted').type) == 'timestamp[us]'
+    assert str(schema.field('job_title').type) == 'string'
+
+
+def test_to_table_fills_missing_columns_and_stringifies_values():
+    parquet_format = ParquetFormat()
+    schema = parquet_format.build_schema(make_records(1))
+    table = parquet_format.to_table(pd.DataFrame({'job_title': [42], 'date_extracted': ['not a date']}), schema)
+    assert table.column_names == ['job_title', 'company_name', 'salary_range', 'date_extracted']
+    assert table.column('job_title').to_pylist() == ['42']
+    assert table.column('company_name').to_pylist() == [None]
+    assert table.column('date_extracted').to_pylist() == [None]
+
+
+def test_write_chunks_and_read_them_back_in_batches(tmp_path):
+    output_file_name = str(tmp_path / 'reed_jobs.parquet')
+    parquet_format = ParquetFormat(row_group_size=2)
+    assert parquet_format.write_dataframes(output_file_name, [make_records(3), make_records(2, start=3)]) == 5
+
+    metadata = pq.ParquetFile(output_file_name).metadata
+    assert metadata.row_group(0).column(0).compression == 'ZSTD'
+    batches = list(parquet_format.iter_dataframes(output_file_name, chunksize=2))
+    df = pd.concat(batches, ignore_index=True)
+    assert max(len(batch) for batch in batches) == 2
+    assert df['job_title'].tolist() == [f'Data Engineer {number}' for number in range(5)]
+    # The repeated columns come back as categoricals
+    assert isinstance(batches[0]['company_name'].dtype, pd.CategoricalDtype)
+    assert df['salary_range'].isna().all()
+    assert df['date_extracted'].iloc[0] == pd.Timestamp('2024-10-05 09:30:00')
+
+
+def test_reads_from_a_file_like_body(tmp_path):
+    output_file_name = str(tmp_path / 'reed_jobs.parquet')
+    ParquetFormat().write_dataframes(output_file_name, [make_records(3)])
+    with open(output_file_name, 'rb') as file:
+        body = BytesIO(file.read())
+    assert ParquetFormat().get_dictionary_columns(body) == ['company_name', 'salary_range']
+    assert body.tell() == 0
+    assert sum(len(df) for df in ParquetFormat().iter_dataframes(body)) == 3
+
+
+def test_no_file_is_written_without_records(tmp_path):
+    output_file_name = tmp_path / 'reed_jobs.parquet'
+    assert ParquetFormat().write_dataframes(str(output_file_name), []) == 0
+    assert not output_file_name.exists()
@@ -0,0 +1,35 @@
+import pandas as pd
+import main
+
+
+def test_website_urls_cover_every_site():
+    website_urls = main.get_website_urls()
+    for site in main.SITES.values():
+        assert site['base_url'] in website_urls.values()
+    assert website_urls['reed'] == 'https://www.reed.co.uk/'
+    assert website_urls['www.cv-library.co.uk'] == 'https://www.cv-library.co.uk/'
+
+
+def test_website_table_of_a_partial_load():
+    # Only reed uploaded new files, so the load holds one of the four sites
+    df = pd.DataFrame({'website_name': ['reed', 'reed']})
+    website_name_df = main.build_website_table(df)
+    assert website_name_df['website_name'].tolist() == ['reed']
+    assert website_name_df['website_url'].tolist() == ['https://www.reed.co.uk/']
+
+
+def test_raw_to_dataframe_reads_csv_and_parquet_in_chunks(tmp_path):
+    from src.data_processing import DataFrameManipulation
+    from src.storage_backend import InMemoryStorageBackend
+    storage = InMemoryStorageBackend()
+    pd.DataFrame({'job_title': ['Data Engineer', 'Data Analyst', 'Data Scientist']}).to_parquet(tmp_path / 'reed_jobs.parquet')
+    storage.put_object('reed/2024/10/05/reed_jobs.parquet', (tmp_path / 'reed_jobs.parquet').read_bytes())
+    storage.put_object('indeed/2024/10/05/indeed_jobs.csv', b'job_title\nML Engineer\nBI Developer\n')
+    keys = ['indeed/2024/10/05/indeed_jobs.csv', 'reed/2024/10/05/reed_jobs.parquet']
+
+    chunks = list(DataFrameManipulation().iter_dataframe_chunks(storage.iter_objects(keys), chunksize=2))
+    assert [(key, len(df)) for key, df in chunks] == [(keys[0], 2), (keys[1], 2), (keys[1], 1)]
+
+    df = DataFrameManipulation().raw_to_dataframe(storage.iter_objects(keys))
+    assert df['job_title'].tolist() == ['ML Engineer', 'BI Developer', 'Data Engineer', 'Data Analyst', 'Data Scientist']
+    assert df.index.tolist() == [0, 1, 2, 3, 4]
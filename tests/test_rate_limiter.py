@@ -0,0 +1,76 @@
+import pytest
+import src.rate_limiter as rate_limiter
+from src.rate_limiter import RateLimiter, TokenBucket
+
+
+class FakeClock:
+    def __init__(self):
+        self.now = 100.0
+
+    def __call__(self):
+        return self.now
+
+
+@pytest.fixture
+def clock(monkeypatch):
+    clock = FakeClock()
+    monkeypatch.setattr(rate_limiter, 'monotonic', clock)
+    return clock
+
+
+def test_bucket_spends_its_burst_then_spaces_requests(clock):
+    bucket = TokenBucket(requests_per_second=0.5, burst=2, jitter=(0, 0))
+    assert bucket.reserve() == 0
+    assert bucket.reserve() == 0
+    # The bucket is empty, the next token is two seconds away and the one after that four
+    assert bucket.reserve() == pytest.approx(2.0)
+    assert bucket.reserve() == pytest.approx(4.0)
+    assert bucket.seconds_waited == pytest.approx(6.0)
+
+
+def test_bucket_refills_up_to_its_burst(clock):
+    bucket = TokenBucket(requests_per_second=1, burst=2, jitter=(0, 0))
+    bucket.reserve()
+    bucket.reserve()
+    clock.now += 60
+    assert bucket.reserve() == 0
+    assert bucket.reserve() == 0
+    assert bucket.reserve() == pytest.approx(1.0)
+
+
+def test_throttle_signal_backs_off_and_drains_the_bucket(clock):
+    bucket = TokenBucket(requests_per_second=1, burst=3, jitter=(0, 0), min_requests_per_second=0.3)
+    bucket.record_signal('throttled')
+    assert bucket.rate == 0.5
+    assert bucket.reserve() == pytest.approx(2.0)
+    bucket.record_signal('captcha')
+    assert bucket.rate == 0.3
+    assert bucket.signals == {'throttled': 1, 'captcha': 1}
+
+
+def test_rate_recovers_after_healthy_requests(clock):
+    bucket = TokenBucket(requests_per_second=1, max_requests_per_second=1.5, recovery_factor=2, recovery_after=3)
+    for _ in range(2):
+        bucket.record_signal('ok')
+    assert bucket.rate == 1
+    bucket.record_signal('ok')
+    assert bucket.rate == 1.5
+    # A failure restarts the count of healthy requests
+    bucket.record_signal('timeout')
+    for _ in range(2):
+        bucket.record_signal('ok')
+    assert bucket.rate == 0.75
+
+
+def test_rate_limiter_keeps_a_bucket_per_domain(clock, monkeypatch):
+    monkeypatch.setattr(rate_limiter, 'sleep', lambda seconds: None)
+    limiter = RateLimiter(requests_per_second=1, jitter=(0, 0))
+    limiter.configure_domain('https://www.reed.co.uk/', {'requests_per_second': 0.25})
+    assert limiter.wait('https://www.reed.co.uk/jobs/1') == 0
+    assert limiter.wait('https://uk.indeed.com/viewjob?jk=1') == 0
+    assert limiter.wait('https://www.reed.co.uk/jobs/2') == pytest.approx(4.0)
+    assert limiter.wait('https://uk.indeed.com/viewjob?jk=2') == pytest.approx(1.0)
+    limiter.report('https://www.reed.co.uk/jobs/2', 'throttled')
+    domains = limiter.summary()['domains']
+    assert domains['www.reed.co.uk']['requests_per_second'] == 0.125
+    assert domains['uk.indeed.com']['requests'] == 2
@@ -0,0 +1,35 @@
+from src.record_sink import RecordSink
+
+
+def test_worker_output_file_name():
+    assert RecordSink.get_worker_output_file_name('indeed_jobs.csv', 'node-a-12') == 'indeed_jobs-node-a-12.csv'
+    assert RecordSink.get_worker_output_file_name('out/reed_jobs.parquet', 'node-b-7') == 'out/reed_jobs-node-b-7.parquet'
+
+
+def test_find_output_files_includes_every_worker(tmp_path, monkeypatch):
+    monkeypatch.chdir(tmp_path)
+    for file_name in ['indeed_jobs.csv', 'indeed_jobs-node-a-1.csv', 'indeed_jobs-node-b-2.csv', 'indeed_jobs_records-0000.csv', 'reed_jobs-node-a-1.csv']:
+        (tmp_path / file_name).write_text('job_title\n')
+    assert RecordSink.find_output_files('indeed_jobs.csv') == ['indeed_jobs.csv', 'indeed_jobs-node-a-1.csv', 'indeed_jobs-node-b-2.csv']
+
+
+def test_find_output_files_without_the_single_node_file(tmp_path, monkeypatch):
+    monkeypatch.chdir(tmp_path)
+    (tmp_path / 'indeed_jobs-node-a-1.parquet').write_bytes(b'')
+    assert RecordSink.find_output_files('indeed_jobs.parquet') == ['indeed_jobs-node-a-1.parquet']
+    assert RecordSink.find_output_files('indeed_jobs.csv') == []
+
+
+def test_run_upload_removes_uploaded_worker_files(tmp_path, monkeypatch):
+    import main
+    from src.storage_backend import InMemoryStorageBackend
+    monkeypatch.chdir(tmp_path)
+    storage = InMemoryStorageBackend()
+    monkeypatch.setattr(main, 'get_data_processor', lambda storage_url=None: storage)
+    monkeypatch.setattr(main, 'get_site_config', lambda site_name: {'base_config': {'url': 'https://uk.indeed.com', 'output_file_name': 'indeed_jobs.csv'}})
+    for file_name in ['indeed_jobs.csv', 'indeed_jobs-node-a-1.csv']:
+        (tmp_path / file_name).write_text('job_title\n')
+    main.run_upload(['indeed'])
+    assert sorted(key.rsplit('/', 1)[-1] for key in storage.iter_keys('indeed/')) == ['indeed_jobs-node-a-1.csv', 'indeed_jobs.csv']
+    # The single node file is overwritten by the next scrape, the worker file is not uploaded again
+    assert RecordSink.find_output_files('indeed_jobs.csv') == ['indeed_jobs.csv']
@@ -0,0 +1,101 @@
+import pytest
+from selenium.common.exceptions import TimeoutException
+import src.retry_policy as retry_policy
+from src.retry_policy import CircuitBreaker, CircuitOpenError, RetryPolicy
+
+
+class FakeClock:
+    def __init__(self):
+        self.now = 100.0
+
+    def __call__(self):
+        return self.now
+
+
+@pytest.fixture
+def clock(monkeypatch):
+    clock = FakeClock()
+    monkeypatch.setattr(retry_policy, 'monotonic', clock)
+    monkeypatch.setattr(retry_policy, 'sleep', lambda seconds: None)
+    return clock
+
+
+def flaky_operation(failures : int):
+    attempts = []
+
+    def operation():
+        attempts.append(len(attempts) + 1)
+        if len(attempts) <= failures:
+            raise TimeoutException('page did not load')
+        return 'record'
+    return operation, attempts
+
+
+def test_delay_grows_and_is_capped():
+    policy = RetryPolicy(base_delay=1, multiplier=2, max_delay=5, jitter=0)
+    assert [policy.get_delay(attempt) for attempt in range(1, 5)] == [1, 2, 4, 5]
+    jittered_policy = RetryPolicy(base_delay=4, jitter=0.5)
+    assert all(2 <= jittered_policy.get_delay(1) <= 4 for _ in range(20))
+
+
+def test_run_retries_until_the_operation_succeeds(clock):
+    operation, attempts = flaky_operation(2)
+    retried = []
+    assert RetryPolicy(max_attempts=3).run(operation, on_retry=lambda attempt, error: retried.append(attempt)) == 'record'
+    assert attempts == [1, 2, 3]
+    assert retried == [1, 2]
+
+
+def test_run_raises_the_last_error_and_records_one_failure(clock):
+    operation, attempts = flaky_operation(5)
+    circuit_breaker = CircuitBreaker('reed', failure_threshold=2)
+    with pytest.raises(TimeoutException):
+        RetryPolicy(max_attempts=3).run(operation, circuit_breaker=circuit_breaker)
+    assert attempts == [1, 2, 3]
+    assert circuit_breaker.consecutive_failures == 1
+
+
+def test_run_does_not_retry_other_errors(clock):
+    def operation():
+        raise KeyError('job_title')
+    with pytest.raises(KeyError):
+        RetryPolicy(max_attempts=3).run(operation)
+
+
+def test_circuit_breaker_opens_after_the_threshold(clock):
+    circuit_breaker = CircuitBreaker('reed', failure_threshold=3, reset_timeout=60)
+    for _ in range(2):
+        circuit_breaker.record_failure()
+    circuit_breaker.check()
+    circuit_breaker.record_failure()
+    assert circuit_breaker.is_open
+    assert circuit_breaker.times_opened == 1
+    with pytest.raises(CircuitOpenError):
+        circuit_breaker.check()
+    with pytest.raises(CircuitOpenError):
+        RetryPolicy().run(lambda: 'record', circuit_breaker=circuit_breaker)
+
+
+def test_circuit_breaker_trial_after_the_reset_timeout(clock):
+    circuit_breaker = CircuitBreaker('reed', failure_threshold=1, reset_timeout=60)
+    circuit_breaker.record_failure()
+    clock.now += 60
+    # Half open, one trial is allowed and its failure opens the breaker again straight away
+    circuit_breaker.check()
+    circuit_breaker.record_failure()
+    assert circuit_breaker.is_open
+    assert circuit_breaker.times_opened == 2
+    clock.now += 60
+    # A successful trial closes it
+    assert RetryPolicy().run(lambda: 'record', circuit_breaker=circuit_breaker) == 'record'
+    assert not circuit_breaker.is_open
+    assert circuit_breaker.consecutive_failures == 0
+
+
+def test_site_config_overrides_the_driver_config():
+    driver_config = {'retry': {'max_attempts': 4, 'base_delay': 2}, 'circuit_breaker': {'failure_threshold': 10}}
+    scraper_config = {'base_config': {'retry': {'max_attempts': 2}, 'circuit_breaker': {'reset_timeout': 30}}}
+    policy = RetryPolicy.from_config(driver_config, scraper_config)
+    assert (policy.max_attempts, policy.base_delay) == (2, 2)
+    circuit_breaker = CircuitBreaker.from_config('reed', driver_config, scraper_config)
+    assert (circuit_breaker.failure_threshold, circuit_breaker.reset_timeout) == (10, 30)
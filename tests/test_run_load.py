@@ -0,0 +1,102 @@
+import pandas as pd
+import pytest
+from sqlalchemy import create_engine
+import main
+from src.storage_backend import InMemoryStorageBackend
+
+
+MODEL_TABLES = ['land_job_data', 'dim_company', 'dim_job_title', 'dim_description', 'dim_location', 'dim_date', 'dim_job_url', 'dim_website', 'fact_job_data']
+
+
+class FakeOperator:
+    '''
+    Lists the tables of the SQLite job database and records the SQL scripts run
+    '''
+    def __init__(self):
+        self.scripts = []
+
+    def list_db_tables(self, engine):
+        from sqlalchemy import inspect
+        return inspect(engine).get_table_names()
+
+    def execute_sql(self, file_name, engine):
+        self.scripts.append(file_name)
+
+    def send_data_to_database(self, df, engine, table_name, if_exists, database_schema):
+        df.to_sql(table_name, engine, if_exists=if_exists, index=False)
+
+
+@pytest.fixture
+def load_pipeline(tmp_path, monkeypatch):
+    '''
+    Runs run_load against a SQLite job database and the in-memory storage backend,
+    with the dataframes stubbed so no geocoding or Postgres is needed
+    '''
+    engine = create_engine(f"sqlite:///{tmp_path / 'jobs.db'}")
+    storage = InMemoryStorageBackend()
+    operator = FakeOperator()
+    loads = []
+
+    def process_dataframes(list_of_s3_filepaths, list_of_keys, storage_url):
+        loads.append(list_of_keys)
+        return {table_name: pd.DataFrame({'key': list_of_keys}) for table_name in MODEL_TABLES}
+
+    def upload_dataframes(dataframe_dict, target_engine, upload_condition, first_load=False):
+        loads.append('replace' if first_load else upload_condition)
+        for table_name, df in dataframe_dict.items():
+            operator.send_data_to_database(df, target_engine, table_name, upload_condition, None)
+
+    monkeypatch.setattr(main, 'create_job_database', lambda: engine)
+    monkeypatch.setattr(main, 'get_data_processor', lambda storage_url=None: storage)
+    monkeypatch.setattr(main, 'get_site_config', lambda site_name: {'base_config': {'url': main.SITES[site_name]['base_url']}})
+    monkeypatch.setattr(main, 'get_operator', lambda: operator)
+    monkeypatch.setattr(main, 'get_database_schema', lambda: None)
+    monkeypatch.setattr(main, 'process_dataframes', process_dataframes)
+    monkeypatch.setattr(main, 'upload_dataframes', upload_dataframes)
+    monkeypatch.setattr(main, 'filter_dataframes', lambda dataframe_dict, engine: dataframe_dict)
+    monkeypatch.setattr(main, 'update_and_filter_dimension_tables', lambda engine: None)
+    monkeypatch.setattr(main, 'retrieve_dimension_tables', lambda dataframe_dict, engine: dataframe_dict)
+    monkeypatch.setattr(main.get_dataframe_manipulation(), 'build_fact_table', lambda land_job_data, *dimensions: land_job_data)
+    return storage, operator, loads
+
+
+def test_second_load_appends_rather_than_replacing(load_pipeline):
+    storage, operator, loads = load_pipeline
+    storage.put_object('indeed/2024/10/04/indeed_jobs.csv', b'a')
+    main.run_load()
+    assert loads == [['indeed/2024/10/04/indeed_jobs.csv'], 'replace']
+    assert operator.scripts == ['apply_primary_foreign_keys.sql', 'create_views.sql']
+
+    # The ingestion_manifest table now sits beside the model tables
+    storage.put_object('reed/2024/10/05/reed_jobs.csv', b'b')
+    main.run_load()
+    assert loads[2:] == [['reed/2024/10/05/reed_jobs.csv'], 'append']
+    assert operator.scripts == ['apply_primary_foreign_keys.sql', 'create_views.sql']
+
+
+def test_load_without_new_files_does_nothing(load_pipeline):
+    storage, operator, loads = load_pipeline
+    main.run_load()
+    assert loads == []
+
+
+def test_table_check_ignores_other_tables(tmp_path, monkeypatch):
+    engine = create_engine(f"sqlite:///{tmp_path / 'jobs.db'}")
+    monkeypatch.setattr(main, 'get_operator', lambda: FakeOperator())
+    dataframe_dict = {table_name: pd.DataFrame({'key': [1]}) for table_name in MODEL_TABLES}
+    assert not main.database_table_name_check(dataframe_dict, engine)
+    for table_name in MODEL_TABLES + ['ingestion_manifest', 'scrape_tasks']:
+        pd.DataFrame({'key': [1]}).to_sql(table_name, engine, index=False)
+    assert main.database_table_name_check(dataframe_dict, engine)
+
+
+def test_table_check_ignores_the_task_queue_table(tmp_path, monkeypatch):
+    from src.task_queue import TaskQueue
+    engine = create_engine(f"sqlite:///{tmp_path / 'jobs.db'}")
+    monkeypatch.setattr(main, 'get_operator', lambda: FakeOperator())
+    dataframe_dict = {table_name: pd.DataFrame({'key': [1]}) for table_name in MODEL_TABLES}
+    for table_name in MODEL_TABLES:
+        pd.DataFrame({'key': [1]}).to_sql(table_name, engine, index=False)
+    # A queue kept in the job database adds its scrape_tasks table
+    TaskQueue.from_engine(engine).publish([TaskQueue.search_page_task('reed', 'Data Engineer', 0)])
+    assert main.database_table_name_check(dataframe_dict, engine)
@@ -0,0 +1,41 @@
+import pandas as pd
+from sqlalchemy import create_engine
+from src.seen_url_index import SeenUrlIndex
+
+
+def test_filter_unseen_keeps_the_order_of_the_new_urls(tmp_path):
+    seen_url_index = SeenUrlIndex(str(tmp_path / 'seen_urls.db'))
+    seen_url_index.add(['https://www.reed.co.uk/jobs/2'])
+    list_of_urls = ['https://www.reed.co.uk/jobs/3', 'https://www.reed.co.uk/jobs/2', 'https://www.reed.co.uk/jobs/1']
+    assert seen_url_index.filter_unseen(list_of_urls) == ['https://www.reed.co.uk/jobs/3', 'https://www.reed.co.uk/jobs/1']
+    seen_url_index.close()
+
+
+def test_equivalent_urls_share_one_entry(tmp_path):
+    seen_url_index = SeenUrlIndex(str(tmp_path / 'seen_urls.db'))
+    seen_url_index.add(['https://uk.indeed.com/viewjob?jk=1/', 'https://uk.indeed.com/viewjob?jk=1#apply'])
+    assert len(seen_url_index) == 1
+    assert 'https://uk.indeed.com/viewjob?jk=1' in seen_url_index
+    assert 'https://uk.indeed.com/viewjob?jk=2' not in seen_url_index
+    seen_url_index.close()
+
+
+def test_index_survives_between_runs_and_lookups_are_chunked(tmp_path):
+    index_path = str(tmp_path / 'seen_urls.db')
+    list_of_urls = [f'https://www.reed.co.uk/jobs/{number}' for number in range(1200)]
+    seen_url_index = SeenUrlIndex(index_path)
+    seen_url_index.add(list_of_urls[::2])
+    seen_url_index.close()
+
+    seen_url_index = SeenUrlIndex(index_path)
+    assert seen_url_index.filter_unseen(list_of_urls, chunk_size=100) == list_of_urls[1::2]
+    seen_url_index.close()
+
+
+def test_seed_from_database(tmp_path):
+    engine = create_engine(f"sqlite:///{tmp_path / 'jobs.db'}")
+    pd.DataFrame({'job_url': ['https://www.reed.co.uk/jobs/1', None, 'https://www.reed.co.uk/jobs/2']}).to_sql('dim_job_url', engine, index=False)
+    seen_url_index = SeenUrlIndex(str(tmp_path / 'seen_urls.db'))
+    assert seen_url_index.seed_from_database(engine) == 2
+    assert seen_url_index.filter_unseen(['https://www.reed.co.uk/jobs/2', 'https://www.reed.co.uk/jobs/3']) == ['https://www.reed.co.uk/jobs/3']
+    seen_url_index.close()
@@ -0,0 +1,117 @@
+from queue import Queue
+import pytest
+import src.site_runner as site_runner
+from src.site_runner import SiteOrchestrator
+
+
+class FakeEvents(Queue):
+    def close(self):
+        pass
+
+
+class FakeProcess:
+    '''
+    Stands in for a worker process, sending one scripted event each time the orchestrator checks on it
+    '''
+    def __init__(self, target, args, name):
+        self.site_spec, self.events, _ = args
+        self.script = list(self.site_spec['script'])
+        self.alive = True
+        self.killed = False
+        self.exitcode = None
+        self.pid = None
+
+    def start(self):
+        self.pid = 4242
+
+    def is_alive(self):
+        if self.alive and self.script:
+            event = self.script.pop(0)
+            if event == 'exit':
+                self.alive = False
+                self.exitcode = 1
+            else:
+                self.events.put({'site': self.site_spec['site_name'], **event})
+        return self.alive
+
+    def join(self, timeout=None):
+        pass
+
+    def kill(self):
+        self.killed = True
+        self.alive = False
+
+
+class FakeContext:
+    def __init__(self):
+        self.processes = []
+        self.most_alive = 0
+
+    def Queue(self):
+        return FakeEvents()
+
+    def Process(self, target, args, name):
+        self.processes.append(FakeProcess(target, args, name))
+        self.most_alive = max(self.most_alive, sum(process.alive for process in self.processes))
+        return self.processes[-1]
+
+
+@pytest.fixture
+def orchestrator(monkeypatch):
+    def killpg(pid, sig):
+        raise OSError('no such process group')
+    # Never signal a real process group from the tests
+    monkeypatch.setattr(site_runner.os, 'killpg', killpg)
+
+    def make_orchestrator(**kwargs):
+        orchestrator = SiteOrchestrator(poll_interval=0.01, **kwargs)
+        orchestrator.context = FakeContext()
+        return orchestrator
+    return make_orchestrator
+
+
+def done_event(records):
+    return {'event': 'done', 'records': records, 'output_file': 'reed_jobs.csv', 'skipped_job_titles': []}
+
+
+def test_worker_without_heartbeats_is_killed_as_hung(orchestrator):
+    site_orchestrator = orchestrator(hang_timeout=0.05)
+    results = site_orchestrator.run([{'site_name': 'reed', 'script': []}])
+    assert results['reed']['status'] == 'hung'
+    assert site_orchestrator.context.processes[0].killed
+
+
+def test_heartbeats_keep_a_slow_worker_alive(orchestrator):
+    script = [{'event': 'heartbeat'}] * 10 + [{'event': 'progress', 'job_title': 'Data Engineer', 'records': 3}, done_event(3), 'exit']
+    site_orchestrator = orchestrator(hang_timeout=0.05)
+    results = site_orchestrator.run([{'site_name': 'reed', 'script': script}])
+    assert results['reed']['status'] == 'done'
+    assert results['reed']['records'] == 3
+    assert not site_orchestrator.context.processes[0].killed
+
+
+def test_worker_past_its_timeout_is_killed(orchestrator):
+    site_orchestrator = orchestrator(timeout=0.05, hang_timeout=300)
+    results = site_orchestrator.run([{'site_name': 'reed', 'script': [{'event': 'heartbeat'}] * 1000}])
+    assert results['reed']['status'] == 'timed_out'
+    assert site_orchestrator.context.processes[0].killed
+
+
+def test_worker_exiting_without_a_result_crashed(orchestrator):
+    site_orchestrator = orchestrator(hang_timeout=300)
+    results = site_orchestrator.run([
+        {'site_name': 'reed', 'script': [{'event': 'progress', 'job_title': 'Data Engineer', 'records': 2}, 'exit']},
+        {'site_name': 'indeed', 'script': [{'event': 'error', 'error': 'Traceback ...'}, 'exit']}
+    ])
+    assert results['reed'] == {'status': 'crashed', 'records': 2}
+    assert results['indeed']['status'] == 'error'
+
+
+def test_max_workers_limits_the_sites_run_at_once(orchestrator):
+    site_orchestrator = orchestrator(max_workers=1, hang_timeout=300)
+    results = site_orchestrator.run([
+        {'site_name': 'reed', 'script': [done_event(1), 'exit']},
+        {'site_name': 'indeed', 'script': [done_event(2), 'exit']}
+    ])
+    assert {site_name: result['status'] for site_name, result in results.items()} == {'reed': 'done', 'indeed': 'done'}
+    assert site_orchestrator.context.most_alive == 1
@@ -0,0 +1,77 @@
+import json
+import os
+import pytest
+from src.site_spec import SiteSpec, SiteSpecError
+
+
+def make_config(**base_config):
+    return {
+        'base_config': {'job_titles': ['Data Engineer'], 'output_file_name': 'reed_jobs.csv', **base_config},
+        'jobs': {
+            'search': {'interact_with_searchbar': '//input[@id="keywords"]', 'click_button_date': '//a[@id="date"]'},
+            'start_extraction': {
+                'extract_data': {
+                    'main_container': '//article',
+                    'job_url': './/h2/a',
+                    'job_title': '//h1',
+                    'date_extracted': '',
+                    'website_name': 'reed'
+                }
+            }
+        }
+    }
+
+
+def test_compiles_the_configuration_file():
+    spec = SiteSpec.from_config(make_config(next_page_xpath='//a[@rel="next"]'), 'https://www.reed.co.uk/', {'harvest_mode': 'scroll'})
+    assert spec.name == 'reed'
+    assert spec.search_bar_xpath == '//input[@id="keywords"]'
+    assert spec.click_buttons == ['//a[@id="date"]']
+    assert spec.next_page_xpath == '//a[@rel="next"]'
+    assert spec.page_fields == {'job_title': '//h1'}
+    assert spec.harvest_mode == 'scroll'
+
+
+def test_site_spec_section_overrides_the_class_defaults():
+    spec = SiteSpec.from_config(make_config(site_spec={'harvest_mode': 'batch', 'name': 'reed.co.uk'}), 'https://www.reed.co.uk/', {'harvest_mode': 'scroll'})
+    assert spec.harvest_mode == 'batch'
+    assert spec.name == 'reed.co.uk'
+
+
+def test_unknown_site_spec_keys_are_refused():
+    with pytest.raises(SiteSpecError, match='harvest'):
+        SiteSpec.from_config(make_config(site_spec={'harvest': 'scroll'}), 'https://www.reed.co.uk/')
+
+
+def test_every_problem_is_reported_together():
+    config = make_config(job_titles=[], site_spec={'harvest_mode': 'infinite', 'text_attribute': 'innerHTML'})
+    with pytest.raises(SiteSpecError) as error:
+        SiteSpec.from_config(config, 'https://www.reed.co.uk/')
+    message = str(error.value)
+    for problem in ['job_titles', 'harvest_mode infinite', 'text_attribute innerHTML']:
+        assert problem in message
+
+
+def test_search_url_replaces_the_search_bar():
+    config = make_config(search_url={'template': 'https://www.reed.co.uk/jobs?keywords={title}&pageno={page}'})
+    del config['jobs']['search']
+    assert SiteSpec.from_config(config, 'https://www.reed.co.uk/').search_bar_xpath is None
+    del config['base_config']['search_url']
+    with pytest.raises(SiteSpecError, match='search bar'):
+        SiteSpec.from_config(config, 'https://www.reed.co.uk/')
+
+
+def test_configuration_without_extract_data_is_refused():
+    config = make_config()
+    del config['jobs']['start_extraction']
+    with pytest.raises(SiteSpecError, match='extract_data'):
+        SiteSpec.from_config(config, 'https://www.reed.co.uk/')
+    with pytest.raises(SiteSpecError, match='base_config'):
+        SiteSpec.from_config({'jobs': {}}, 'https://www.reed.co.uk/')
+
+
+def test_indeed_configuration_compiles():
+    with open(os.path.join(os.path.dirname(__file__), '..', 'config', 'indeed_config.json')) as file:
+        scraper_config = json.load(file)
+    spec = SiteSpec.from_config(scraper_config, 'https://uk.indeed.com/', {'harvest_mode': 'batch'})
+    assert spec.main_container and spec.job_url and spec.page_fields
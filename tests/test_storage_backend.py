@@ -0,0 +1,84 @@
+import pandas as pd
+import pytest
+from src.data_processing import DataFrameManipulation, S3DataProcessing
+from src.storage_backend import InMemoryStorageBackend, LocalStorageBackend, StorageBackend
+
+
+@pytest.fixture(params=['local', 'memory'])
+def storage(request, tmp_path):
+    if request.param == 'local':
+        return LocalStorageBackend(str(tmp_path / 'bucket'))
+    return InMemoryStorageBackend()
+
+
+@pytest.fixture
+def output_file(tmp_path):
+    output_file_name = tmp_path / 'indeed_jobs.csv'
+    pd.DataFrame({'job_title': ['Data Engineer', 'Data Analyst'], 'website_name': ['indeed', 'indeed']}).to_csv(output_file_name, index=False)
+    return str(output_file_name)
+
+
+def test_from_url_picks_the_backend(tmp_path):
+    assert isinstance(StorageBackend.from_url(str(tmp_path / 'a')), LocalStorageBackend)
+    assert StorageBackend.from_url(f"file://{tmp_path / 'b'}").bucket_name == str(tmp_path / 'b')
+    assert isinstance(StorageBackend.from_url('memory://'), InMemoryStorageBackend)
+    with pytest.raises(ValueError):
+        StorageBackend.from_url('gs://bucket')
+
+
+def test_s3_url_builds_the_s3_backend():
+    storage = StorageBackend.from_url('s3://job-scraper-data-bucket')
+    assert isinstance(storage, S3DataProcessing)
+    assert storage.bucket_name == 'job-scraper-data-bucket'
+
+
+def test_upload_list_and_read(storage, output_file):
+    for key in ['indeed/2024/10/05/indeed_jobs.csv', 'indeed/2024/10/04/indeed_jobs.csv', 'reed/2024/10/05/reed_jobs.csv']:
+        storage.upload_file_to_s3(output_file, key, key.rsplit('/', 1)[0] + '/')
+
+    assert list(storage.iter_keys('indeed/', ('csv', 'parquet'))) == ['indeed/2024/10/04/indeed_jobs.csv', 'indeed/2024/10/05/indeed_jobs.csv']
+    assert list(storage.iter_keys('indeed/2024/10/05')) == ['indeed/2024/10/05/indeed_jobs.csv']
+    assert list(storage.iter_keys('indeed/', 'parquet')) == []
+    summaries = list(storage.iter_object_summaries('', start_after='indeed/2024/10/04/indeed_jobs.csv'))
+    assert [summary['Key'] for summary in summaries] == ['indeed/2024/10/05/indeed_jobs.csv', 'reed/2024/10/05/reed_jobs.csv']
+    # The same bytes have the same ETag, as S3 gives them
+    assert summaries[0]['ETag'] == summaries[1]['ETag']
+
+    s3_objects = list(storage.iter_objects(storage.iter_keys('indeed/')))
+    df = DataFrameManipulation().raw_to_dataframe(s3_objects)
+    assert df['job_title'].tolist() == ['Data Engineer', 'Data Analyst'] * 2
+
+
+def test_missing_object(storage):
+    with pytest.raises((FileNotFoundError, KeyError)):
+        storage.fetch_object('indeed/2024/10/05/indeed_jobs.csv')
+
+
+def test_local_keys_outside_the_directory_are_refused(tmp_path):
+    storage = LocalStorageBackend(str(tmp_path / 'bucket'))
+    assert storage.get_file_path('indeed/2024/10/05/indeed_jobs.csv') == str(tmp_path / 'bucket' / 'indeed' / '2024' / '10' / '05' / 'indeed_jobs.csv')
+    for key in ['../outside.csv', 'indeed/../../outside.csv', '../bucket-other/indeed_jobs.csv']:
+        with pytest.raises(ValueError):
+            storage.get_file_path(key)
+    # A leading slash is part of the key, it stays inside the directory
+    assert storage.get_file_path('/etc/passwd') == str(tmp_path / 'bucket' / 'etc' / 'passwd')
+
+
+def test_local_layout_matches_the_bucket(tmp_path, output_file):
+    storage = LocalStorageBackend(str(tmp_path / 'bucket'))
+    storage.upload_file(output_file, 'indeed/2024/10/05/indeed_jobs.csv')
+    assert (tmp_path / 'bucket' / 'indeed' / '2024' / '10' / '05' / 'indeed_jobs.csv').read_bytes() == open(output_file, 'rb').read()
+
+
+def test_memory_storage_is_only_accepted_by_the_all_command():
+    import main
+    assert main.parse_arguments(['all', '--storage', 'memory://']).storage == 'memory://'
+    assert main.parse_arguments(['load', '--storage', 'data/']).storage == 'data/'
+    for command in ['upload', 'load']:
+        with pytest.raises(SystemExit):
+            main.parse_arguments([command, '--storage', 'memory://'])
+
+
+def test_storage_backend_is_abstract():
+    with pytest.raises(TypeError):
+        StorageBackend('bucket')
@@ -0,0 +1,141 @@
+from contextlib import contextmanager
+import pytest
+from src.task_queue import LeaseExpiredError, TaskQueue, TaskWorker
+
+
+def make_queue(tmp_path, **kwargs):
+    return TaskQueue.from_url(f"sqlite:///{tmp_path / 'task_queue.db'}", **kwargs)
+
+
+def test_publish_skips_duplicate_tasks(tmp_path):
+    task_queue = make_queue(tmp_path)
+    task = TaskQueue.job_detail_task('indeed', 'https://uk.indeed.com/viewjob?jk=1#apply')
+    assert task_queue.publish([task, TaskQueue.job_detail_task('indeed', 'https://uk.indeed.com/viewjob?jk=1/')]) == 1
+    assert task_queue.publish([task]) == 0
+
+
+def test_lease_ack(tmp_path):
+    task_queue = make_queue(tmp_path)
+    task_queue.publish([TaskQueue.search_page_task('reed', 'Data Engineer', 0)])
+    task = task_queue.lease('worker-a')
+    assert task['attempts'] == 1
+    # A leased task is not handed to a second worker
+    assert task_queue.lease('worker-b') is None
+    assert task_queue.ack(task)
+    assert task_queue.counts() == {'done': 1}
+
+
+def test_expired_lease_is_leased_again_with_a_new_token(tmp_path):
+    task_queue = make_queue(tmp_path)
+    task_queue.publish([TaskQueue.search_page_task('reed', 'Data Engineer', 0)])
+    first_lease = task_queue.lease('worker-a', lease_seconds=-1)
+    second_lease = task_queue.lease('worker-b')
+    assert second_lease['id'] == first_lease['id']
+    # The first worker lost its lease, so it can neither ack nor extend it
+    assert not task_queue.ack(first_lease)
+    assert not task_queue.extend_lease(first_lease)
+    assert task_queue.ack(second_lease)
+
+
+def test_fail_retries_until_max_attempts(tmp_path):
+    task_queue = make_queue(tmp_path, max_attempts=2)
+    task_queue.publish([TaskQueue.search_page_task('reed', 'Data Engineer', 0)])
+    task_queue.fail(task_queue.lease('worker-a'), 'timeout')
+    assert task_queue.counts() == {'pending': 1}
+    task_queue.fail(task_queue.lease('worker-a'), 'timeout')
+    assert task_queue.counts() == {'failed': 1}
+    assert task_queue.lease('worker-a') is None
+
+
+def test_lease_expiring_on_the_last_attempt_fails_the_task(tmp_path):
+    task_queue = make_queue(tmp_path, max_attempts=2)
+    task_queue.publish([TaskQueue.search_page_task('reed', 'Data Engineer', 0)])
+    task_queue.lease('worker-a', lease_seconds=-1)
+    task_queue.lease('worker-b', lease_seconds=-1)
+    # Both workers died, the task can not be leased a third time so it is failed rather than left leased
+    assert task_queue.lease('worker-c') is None
+    assert task_queue.counts() == {'failed': 1}
+
+
+class FakeRecordSink:
+    def __init__(self):
+        self.records = []
+
+    def flush(self):
+        pass
+
+
+class FakeScraper:
+    '''
+    Stands in for a site scraper, keeping the records a job detail task stores
+    '''
+    @contextmanager
+    def checkout_driver(self):
+        yield
+
+    def __init__(self, search_results=None):
+        self.site_spec = type('SiteSpec', (), {'extract_data': {}})()
+        self.record_sink = FakeRecordSink()
+        self.scraper_config = {'base_config': {'number_of_pages': 5}}
+        self.search_results = search_results or {}
+
+    def get_search_url_config(self):
+        return {'template': '{title}/{page}'}
+
+    def build_search_url(self, job_title, page_index):
+        return f'{job_title}/{page_index}'
+
+    def fetch_page(self, url, extract_page):
+        return self.search_results.get(url, [])
+
+    def filter_unseen_urls(self, list_of_urls):
+        return list_of_urls
+
+    def get_page_limit(self, number_of_pages=None):
+        return number_of_pages
+
+    def is_caught_up(self, page_urls, unseen_urls):
+        return False
+
+    def fetch_job_detail(self, url, webpage_config_dict, keep_record=None):
+        record = {'job_url': url}
+        if keep_record is not None and not keep_record(record):
+            return None
+        self.record_sink.records.append(record)
+        return record
+
+
+def test_job_detail_record_is_dropped_when_the_lease_was_lost(tmp_path):
+    task_queue = make_queue(tmp_path)
+    task_queue.publish([TaskQueue.job_detail_task('reed', 'https://www.reed.co.uk/jobs/1')])
+    first_scraper, second_scraper = FakeScraper(), FakeScraper()
+    stale_task = task_queue.lease('worker-a', lease_seconds=-1)
+    task = task_queue.lease('worker-b')
+
+    TaskWorker(task_queue, {'reed': second_scraper}, worker_id='worker-b').run_task(task)
+    assert task_queue.ack(task)
+    with pytest.raises(LeaseExpiredError):
+        TaskWorker(task_queue, {'reed': first_scraper}, worker_id='worker-a').run_task(stale_task)
+    assert second_scraper.record_sink.records == [{'job_url': 'https://www.reed.co.uk/jobs/1'}]
+    assert first_scraper.record_sink.records == []
+
+
+def test_task_queue_is_built_for_a_dialect(tmp_path):
+    from sqlalchemy import create_engine
+    from src.task_queue import SQLiteTaskQueue
+    engine = create_engine(f"sqlite:///{tmp_path / 'task_queue.db'}")
+    with pytest.raises(TypeError):
+        TaskQueue(engine)
+    assert isinstance(TaskQueue.from_engine(engine), SQLiteTaskQueue)
+
+
+def test_search_page_tasks_stop_at_the_first_empty_page(tmp_path):
+    task_queue = make_queue(tmp_path)
+    scraper = FakeScraper({'Data Engineer/0': ['https://www.reed.co.uk/jobs/1'], 'Data Engineer/1': ['https://www.reed.co.uk/jobs/2']})
+    task_worker = TaskWorker(task_queue, {'reed': scraper}, worker_id='worker-a')
+    task_queue.publish([TaskQueue.search_page_task('reed', 'Data Engineer', 0)])
+    while (task := task_queue.lease('worker-a', task_types=['search_page'])) is not None:
+        task_worker.run_task(task)
+        task_queue.ack(task)
+    # Page 2 had no job cards, so pages 3 and 4 were never queued
+    assert task_queue.counts() == {'done': 3, 'pending': 2}